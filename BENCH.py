@@ -0,0 +1,1016 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks exécutables sans Raspberry Pi (pilote vidéo SDL "dummy")
+
+Usage :
+  python3 BENCH.py render      (coût par image des écrans statiques, avec / sans cache de rendu)
+  python3 BENCH.py input       (virages rapides injectés : ordre, demi-tours, un virage par déplacement, latence)
+  python3 BENCH.py ble         (scanner BLE simulé : latence annonce -> écran, cycles start/stop)
+  python3 BENCH.py payload     (décodage d'une annonce : nom "Nom|temp|hum" vs charge utile binaire)
+  python3 BENCH.py registry    (registre multi-capteurs : coût par annonce, mémoire bornée, tableau de bord)
+  python3 BENCH.py dht         (démon pigpio simulé : capture Python temporisée (callback / pipe) vs script pigpiod, handles libérés)
+  python3 BENCH.py dhttrace    (trace DHT enregistrée (--trace) ou synthétique rejouée : seuil fixe vs décodage adaptatif)
+  python3 BENCH.py irreplay    (trames Sony SIRC rejouées avec / sans watchdog : délai d'émission, pas de trame fantôme)
+  python3 BENCH.py series      (historique des mesures : coût par mesure, mémoire constante, courbe à l'écran)
+  python3 BENCH.py sensorlog   (journal SQLite : débit d'insertion soutenu, coût par événement côté affichage)
+  python3 BENCH.py metrics     (métriques de latence : coût d'une observation, commandes -> écran, export HTTP)
+  python3 BENCH.py trace       (trace Chrome / Perfetto : coût d'un intervalle, commandes + BLE + DHT simulés)
+  python3 BENCH.py profile     (mode --profile : fichiers .pstats par commande et par partie, coût du HUD)
+  python3 BENCH.py startup     (lancement de chaque mode : délai jusqu'à la première image, mémoire résidente)
+"""
+
+import argparse
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+# Pas de fenêtre ni de son : doit être défini avant l'initialisation de pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def _time_frames(draw, frames):
+    """Temps moyen par image (ms)"""
+    start = time.perf_counter()
+    for i in range(frames):
+        draw(i)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def bench_render(args):
+    """Écrans aide / menu / DHT / BLE : rendu direct vs cache de texte + calques statiques"""
+    import IRCMRPi
+
+    display = IRCMRPi.ImageDisplay()
+    controller = IRCMRPi.InputController(display, None, None)
+    options = IRCMRPi.MenuManager.MODE_OPTIONS
+    title = "SÉLECTIONNEZ LE MODE D'ENTRÉE"
+
+    def help_screen(i):
+        display.static_layer('help', controller._draw_help)
+        display.present()
+
+    screens = [
+        ("Aide", help_screen),
+        ("Menu (flèches)", lambda i: display.display_menu(title, options, i % len(options))),
+        ("DHT11", lambda i: display.display_dht_data(20 + (i % 5) / 10, 50 + (i % 3), False)),
+        ("BLE", lambda i: display.display_ble_data("Capteur", 15 + (i % 5) / 10, 60.0)),
+    ]
+
+    print(f"{'Écran':16} {'sans cache':>12} {'avec cache':>12} {'gain':>8}")
+    for name, draw in screens:
+        results = []
+        for enabled in (False, True):
+            display.render_cache = enabled
+            display.text_cache.clear()
+            display.layers.clear()
+            draw(0) # Première image (construction des calques) exclue de la mesure
+            results.append(_time_frames(draw, args.frames))
+        print(f"{name:16} {results[0]:10.3f}ms {results[1]:10.3f}ms {results[0] / results[1]:7.1f}x")
+    print(f"Cache de texte : {display.text_cache.hits} succès / {display.text_cache.misses} échecs")
+    display.close()
+
+
+def _check_turns(IRCMRPi, pygame, code_queue, ir_codes, keys):
+    """Vérifications déterministes de InputBuffer (clavier puis IR) : ordre des virages, demi-tours filtrés,
+    un seul virage par déplacement. Retourne la liste des échecs"""
+    failures = []
+    names = {turn: action for action, turn in IRCMRPi.InputBuffer.DIRECTIONS.items()}
+
+    def check(label, got, expected):
+        if got != expected:
+            failures.append(f"{label} : {got} au lieu de {expected}")
+
+    for source in ('clavier', 'IR'):
+        def inject(*actions, gap=0.03):
+            stamp = time.perf_counter()
+            for i, action in enumerate(actions):
+                if source == 'clavier':
+                    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=keys[action], stamp=stamp + i * gap))
+                else:
+                    code_queue.put((ir_codes[action], stamp + i * gap, stamp + i * gap))
+
+        # HAUT puis GAUCHE en moins de 100ms vers la droite : les deux virages, dans l'ordre, un par déplacement
+        inputs = IRCMRPi.InputBuffer(code_queue)
+        inputs.direction = (1, 0)
+        inject('UP', 'LEFT')
+        inputs.poll()
+        moves = []
+        for _ in range(3):
+            moves.append(names[inputs.next_direction()])
+            if len(moves) == 1:
+                check(f"{source} : virages en attente après le premier déplacement", len(inputs.turns), 1)
+        check(f"{source} : HAUT -> GAUCHE en 60ms", moves, ['UP', 'LEFT', 'LEFT'])
+
+        # Demi-tours : GAUCHE vers la droite, puis BAS après HAUT (en attente) sont ignorés, comme un doublon
+        inputs = IRCMRPi.InputBuffer(code_queue)
+        inputs.direction = (1, 0)
+        inject('LEFT', 'UP', 'DOWN', 'UP', 'RIGHT')
+        inputs.poll()
+        check(f"{source} : demi-tours filtrés", [names[turn[:2]] for turn in inputs.turns], ['UP', 'RIGHT'])
+    return failures
+
+
+def bench_input(args):
+    """Paires de virages à 30ms d'intervalle (clavier et IR) injectées pendant une partie simulée
+
+    Vérifie l'ordre des virages, le filtrage des demi-tours et la règle d'un virage par déplacement :
+    code de retour non nul si une vérification échoue.
+    """
+    import pygame
+    import IRCMRPi
+
+    display = IRCMRPi.ImageDisplay()
+    code_queue = queue.Queue()
+    # Codes IR fictifs pour l'injection
+    ir_codes = {'UP': 0xB0000001, 'DOWN': 0xB0000002, 'LEFT': 0xB0000003, 'RIGHT': 0xB0000004}
+    for action, code in ir_codes.items():
+        IRCMRPi.REMOTE_KEY_MAP[code] = action
+    keys = {'UP': pygame.K_UP, 'DOWN': pygame.K_DOWN, 'LEFT': pygame.K_LEFT, 'RIGHT': pygame.K_RIGHT}
+    failures = _check_turns(IRCMRPi, pygame, code_queue, ir_codes, keys)
+
+    inputs = IRCMRPi.InputBuffer(code_queue)
+    inputs.direction = (1, 0) # Le serpent part vers la droite
+    sequences = [('UP', 'LEFT'), ('DOWN', 'RIGHT')] # Chaque paire ramène sur l'axe horizontal
+    injected = []
+
+    def inject():
+        for i in range(args.turns // 2):
+            time.sleep(0.35)
+            for action in sequences[i % 2]:
+                if i % 4 < 2: # Alternance clavier / télécommande
+                    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=keys[action],
+                                                         stamp=time.perf_counter()))
+                else:
+                    stamp = time.perf_counter()
+                    code_queue.put((ir_codes[action], stamp, stamp)) # (code, dernier front, mise en file)
+                injected.append(action)
+                time.sleep(0.03)
+
+    injector = threading.Thread(target=inject, daemon=True)
+    injector.start()
+    clock = pygame.time.Clock()
+    next_move = time.perf_counter() + IRCMRPi.SNAKE_TICK
+    applied = [] # (direction, numéro du déplacement)
+    move = 0
+    while injector.is_alive() or inputs.turns:
+        inputs.poll()
+        now = time.perf_counter()
+        if now >= next_move:
+            next_move += IRCMRPi.SNAKE_TICK
+            move += 1
+            before = inputs.direction
+            if inputs.next_direction() != before:
+                applied.append((inputs.direction, move))
+        clock.tick(IRCMRPi.SNAKE_INPUT_HZ)
+
+    print(f"Virages injectés: {len(injected)} | appliqués: {len(applied)}")
+    print(inputs.latency_report())
+    display.close()
+
+    # Partie simulée : tous les virages appliqués dans l'ordre d'injection, jamais deux par déplacement
+    directions = [IRCMRPi.InputBuffer.DIRECTIONS[action] for action in injected]
+    if [direction for direction, _ in applied] != directions:
+        failures.append(f"partie : {len(applied)} virages appliqués sur {len(injected)}, ou dans le désordre")
+    if len({move for _, move in applied}) != len(applied):
+        failures.append("partie : plusieurs virages appliqués au même déplacement")
+    for failure in failures:
+        print(f"ÉCHEC {failure}")
+    if failures:
+        sys.exit(1)
+    print("Vérifications : OK")
+
+
+def bench_ble(args):
+    """Scanner simulé : latence annonce -> file -> boucle d'événements, et cycles start/stop répétés"""
+    import pygame
+    import IRCMRPi
+
+    pygame.display.init()
+    loop = IRCMRPi.EventLoop()
+    monitor = IRCMRPi.BLEMonitor("Capteur", backend=args.backend)
+    monitor.on_data = lambda: loop.wake('ble')
+    threads = threading.active_count()
+
+    delays = []
+    seen = 0
+    for cycle in range(args.cycles):
+        monitor.start()
+        monitor.start() # Idempotent : pas de second scanner
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            loop.wait(0.05)
+            version, states = monitor.registry.snapshot()
+            if version != seen: # Délai depuis l'émission de la dernière annonce simulée
+                delays.append(time.monotonic() - monitor.last_timestamp)
+                seen = version
+        monitor.stop()
+        monitor.stop()
+        seen = monitor.registry.snapshot()[0] # Annonce arrivée pendant l'arrêt
+
+    leaked = threading.active_count() - threads - 1 # Le thread de la boucle asyncio est réutilisé
+    monitor.close()
+    delays.sort()
+    print(f"Cycles start/stop: {args.cycles} | threads en trop: {leaked}")
+    print(f"Données reçues: {monitor.received} | annonce -> registre: {monitor.mean_latency_ms():.3f}ms")
+    if delays:
+        print(f"Annonce -> boucle d'événements: médiane {delays[len(delays) // 2] * 1000:.3f}ms"
+              f" | max {delays[-1] * 1000:.3f}ms")
+
+
+def bench_payload(args):
+    """Coût par annonce : analyse du nom vs struct sur memoryview + filtre de séquence"""
+    from BLEPAYLOAD import COMPANY_ID, DUPLICATE, PayloadReader, encode
+    from BLESCAN import Advertisement
+
+    count = args.frames * 100
+    named = [Advertisement("AA", f"Capteur|{20 + i % 10}.5|{50 + i % 7}.0|100|{i}", -60, {}, {}, 0.0)
+             for i in range(256)]
+    binary = [Advertisement("AA", None, -60, {COMPANY_ID: encode(20 + i % 10 + 0.5, 50 + i % 7, 100, i // 3)},
+                            {}, 0.0) for i in range(256)] # Chaque mesure annoncée 3 fois
+
+    def parse_name(adv):
+        parts = adv.name.split('|')
+        if len(parts) == 5:
+            return float(parts[1]), float(parts[2])
+
+    payloads = PayloadReader(addresses=["AA"]) # Liste blanche comme BLE_CONFIG['addresses']
+
+    def parse_binary(adv):
+        reading = payloads.read(adv)
+        if reading is not None and reading is not DUPLICATE:
+            return reading[0], reading[1]
+
+    print(f"{'Format':10} {'ns/annonce':>12}")
+    for name, parse, advs in (("nom", parse_name, named), ("binaire", parse_binary, binary)):
+        start = time.perf_counter()
+        for i in range(count):
+            parse(advs[i & 255])
+        print(f"{name:10} {(time.perf_counter() - start) * 1e9 / count:12.0f}")
+    print(f"Doublons éliminés (binaire): {payloads.duplicates}")
+
+
+def bench_registry(args):
+    """Rafale d'annonces de nombreux capteurs : coût d'une mise à jour, réveils et mémoire du registre"""
+    import tracemalloc
+    import IRCMRPi
+    from BLEREGISTRY import SensorRegistry
+
+    def feed(registry, count):
+        wakes = 0
+        for i in range(count):
+            sensor = i % args.sensors
+            if registry.update(f"AA:{sensor:04X}", f"Capteur-{sensor}", 20.0 + i % 7, 50.0, 100, -60, i):
+                wakes += 1
+            if i % 1000 == 0:
+                registry.snapshot() # L'affichage lit le registre de temps en temps
+        return wakes
+
+    for rounds in (1, 10):
+        count = args.sensors * args.frames * rounds
+        registry = SensorRegistry()
+        start = time.perf_counter()
+        wakes = feed(registry, count)
+        elapsed = time.perf_counter() - start
+        # Mémoire retenue par un registre neuf après la même rafale
+        tracemalloc.start()
+        measured = SensorRegistry()
+        feed(measured, count)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del measured
+        print(f"{count:>9} annonces: {elapsed * 1e9 / count:6.0f} ns/annonce | réveils: {wakes}"
+              f" | capteurs suivis: {len(registry)} (oubliés: {registry.evicted})"
+              f" | mémoire: {memory / 1024:.0f} Ko")
+
+    display = IRCMRPi.ImageDisplay()
+    states = registry.snapshot()[1]
+    display.display_ble_dashboard(states, args.frames)
+    ms = _time_frames(lambda i: display.display_ble_dashboard(registry.snapshot()[1], args.frames + i // 50),
+                      args.frames)
+    print(f"Tableau de bord ({len(states)} capteurs): {ms:.3f}ms/image")
+    display.close()
+
+
+def bench_dht(args):
+    """Mesures DHT sur un démon pigpio simulé : taux de réussite et durée par lecture selon la capture.
+    Code de retour non nul si un handle de notification reste ouvert après close()"""
+    import FAKEPIGPIO
+    import IRCMRPi
+
+    if not IRCMRPi.PIGPIO_AVAILABLE:
+        IRCMRPi.pigpio = FAKEPIGPIO # Constantes pigpio de la capture Python
+    failures = []
+    print(f"{'Capture':10} {'réussites':>10} {'ms/lecture':>11}")
+    ingestion = IRCMRPi.EDGE_INGESTION
+    for label, mode, edges in (('python', 'python', 'callback'), ('notify', 'python', 'notify'),
+                               ('daemon', 'daemon', ingestion)):
+        IRCMRPi.EDGE_INGESTION = edges
+        pi = FAKEPIGPIO.FakePi({IRCMRPi.DHT_PIN: FAKEPIGPIO.DHTSensorModel(22.5, 48.0, jitter_us=3, seed=1)})
+        reader = IRCMRPi.DHT11Reader(IRCMRPi.DHT_PIN, pi=pi, capture=mode)
+        ok = 0
+        elapsed = 0.0
+        for i in range(args.reads):
+            start = time.perf_counter()
+            try:
+                reader.measure()
+                ok += 1
+            except Exception:
+                pass
+            elapsed += time.perf_counter() - start
+            time.sleep(0.01) # Le capteur simulé termine sa trame
+        reader.close()
+        if pi.notify_handles():
+            failures.append(f"{label} : {pi.notify_handles()} handles de notification ouverts après close()")
+        pi.stop()
+        print(f"{label:10} {ok:>5}/{args.reads:<4} {elapsed * 1000 / args.reads:11.1f}")
+    IRCMRPi.EDGE_INGESTION = ingestion
+
+    # Plusieurs capteurs (DHT11 et DHT22 alternés) déclenchés dans la même fenêtre
+    from DHTCAPTURE import MultiDHTReader, DHTError, DHT11, DHT22
+    print(f"\n{'Capteurs':10} {'réussites':>10} {'ms/lecture':>11}")
+    for count in (1, 8):
+        pins = [5 + i for i in range(count)]
+        kinds = {pin: DHT22 if i % 2 else DHT11 for i, pin in enumerate(pins)}
+        pi = FAKEPIGPIO.FakePi({pin: FAKEPIGPIO.DHTSensorModel(-4.5 + i if kinds[pin] == DHT22 else 20 + i, 40.0 + i,
+                                                               jitter_us=3, seed=i, kind=kinds[pin])
+                                for i, pin in enumerate(pins)})
+        reader = MultiDHTReader(pi, kinds)
+        ok = 0
+        elapsed = 0.0
+        for i in range(args.reads):
+            start = time.perf_counter()
+            results = reader.read_all()
+            elapsed += time.perf_counter() - start
+            ok += sum(not isinstance(result, DHTError) for result in results.values())
+            time.sleep(0.01)
+        reader.close()
+        if pi.notify_handles():
+            failures.append(f"{count} capteurs : {pi.notify_handles()} handles de notification ouverts après close()")
+        pi.stop()
+        print(f"{count:<10} {ok:>5}/{args.reads * count:<4} {elapsed * 1000 / args.reads:11.1f}")
+    print(f"Dernière lecture: {results}")
+    for failure in failures:
+        print(f"ÉCHEC : {failure}")
+    if failures:
+        sys.exit(1)
+
+
+def bench_dhttrace(args):
+    """Trace DHT rejouée par EDGETRACE : seuil fixe vs décodage adaptatif
+
+    --trace : trace enregistrée sur le matériel (EDGETRACE.py record --dht). Sinon trace synthétique (capteurs
+    nominaux, câbles longs, clones, parasites, fronts perdus) dont les valeurs sont connues : toute mesure
+    fausse du décodage adaptatif donne un code de retour non nul.
+    """
+    import random
+    import tempfile
+    import EDGETRACE
+    from DHTCAPTURE import DHTError
+    from FAKEPIGPIO import DHTSensorModel
+    from IRCMRPi import DHT_PIN
+
+    if args.trace:
+        trace = EDGETRACE.Trace(args.trace)
+        try:
+            print(f"Trace enregistrée {args.trace} : {len(trace)} fronts, {trace.duration_us() / 1e6:.0f}s")
+            EDGETRACE.REPLAY_TARGETS['dht'](trace, None, DHT_PIN)
+        finally:
+            trace.close()
+        return
+
+    rng = random.Random(1)
+    profiles = [
+        DHTSensorModel(jitter_us=4, seed=1),                              # Nominal
+        DHTSensorModel(jitter_us=4, seed=2, bit_us=(14, 36)),             # Câble long : fronts montants lents
+        DHTSensorModel(jitter_us=4, seed=3, bit_us=(45, 92)),             # Clone : bits plus longs
+        DHTSensorModel(jitter_us=4, seed=4, glitch_rate=0.5),             # Parasites sur le bus au repos
+        DHTSensorModel(jitter_us=4, seed=5, glitch_rate=0.5),             # Fronts perdus (un état bas manquant)
+    ]
+    recorder = EDGETRACE.TraceRecorder()
+    expected = [] # Mesure attendue par capture (None : trame corrompue, aucune mesure ne doit sortir)
+    tick = 0
+    for i in range(args.reads):
+        profile = i % len(profiles)
+        sensor = profiles[profile]
+        sensor.temperature = round(rng.uniform(15, 30), 1)
+        sensor.humidity = float(rng.randint(30, 80))
+        response = sensor.response()
+        if profile == 4:
+            # Fin d'un bit et début du suivant perdus : deux états hauts fusionnés, la trame n'a que 39 bits
+            k = 4 + 2 * rng.randrange(39)
+            response[k + 2] = (response[k][0] + response[k + 1][0] + response[k + 2][0], response[k + 2][1])
+            del response[k:k + 2]
+            expected.append(None)
+        else:
+            expected.append((sensor.temperature, sensor.humidity))
+        tick += 1000000                                 # Une capture par seconde
+        recorder(DHT_PIN, 0, tick)                      # Impulsion de démarrage
+        tick += 18000
+        recorder(DHT_PIN, 1, tick)                      # Bus relâché
+        for delay, level in response:
+            tick += delay
+            recorder(DHT_PIN, level, tick & 0xFFFFFFFF)
+
+    path = os.path.join(tempfile.mkdtemp(), "dht.edgt")
+    recorder.save(path)
+    trace = EDGETRACE.Trace(path)
+    results = []
+    try:
+        print(f"{args.reads} captures synthétiques, profils: nominal / câble long / clone / parasites / fronts perdus")
+        EDGETRACE.REPLAY_TARGETS['dht'](trace, None, DHT_PIN, on_decode=results.append)
+    finally:
+        trace.close()
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+    wrong = [(i, result, want) for i, (result, want) in enumerate(zip(results, expected))
+             if not isinstance(result, DHTError) and (want is None or (round(result[0], 1), result[1]) != want)]
+    missed = sum(isinstance(result, DHTError) and want is not None for result, want in zip(results, expected))
+    print(f"Mesures fausses (adaptatif) : {len(wrong)}, trames valides rejetées : {missed}")
+    if len(results) != len(expected):
+        print(f"ÉCHEC : {len(results)} captures décodées au lieu de {len(expected)}")
+        sys.exit(1)
+    if wrong:
+        for i, result, want in wrong[:5]:
+            print(f"ÉCHEC : capture {i} décodée en {result} au lieu de {want}")
+        sys.exit(1)
+
+
+def _sirc_edges(gpio, address, command, bits, start):
+    """Fronts d'une trame Sony SIRC (level 1 : fin d'un pulse, level 0 : fin d'un espace). Retourne (fronts, fin)"""
+    code = command | (address << 7)
+    edges = [(gpio, 0, start), (gpio, 1, start + 2400)] # Entête 2.4ms
+    tick = start + 2400
+    for bit in range(bits): # Bit de poids faible en premier
+        tick += 600
+        edges.append((gpio, 0, tick))
+        tick += 1200 if (code >> bit) & 1 else 600
+        edges.append((gpio, 1, tick))
+    return edges, tick
+
+
+def bench_irreplay(args):
+    """Trames Sony SIRC 12 bits rejouées (EDGETRACE) avec / sans watchdog pigpio : délai d'émission, aucune
+    trame fantôme, aucun rapport du watchdog hors trame. Code de retour non nul si une vérification échoue"""
+    import sys
+    import tempfile
+    import EDGETRACE
+    from EDGESTREAM import NotifyReader, pack_reports, TIMEOUT
+    from IRDECODER import IRDecoderSet, WATCHDOG_MS
+
+    gpio = 18
+    cases = {}
+    # Une seule trame isolée (touche appuyée brièvement)
+    cases['isolée'], end = _sirc_edges(gpio, 1, 21, 12, 1000000)
+    # Deux touches différentes à 2s d'intervalle : la première ne doit pas sortir au premier front de la seconde
+    first, end = _sirc_edges(gpio, 1, 21, 12, 1000000)
+    second, _ = _sirc_edges(gpio, 1, 19, 12, end + 2000000)
+    cases['deux touches'] = first + second
+    # Touche maintenue : trois trames toutes les 45ms (une trame + deux répétitions)
+    cases['maintenue'] = [edge for k in range(3) for edge in _sirc_edges(gpio, 1, 21, 12, 1000000 + k * 45000)[0]]
+
+    expected = {
+        'isolée': [(21, False)],
+        'deux touches': [(21, False), (19, False)],
+        'maintenue': [(21, False), (21, True), (21, True)],
+    }
+    directory = tempfile.mkdtemp()
+    failures = []
+    print(f"{'Cas':14} {'watchdog':>9} {'trames':>8} {'rapports':>9} {'hors trame':>11}"
+          f" {'délai fin de trame -> émission':>32}")
+    for name, edges in cases.items():
+        recorder = EDGETRACE.TraceRecorder()
+        for edge in edges:
+            recorder(*edge)
+        path = os.path.join(directory, "sirc.edgt")
+        recorder.save(path)
+        for watchdog in (EDGETRACE.ReplayWatchdog(), None):
+            events = []
+            now = [0] # Tick du front (ou watchdog) en cours de traitement
+            idle = [0] # Rapports du watchdog reçus sans trame en cours
+            # Watchdog armé par le décodeur au début de chaque trame, comme IRController
+            arm = None if watchdog is None else (lambda ms: watchdog.set_watchdog(gpio, ms))
+            decoder = IRDecoderSet(lambda event: events.append((event, now[0])), ('SIRC',), watchdog=arm)
+
+            def feed(gpio, level, tick):
+                now[0] = tick
+                if level == TIMEOUT and not decoder.active:
+                    idle[0] += 1
+                decoder.feed(gpio, level, tick)
+
+            trace = EDGETRACE.Trace(path)
+            EDGETRACE.replay(trace, feed, watchdog=watchdog)
+            trace.close()
+            got = [(event.command, event.repeat) for event, _ in events]
+            delays = [((at - event.tick) & 0xFFFFFFFF) / 1000 for event, at in events]
+            label = f"{WATCHDOG_MS}ms" if watchdog else "aucun"
+            reports = watchdog.reports if watchdog else 0
+            print(f"{name:14} {label:>9} {len(events):8} {reports:9} {idle[0]:11}"
+                  f" {', '.join(f'{d:.1f}ms' for d in delays) or '-':>32}")
+            if idle[0]:
+                # Watchdog laissé armé au repos : pigpio réveille le callback toutes les WATCHDOG_MS
+                failures.append(f"{name} ({label}) : {idle[0]} rapports du watchdog sans trame en cours")
+            if watchdog and got != expected[name]:
+                failures.append(f"{name} ({label}) : {got} au lieu de {expected[name]}")
+            if watchdog and any(delay > WATCHDOG_MS for delay in delays):
+                failures.append(f"{name} ({label}) : émission plus de {WATCHDOG_MS}ms après la fin de trame")
+            if any(delay * 1000 > 45000 for delay in delays):
+                failures.append(f"{name} ({label}) : trame périmée émise ({max(delays):.0f}ms après sa fin)")
+        os.remove(path)
+
+    # Même flux par le pipe de notification (rapports de watchdog pigpio compris)
+    events = []
+    armed = [] # Appels à set_watchdog : armé au premier front de la trame, désarmé au rapport
+    decoder = IRDecoderSet(events.append, ('SIRC',), watchdog=armed.append)
+    records, end = _sirc_edges(gpio, 1, 21, 12, 1000000)
+    read_fd, write_fd = os.pipe()
+    reader = NotifyReader(read_fd, {gpio: decoder.feed}, initial_levels=0xFFFFFFFF)
+    reader.feed_bytes(pack_reports(records + [(gpio, TIMEOUT, end + WATCHDOG_MS * 1000)]))
+    os.close(read_fd)
+    os.close(write_fd)
+    got = [(event.command, event.repeat) for event in events]
+    print(f"{'notification':14} {f'{WATCHDOG_MS}ms':>9} {len(events):8} {'':9} {'':11} set_watchdog : {armed}")
+    if got != expected['isolée']:
+        failures.append(f"pipe de notification : {got} au lieu de {expected['isolée']}")
+    if armed != [WATCHDOG_MS, 0]:
+        failures.append(f"pipe de notification : set_watchdog {armed} au lieu de {[WATCHDOG_MS, 0]}")
+    os.rmdir(directory)
+
+    for failure in failures:
+        print(f"ÉCHEC : {failure}")
+    if failures:
+        sys.exit(1)
+    print("Vérifications : OK")
+
+
+def bench_series(args):
+    """Historique sur des mois de mesures simulées : coût d'un ajout, mémoire et fichiers constants"""
+    import math
+    import tempfile
+    import tracemalloc
+    import IRCMRPi
+    from TIMESERIES import SeriesStore
+
+    def feed(store, count, start=0):
+        # Une mesure toutes les 2s (intervalle du DHT), cycle jour / nuit
+        for i in range(start, start + count):
+            t = 1.7e9 + 2 * i
+            store.add('temperature', t, 20 + 5 * math.sin(i / 43200 * math.pi))
+            store.add('humidity', t, 50 + 10 * math.cos(i / 43200 * math.pi))
+
+    for days in (1, 30):
+        count = days * 43200
+        store = SeriesStore()
+        start = time.perf_counter()
+        feed(store, count)
+        elapsed = time.perf_counter() - start
+        store.close()
+        # Mémoire retenue par un historique neuf après les mêmes mesures
+        tracemalloc.start()
+        store = SeriesStore()
+        feed(store, count)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        channel = store.get('temperature')
+        sizes = " / ".join(f"{name} {len(ring)}" for name, ring in channel.rings.items())
+        print(f"{days:>3} jour(s), {count:>8} mesures/voie: {elapsed * 1e9 / (2 * count):5.0f} ns/mesure"
+              f" | mémoire: {memory / 1024:.0f} Ko | points: {sizes}")
+        store.close()
+
+    # Fichiers projetés en mémoire : taille fixe, historique relu au redémarrage
+    directory = tempfile.mkdtemp()
+    store = SeriesStore(directory)
+    feed(store, 43200)
+    stats = store.stats('temperature', 'minute')
+    store.close()
+    reopened = SeriesStore(directory)
+    feed(reopened, 1, 43200)
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    print(f"mmap: {len(os.listdir(directory))} fichiers, {size / 1024:.0f} Ko | "
+          f"après redémarrage: {len(reopened.get('temperature').rings['minute'])} minutes relues, "
+          f"stats identiques: {reopened.stats('temperature', 'minute') == stats}")
+    reopened.close()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    # Écran DHT avec courbe : nouvelle mesure à chaque image
+    display = IRCMRPi.ImageDisplay()
+    store = SeriesStore()
+    feed(store, 600)
+
+    def frame(i):
+        feed(store, 1, 600 + i)
+        display.display_dht_data(20.0 + (i % 5) / 10, 50.0, False, series=store)
+
+    frame(0)
+    print(f"Écran DHT + courbe: {_time_frames(frame, args.frames):.3f}ms/image")
+    display.close()
+
+
+def bench_sensorlog(args):
+    """Journal SQLite : une ligne par transaction vs lots du thread d'écriture, coût d'un appel côté affichage"""
+    import sqlite3
+    import tempfile
+    from SENSORLOG import SensorLog
+
+    directory = tempfile.mkdtemp()
+    count = args.rows
+
+    # Référence : une transaction (donc une écriture sur la carte SD) par ligne
+    path = os.path.join(directory, "direct.db")
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("CREATE TABLE readings (ts REAL, source TEXT, sensor TEXT, temperature REAL, humidity REAL)")
+    direct = min(count, 2000)
+    start = time.perf_counter()
+    for i in range(direct):
+        with db:
+            db.execute("INSERT INTO readings VALUES (?, ?, ?, ?, ?)", (time.time(), 'ble', 'AA', 20.0, 50.0))
+    elapsed = time.perf_counter() - start
+    db.close()
+    print(f"Une transaction par ligne : {direct / elapsed:9.0f} lignes/s | {elapsed * 1e6 / direct:7.1f} µs/ligne"
+          f" dans le thread appelant")
+
+    # Journal : l'appelant ne fait qu'ajouter à la file, le thread d'écriture insère par lots
+    path = os.path.join(directory, "log.db")
+    log = SensorLog(path, flush_interval=0.05, max_pending=count)
+    log.start()
+    start = time.perf_counter()
+    for i in range(count):
+        if i % 10:
+            log.reading('ble', f"AA:{i % 16:02X}", 20.0 + i % 7, 50.0)
+        else:
+            log.event('command', '4')
+    queued = time.perf_counter() - start
+    log.flush()
+    elapsed = time.perf_counter() - start
+    log.close()
+    db = sqlite3.connect(path)
+    rows = db.execute("SELECT (SELECT COUNT(*) FROM readings) + (SELECT COUNT(*) FROM events)").fetchone()[0]
+    hours = db.execute("SELECT COUNT(*) FROM readings_hourly").fetchone()[0]
+    db.close()
+    print(f"Journal (lots)            : {count / elapsed:9.0f} lignes/s | {queued * 1e9 / count:7.0f} ns/ligne"
+          f" dans le thread appelant | {log.batches} lots, {rows} lignes écrites, {log.dropped} perdues,"
+          f" {hours} moyennes horaires")
+
+    # Lignes ajoutées par d'autres threads pendant les lots : toutes écrites après flush(), puis après close()
+    path = os.path.join(directory, "concurrent.db")
+    class SlowLog(SensorLog):
+        def _write_batch(self, db):
+            super()._write_batch(db)
+            time.sleep(0.002) # Carte SD lente : lot en cours pendant que les lignes suivantes arrivent
+
+    per_thread = 20000
+    log = SlowLog(path, flush_interval=0.001, max_pending=2 * per_thread) # Aucune ligne perdue
+    log.start()
+    added = [0, 0]
+
+    def produce(slot):
+        for i in range(per_thread):
+            log.reading('dht', f"GPIO{slot}", 21.0, 45.0)
+            added[slot] += 1
+            if i % 50 == 0:
+                time.sleep(0.0002) # Rythme d'un capteur rapide : les lignes arrivent pendant les lots
+
+    producers = [threading.Thread(target=produce, args=(slot,)) for slot in range(2)]
+    for producer in producers:
+        producer.start()
+    failures = []
+    flushes = 0
+    while any(producer.is_alive() for producer in producers):
+        time.sleep(0.001) # Demande faite pendant un lot en cours (thread d'écriture réveillé toutes les 1ms)
+        before = sum(added) # Lignes ajoutées avant la demande (au moins)
+        flushes += 1
+        if not log.flush():
+            failures.append("flush() : délai dépassé")
+        elif log.written < before:
+            failures.append(f"flush() acquitté avec {before - log.written} lignes non écrites")
+    for producer in producers:
+        producer.join()
+    log.close()
+    db = sqlite3.connect(path)
+    rows = db.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+    db.close()
+    if rows != sum(added):
+        failures.append(f"close() : {rows} lignes écrites sur {sum(added)}")
+    print(f"Écritures concurrentes     : {sum(added)} lignes, {log.batches} lots, {flushes} flush()")
+    for failure in failures[:5]:
+        print(f"ÉCHEC {failure}")
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+    if failures:
+        sys.exit(1)
+
+
+def bench_metrics(args):
+    """Coût des métriques sur le chemin critique, latence commande -> écran et export Prometheus"""
+    import contextlib
+    import io
+    import tempfile
+    import urllib.request
+    import IRCMRPi
+    from METRICS import MetricsRegistry, MetricsServer
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram('bench_seconds', "Observation de test")
+    counter = registry.counter('bench_total', "Incrément de test")
+    count = 200000
+    for name, call in (("Histogram.observe", lambda: histogram.observe(0.003)), ("Counter.inc", counter.inc)):
+        start = time.perf_counter()
+        for _ in range(count):
+            call()
+        print(f"{name:18}: {(time.perf_counter() - start) * 1e9 / count:5.0f} ns")
+
+    # Commandes avec horodatages IR simulés (front reçu 2ms avant la sortie de file)
+    display = IRCMRPi.ImageDisplay()
+    controller = IRCMRPi.InputController(display, None, None)
+    with contextlib.redirect_stdout(io.StringIO()): # Sans les messages "Commande: ..."
+        for i in range(args.frames):
+            key = ('1', '2', '3', 'h')[i % 4]
+            now = time.perf_counter()
+            controller.input_stamps = (now - 0.002, now)
+            controller.process_command(key)
+    for histogram in (controller.command_latency, controller.end_to_end_latency):
+        print(f"{histogram.name}: {histogram.count} mesures, moyenne {histogram.sum * 1000 / histogram.count:.2f}ms,"
+              f" p50 <= {histogram.quantile(0.5) * 1000:g}ms, p99 <= {histogram.quantile(0.99) * 1000:g}ms")
+
+    # Export : HTTP local et socket Unix
+    directory = tempfile.mkdtemp()
+    for address in (('127.0.0.1', 0), os.path.join(directory, "metrics.sock")):
+        server = MetricsServer(controller.metrics, address)
+        try:
+            if isinstance(address, str):
+                import http.client
+                import socket
+
+                class UnixConnection(http.client.HTTPConnection):
+                    def connect(self):
+                        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                        self.sock.connect(address)
+
+                def fetch():
+                    connection = UnixConnection('localhost')
+                    connection.request('GET', '/metrics')
+                    body = connection.getresponse().read()
+                    connection.close()
+                    return body
+            else:
+                url = "http://%s:%d/metrics" % server.server.server_address
+
+                def fetch():
+                    with urllib.request.urlopen(url) as response:
+                        return response.read()
+            body = fetch()
+            start = time.perf_counter()
+            for _ in range(20):
+                fetch()
+            elapsed = (time.perf_counter() - start) * 1000 / 20
+            label = "socket Unix" if isinstance(address, str) else "HTTP local"
+            print(f"Export {label:11}: {len(body)} octets, {elapsed:.2f}ms/requête")
+        finally:
+            server.close()
+    os.rmdir(directory)
+    display.close()
+
+
+def bench_trace(args):
+    """Trace de commandes, d'un scan BLE simulé et de captures DHT simulées, puis intervalles les plus longs"""
+    import contextlib
+    import io
+    import json
+    import tempfile
+    import FAKEPIGPIO
+    import IRCMRPi
+    from TRACING import Tracer
+
+    count = 200000
+    for enabled in (False, True):
+        tracer = Tracer(enabled=enabled)
+        start = time.perf_counter()
+        for _ in range(count):
+            with tracer.span('bench'):
+                pass
+        print(f"span() {'activé' if enabled else 'désactivé':10}: {(time.perf_counter() - start) * 1e9 / count:5.0f} ns")
+
+    tracer = IRCMRPi.TRACER
+    tracer.start()
+    if not IRCMRPi.PIGPIO_AVAILABLE:
+        IRCMRPi.pigpio = FAKEPIGPIO
+    pi = FAKEPIGPIO.FakePi({IRCMRPi.DHT_PIN: FAKEPIGPIO.DHTSensorModel(22.5, 48.0, jitter_us=3, seed=1)})
+    reader = IRCMRPi.DHT11Reader(IRCMRPi.DHT_PIN, pi=pi)
+    monitor = IRCMRPi.BLEMonitor("Capteur", backend='fake-binary')
+    display = IRCMRPi.ImageDisplay()
+    display.image_cache.warm_thread.join()
+    display.image_cache.invalidate() # Premier affichage de chaque image : chargement depuis le disque
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = IRCMRPi.InputController(display, reader, monitor)
+        controller.dht_sampler.interval = controller.dht_sampler.min_interval
+        for i in range(args.frames // 50 + 1):
+            for key in ('1', '2', '3', 'h'):
+                controller.process_command(key)
+        monitor.start()
+        time.sleep(0.5)
+        monitor.stop()
+        time.sleep(max(0.0, 2.5 - (time.perf_counter() - tracer.origin))) # Au moins deux captures DHT
+        controller.dht_sampler.close()
+        monitor.close()
+    tracer.stop()
+    pi.stop()
+    display.close()
+
+    directory = tempfile.mkdtemp()
+    path = tracer.dump(directory)
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    os.remove(path)
+    os.rmdir(directory)
+    tracks = {e['tid']: e['args']['name'] for e in events if e['name'] == 'thread_name'}
+    spans = [e for e in events if e['ph'] == 'X']
+    print(f"{len(spans)} intervalles, pistes: " +
+          ", ".join(f"{name} ({sum(e['tid'] == tid for e in spans)})" for tid, name in tracks.items()))
+    longest = {}
+    for e in spans:
+        if e['dur'] > longest.get(e['name'], {'dur': -1})['dur']:
+            longest[e['name']] = e
+    print("Intervalle le plus long de chaque type :")
+    for e in sorted(longest.values(), key=lambda e: e['dur'], reverse=True):
+        print(f"  {e['dur'] / 1000:8.2f}ms  {tracks[e['tid']]:12} {e['name']} {e.get('args', '')}")
+
+
+def bench_profile(args):
+    """Commandes et partie de Snake profilées (.pstats), puis coût du HUD par image"""
+    import contextlib
+    import io
+    import pstats
+    import tempfile
+    import pygame
+    import IRCMRPi
+    from PROFILING import CommandProfiler
+
+    directory = tempfile.mkdtemp()
+    display = IRCMRPi.ImageDisplay()
+    controller = IRCMRPi.InputController(display, None, None)
+    controller.profiler = CommandProfiler(directory)
+
+    def press(*keys, delay=0.3):
+        # Touches postées depuis un autre thread pendant la commande (sortie d'écran, fin de partie)
+        def run():
+            for key in keys:
+                time.sleep(delay)
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        threading.Thread(target=run, daemon=True).start()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for key in ('1', '2', '3'):
+            controller.process_command(key)
+        press(pygame.K_SPACE)
+        controller.process_command('4') # Mode test : quitte à la première touche
+        press(pygame.K_RIGHT, pygame.K_DOWN, pygame.K_q)
+        controller.process_command('9')
+    for path in controller.profiler.saved:
+        stats = pstats.Stats(path)
+        print(f"{os.path.basename(path):44} {stats.total_calls:7} appels, {stats.total_tt * 1000:8.1f}ms")
+    for path in controller.profiler.saved:
+        os.remove(path)
+    os.rmdir(directory)
+
+    draw = lambda i: display.display_dht_data(20 + (i % 5) / 10, 50 + (i % 3), False)
+    for hud in (None, controller.hud_sources()):
+        display.hud = hud
+        draw(0)
+        print(f"Écran DHT {'avec' if hud is not None else 'sans'} HUD: {_time_frames(draw, args.frames):.3f}ms/image")
+    display.close()
+
+
+STARTUP_MODES = ('import', 'console', 'keyboard', 'ir')
+
+
+def _startup_child(mode, launched):
+    """Processus neuf (bench startup) : étapes du lancement de main() horodatées depuis launched (time.time())"""
+    import contextlib
+    import io
+    import types
+
+    marks = []
+    mark = lambda step: marks.append((step, time.time() - launched))
+    init_steps = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        import IRCMRPi
+        mark('import')
+        if mode != 'import':
+            init = IRCMRPi.start_init() # Comme main() : matériel vérifié pendant l'affichage du menu
+            menu = IRCMRPi.MenuManager()
+            init.run('display', menu.init_display)
+            menu.display.display_menu("SÉLECTIONNEZ LE MODE D'ENTRÉE", IRCMRPi.MenuManager.MODE_OPTIONS, 0)
+            mark('menu')
+            pi = init.result('pigpio') if 'pigpio' in init.steps else None
+            dht_reader = IRCMRPi.DHT11Reader(IRCMRPi.DHT_PIN, IRCMRPi.DHT_SENSOR, pi=pi, connect=False)
+        if mode == 'console':
+            # Première commande de la console : mesure DHT affichée dans la fenêtre du menu
+            console = IRCMRPi.ConsoleMode(menu.display, dht_reader)
+            console.display.on_frame = lambda now: mark('frame')
+            temp, hum, is_test = console.dht_reader.read()
+            console.display.display_dht_data(temp, hum, is_test)
+        elif mode in ('keyboard', 'ir'):
+            ble_monitor = IRCMRPi.BLEMonitor(**IRCMRPi.BLE_CONFIG)
+            if mode == 'ir':
+                controller = IRCMRPi.IRController(menu.display, dht_reader, ble_monitor, pi=pi)
+            else:
+                controller = IRCMRPi.KeyboardController(menu.display, dht_reader, ble_monitor)
+            controller.display.on_frame = lambda now: mark('frame') # Écran affiché (avant la pause anti-rebond)
+            controller.display_help() # Premier écran de run()
+        if mode != 'import':
+            init.wait()
+            init_steps = [(step.name, step.status, step.duration * 1000) for step in init.steps.values()]
+    loaded = lambda name: type(sys.modules.get(name)) is types.ModuleType # Chargé (pas seulement différé)
+    modules = [name for name in ('pygame', 'PIL.Image', 'bleak') if loaded(name)]
+    print("@startup", repr({'marks': marks, 'rss': IRCMRPi.rss_bytes(), 'modules': modules, 'init': init_steps}),
+          flush=True)
+    os._exit(0) # Sans attendre les threads (échantillonnage DHT, préchargement des images)
+
+
+def bench_startup(args):
+    """Chaque mode lancé dans un processus neuf : import, menu affiché, premier écran du mode, mémoire"""
+    import ast
+    import IRCMRPi
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'Mode':10} {'import':>9} {'menu':>9} {'1re image':>10} {'RSS':>9}  modules chargés")
+    init_steps = {} # Étape de l'initialisation parallèle -> [(état, durée ms)], tous modes confondus
+    for mode in STARTUP_MODES:
+        if mode == 'ir' and not IRCMRPi.IR_AVAILABLE:
+            print(f"{mode:10} (pigpio non installé)")
+            continue
+        runs = []
+        for _ in range(args.runs):
+            launched = time.time()
+            output = subprocess.run([sys.executable, '-c', f"import BENCH; BENCH._startup_child({mode!r}, {launched!r})"],
+                                    cwd=directory, capture_output=True, text=True).stdout
+            line = next((l for l in output.splitlines() if l.startswith("@startup ")), None)
+            if line is None:
+                print(f"{mode:10} échec du lancement")
+                break
+            runs.append(ast.literal_eval(line[len("@startup "):]))
+        if not runs:
+            continue
+        steps = {}
+        for run in runs:
+            for step, elapsed in run['marks']:
+                steps.setdefault(step, []).append(elapsed * 1000)
+            for name, status, duration in run['init']:
+                init_steps.setdefault(name, []).append((status, duration))
+        cells = [f"{statistics.median(steps[step]):7.0f}ms" if step in steps else f"{'-':>9}"
+                 for step in ('import', 'menu', 'frame')]
+        rss = statistics.median(run['rss'] for run in runs) / 1e6
+        print(f"{mode:10} {cells[0]} {cells[1]} {cells[2]:>10} {rss:7.1f}Mo  {', '.join(runs[-1]['modules']) or '-'}")
+    print(f"(médiane de {args.runs} lancements, délais depuis le lancement de l'interpréteur)")
+    print("Initialisation parallèle (durée médiane de chaque étape) :")
+    for name, results in init_steps.items():
+        statuses = sorted({status for status, _ in results})
+        print(f"  {name:10} {statistics.median(d for _, d in results):8.1f}ms  {', '.join(statuses)}")
+
+
+BENCHMARKS = {
+    'render': bench_render,
+    'input': bench_input,
+    'ble': bench_ble,
+    'payload': bench_payload,
+    'registry': bench_registry,
+    'dht': bench_dht,
+    'dhttrace': bench_dhttrace,
+    'irreplay': bench_irreplay,
+    'series': bench_series,
+    'sensorlog': bench_sensorlog,
+    'metrics': bench_metrics,
+    'trace': bench_trace,
+    'profile': bench_profile,
+    'startup': bench_startup,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks du contrôleur")
+    parser.add_argument('bench', choices=sorted(BENCHMARKS))
+    parser.add_argument('--frames', type=int, default=500, help="Nombre d'images mesurées par écran")
+    parser.add_argument('--turns', type=int, default=40, help="Nombre de virages injectés (input)")
+    parser.add_argument('--cycles', type=int, default=10, help="Nombre de cycles start/stop (ble)")
+    parser.add_argument('--reads', type=int, default=20, help="Nombre de lectures DHT (dht)")
+    parser.add_argument('--sensors', type=int, default=100, help="Nombre de capteurs simulés (registry)")
+    parser.add_argument('--runs', type=int, default=5, help="Lancements mesurés par mode (startup)")
+    parser.add_argument('--trace', default=None,
+                        help="Trace DHT enregistrée avec EDGETRACE.py record --dht (dhttrace)")
+    parser.add_argument('--rows', type=int, default=200000, help="Lignes journalisées (sensorlog)")
+    parser.add_argument('--backend', default='fake', choices=['fake', 'fake-binary'],
+                        help="Capteur simulé : nom \"Nom|temp|hum\" ou charge utile binaire (ble)")
+    args = parser.parse_args()
+    BENCHMARKS[args.bench](args)
+
+if __name__ == "__main__":
+    main()
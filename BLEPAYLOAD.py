@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Charge utile binaire des capteurs BLE (manufacturer data ou service data)
+
+Format v1, 8 octets, petit-boutiste :
+  uint8  version      (1)
+  int16  température  (centièmes de °C)
+  uint16 humidité     (centièmes de %)
+  uint8  batterie     (%)
+  uint16 séquence     (incrémentée à chaque nouvelle mesure, reboucle à 65535)
+"""
+
+import struct
+from collections import OrderedDict
+
+PAYLOAD_VERSION = 1
+_PAYLOAD = struct.Struct('<BhHBH')
+_unpack_from = _PAYLOAD.unpack_from
+PAYLOAD_SIZE = _PAYLOAD.size
+
+# Identifiant constructeur réservé aux tests / prototypes (Bluetooth SIG) : partagé par n'importe quel prototype
+COMPANY_ID = 0xFFFF
+MAX_SENSORS = 64 # Capteurs dont la dernière séquence est gardée (au-delà, le plus ancien est oublié)
+
+DUPLICATE = (None, None, None, None) # Mesure déjà reçue (annonce répétée)
+
+# Numéros de séquence "en arrière" encore considérés comme des répétitions (au-delà : redémarrage du capteur)
+_REPLAY_WINDOW = 8
+
+
+def encode(temperature, humidity, battery, seq):
+    """Construit la charge utile (firmware des capteurs, backend simulé)"""
+    return _PAYLOAD.pack(PAYLOAD_VERSION, round(temperature * 100), round(humidity * 100),
+                         battery, seq & 0xFFFF)
+
+
+class PayloadReader:
+    """Lit la charge utile d'une annonce et élimine les répétitions (une mesure retenue une fois par capteur)
+
+    Le company_id de test (0xFFFF) est partagé par tous les prototypes : seules les annonces d'une adresse
+    de addresses (liste blanche), ou à défaut dont le nom contient name_filter, sont lues.
+    Aucun objet intermédiaire : lecture directe dans les octets reçus (unpack_from), numéro de
+    séquence vérifié avant de construire la mesure.
+    """
+
+    def __init__(self, company_id=COMPANY_ID, service_uuid=None, name_filter=None, addresses=None,
+                 max_sensors=MAX_SENSORS):
+        self.company_id = company_id
+        self.service_uuid = service_uuid
+        self.name_filter = name_filter
+        self.addresses = None if addresses is None else {address.upper() for address in addresses}
+        self.max_sensors = max_sensors
+        self.last_seq = OrderedDict() # {adresse: dernière séquence retenue}, de la plus ancienne à la plus récente
+        self.duplicates = 0
+        self.rejected = 0 # Charges utiles d'appareils non attendus
+
+    def accepts(self, adv):
+        """Annonce d'un capteur attendu : adresse de la liste blanche, sinon nom contenant name_filter"""
+        if self.addresses is not None:
+            return adv.address.upper() in self.addresses
+        return self.name_filter is None or (adv.name is not None and self.name_filter in adv.name)
+
+    def read(self, adv):
+        """(température, humidité, batterie, séquence), DUPLICATE si la mesure a déjà été reçue,
+        None si l'annonce n'en contient pas ou vient d'un appareil non attendu"""
+        data = adv.manufacturer_data.get(self.company_id)
+        if data is None:
+            if self.service_uuid is None:
+                return None
+            data = adv.service_data.get(self.service_uuid)
+            if data is None:
+                return None
+        if len(data) < PAYLOAD_SIZE:
+            return None
+        if not self.accepts(adv):
+            self.rejected += 1
+            return None
+        version, temperature, humidity, battery, seq = _unpack_from(data)
+        if version != PAYLOAD_VERSION:
+            return None
+        last = self.last_seq.get(adv.address)
+        if last is None:
+            if len(self.last_seq) >= self.max_sensors:
+                self.last_seq.popitem(last=False) # Capteur muet depuis le plus longtemps
+        elif (last - seq) & 0xFFFF < _REPLAY_WINDOW:
+            # Même mesure (ou mesure plus ancienne arrivée en retard)
+            self.duplicates += 1
+            return DUPLICATE
+        else:
+            self.last_seq.move_to_end(adv.address)
+        self.last_seq[adv.address] = seq
+        return temperature / 100, humidity / 100, battery, seq
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Registre des capteurs BLE indexé par adresse : dernière valeur + court historique par capteur.
+Mémoire bornée (nombre de capteurs et taille d'historique fixes), quel que soit le nombre d'annonces.
+Les mises à jour sont fusionnées : l'affichage n'est réveillé qu'une fois par lecture.
+"""
+
+import threading
+from collections import OrderedDict, deque, namedtuple
+
+MAX_SENSORS = 64    # Au-delà, le capteur muet depuis le plus longtemps est oublié
+HISTORY_SIZE = 32   # Mesures conservées par capteur
+
+# Dernier état connu d'un capteur (instantané immuable, lisible sans verrou)
+SensorState = namedtuple('SensorState', 'address name temperature humidity battery rssi timestamp updates')
+
+
+class SensorRegistry:
+    """Boîte aux lettres "dernière valeur" par capteur"""
+
+    def __init__(self, max_sensors=MAX_SENSORS, history_size=HISTORY_SIZE):
+        self.max_sensors = max_sensors
+        self.history_size = history_size
+        self.states = OrderedDict()  # {adresse: SensorState}, du moins au plus récemment mis à jour
+        self.histories = {}          # {adresse: deque((timestamp, température, humidité))}
+        self.version = 0             # Incrémenté à chaque mise à jour
+        self.evicted = 0
+        self._pending = False        # Mise à jour non encore lue par l'affichage
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.states)
+
+    def update(self, address, name, temperature, humidity, battery=None, rssi=None, timestamp=0.0):
+        """Enregistre une mesure en O(1). Retourne True si l'affichage doit être réveillé
+
+        Tant que l'affichage n'a pas relu le registre (snapshot), les mesures suivantes
+        remplacent simplement les précédentes sans nouveau réveil.
+        """
+        with self._lock:
+            previous = self.states.pop(address, None)
+            updates = 1 if previous is None else previous.updates + 1
+            self.states[address] = SensorState(address, name, temperature, humidity, battery, rssi,
+                                               timestamp, updates)
+            history = self.histories.get(address)
+            if history is None:
+                history = self.histories[address] = deque(maxlen=self.history_size)
+                if len(self.states) > self.max_sensors:
+                    oldest, _ = self.states.popitem(last=False)
+                    del self.histories[oldest]
+                    self.evicted += 1
+            history.append((timestamp, temperature, humidity))
+            self.version += 1
+            wake = not self._pending
+            self._pending = True
+            return wake
+
+    def latest(self, address):
+        """Dernier état d'un capteur (None si inconnu)"""
+        return self.states.get(address)
+
+    def history(self, address):
+        """Copie de l'historique d'un capteur [(timestamp, température, humidité), ...]"""
+        with self._lock:
+            return list(self.histories.get(address, ()))
+
+    def snapshot(self):
+        """(version, états triés par nom) : lecture par l'affichage, réarme le réveil"""
+        with self._lock:
+            self._pending = False
+            states = list(self.states.values())
+            version = self.version
+        states.sort(key=lambda state: (state.name or state.address, state.address))
+        return version, states
+
+    def clear(self):
+        with self._lock:
+            self.states.clear()
+            self.histories.clear()
+            self._pending = False
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Scan BLE permanent : un seul scanner actif, une seule boucle asyncio (thread réutilisé)
+et un callback appelé à chaque annonce reçue.
+Backend simulé (FakeScanner) pour tester latence et cycle de vie sans adaptateur Bluetooth.
+"""
+
+import asyncio
+import importlib.util
+import random
+import threading
+import time
+from collections import namedtuple
+
+from BLEPAYLOAD import COMPANY_ID, encode
+
+# bleak (et dbus) n'est importé qu'au démarrage du premier scan
+BLEAK_AVAILABLE = importlib.util.find_spec('bleak') is not None
+
+# Annonce normalisée (indépendante du backend). timestamp : time.monotonic() à la réception
+Advertisement = namedtuple('Advertisement',
+                           'address name rssi manufacturer_data service_data timestamp')
+
+CALL_TIMEOUT = 10 # Délai max (s) pour démarrer / arrêter un scanner
+
+
+class LoopThread:
+    """Boucle asyncio unique exécutée dans un thread démon, créée au premier usage puis réutilisée"""
+
+    def __init__(self, name="ble-loop"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def _ensure(self):
+        with self._lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(self.loop)
+                    self.loop.call_soon(ready.set)
+                    self.loop.run_forever()
+
+                self.thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self.thread.start()
+                ready.wait()
+            return self.loop
+
+    def submit(self, coro):
+        """Planifie une coroutine sur la boucle (concurrent.futures.Future)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure())
+
+    def call(self, coro, timeout=CALL_TIMEOUT):
+        """Exécute une coroutine sur la boucle et attend son résultat"""
+        return self.submit(coro).result(timeout)
+
+    def close(self):
+        """Arrête la boucle et attend la fin du thread"""
+        with self._lock:
+            if self.thread is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=CALL_TIMEOUT)
+            self.loop.close()
+            self.thread = None
+            self.loop = None
+
+
+class BleakBackend:
+    """Scanner Bleak permanent (detection_callback) au lieu de discover() répétés"""
+
+    available = BLEAK_AVAILABLE
+
+    def __init__(self, on_advertisement):
+        self.on_advertisement = on_advertisement
+        self.scanner = None
+
+    def _detected(self, device, adv):
+        self.on_advertisement(Advertisement(device.address, adv.local_name or device.name, adv.rssi,
+                                            adv.manufacturer_data, adv.service_data, time.monotonic()))
+
+    async def start(self):
+        from bleak import BleakScanner
+        self.scanner = BleakScanner(detection_callback=self._detected)
+        await self.scanner.start()
+
+    async def stop(self):
+        if self.scanner is not None:
+            await self.scanner.stop()
+            self.scanner = None
+
+
+class FakeScanner:
+    """Backend simulé : chaque capteur annonce "Nom|temp|hum|batterie|seq" toutes les interval secondes"""
+
+    available = True
+    binary = False
+    repeats = 1 # Émissions de chaque mesure (un vrai capteur répète la même annonce)
+
+    def __init__(self, on_advertisement, names=("Capteur-1",), interval=0.1, seed=None):
+        self.on_advertisement = on_advertisement
+        self.names = names
+        self.interval = interval
+        self.rng = random.Random(seed)
+        self.task = None
+        self.sent = 0
+        self.starts = 0
+        self.stops = 0
+
+    def advertisement(self, index, name):
+        """Construit l'annonce simulée du capteur index"""
+        temperature = round(self.rng.uniform(-5.0, 30.0), 1)
+        humidity = round(self.rng.uniform(30.0, 90.0), 1)
+        address = f"FA:KE:00:00:00:{index:02X}"
+        if self.binary:
+            return Advertisement(address, name, -60, {COMPANY_ID: encode(temperature, humidity, 100, self.sent)},
+                                 {}, time.monotonic())
+        return Advertisement(address, f"{name}|{temperature}|{humidity}|100|{self.sent}",
+                             -60, {}, {}, time.monotonic())
+
+    async def _run(self):
+        while True:
+            for index, name in enumerate(self.names):
+                adv = self.advertisement(index, name)
+                for _ in range(self.repeats):
+                    self.on_advertisement(adv._replace(timestamp=time.monotonic()))
+            self.sent += 1
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self.starts += 1
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self.stops += 1
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+class FakeBinaryScanner(FakeScanner):
+    """Backend simulé : charge utile binaire (manufacturer data), chaque mesure annoncée 3 fois"""
+
+    binary = True
+    repeats = 3
+
+
+BACKENDS = {
+    'bleak': BleakBackend,
+    'fake': FakeScanner,
+    'fake-binary': FakeBinaryScanner,
+}
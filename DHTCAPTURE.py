@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Capture DHT côté démon pigpio : l'impulsion de démarrage est jouée par un script stocké dans pigpiod
+et les fronts arrivent par le pipe de notification. Le programme ne dépend plus de time.sleep()
+pour la synchronisation et récupère la trame dès que le dernier bit est reçu.
+
+Plusieurs capteurs (DHT11 / DHT22) peuvent être déclenchés ensemble : un seul script tire tous les
+bus à 0 puis les relâche, et leurs fronts entrelacés sont séparés par GPIO dans le même lot.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from EDGESTREAM import NotifyReader
+
+# Script pigpio : p0 = GPIO, p1 = durée de l'impulsion (ms). Bus tiré à 0 puis relâché (entrée + pull-up)
+START_SCRIPT = b"m p0 w w p0 0 mils p1 m p0 r pud p0 u"
+START_PULSE_MS = 18
+FRAME_TIMEOUT = 0.05      # Attente max de la trame après l'impulsion (s)
+PI_SCRIPT_INITING = 0     # pigpio.PI_SCRIPT_INITING
+
+# États hauts attendus : relâchement du bus, préambule du capteur, puis 40 bits de données
+EXPECTED_HIGHS = 42
+BIT_THRESHOLD_US = 40     # Bit '0' : ~26µs à l'état haut, bit '1' : ~70µs
+NOISE_US = 10             # États hauts plus courts ignorés (parasites)
+ADAPTIVE_NOISE_US = 4     # Idem en décodage adaptatif (résolution de pigpio) : les parasites sont écartés par la structure
+PREAMBLE_MIN_US = 75      # État haut du préambule du capteur (~80µs) ; relâchement du bus : ~30µs
+BIT_MAX_US = 120          # État haut plus long : pas un bit (fronts perdus, bus au repos après la trame)
+MIN_GAP_US = 12           # Écart minimal entre les groupes '0' et '1' (sinon seuil fixe)
+
+DHT11 = 'DHT11'
+DHT22 = 'DHT22'
+
+# Causes d'échec de décodage
+NO_RESPONSE = 'no_response'   # Aucun état haut : capteur absent ou impulsion de démarrage manquée
+NO_PREAMBLE = 'no_preamble'   # La capture ne commence pas par la réponse du capteur
+SHORT_FRAME = 'short_frame'   # Moins de 40 bits reçus (fronts perdus)
+CHECKSUM = 'checksum'         # 40 bits reçus mais checksum faux
+
+
+class DHTError(Exception):
+    """Trame DHT inexploitable (cause : NO_RESPONSE, NO_PREAMBLE, SHORT_FRAME ou CHECKSUM)"""
+
+    def __init__(self, message, cause=None):
+        super().__init__(message)
+        self.cause = cause
+
+
+def bit_threshold(widths):
+    """Seuil 0/1 propre à la trame : milieu du plus grand écart entre les largeurs triées
+
+    (partition optimale en 2 groupes au sens du lien simple). Si les largeurs sont toutes
+    proches (trame composée d'un seul type de bit), on garde le seuil nominal.
+    """
+    ordered = sorted(widths)
+    gap, i = max((ordered[k + 1] - ordered[k], k) for k in range(len(ordered) - 1))
+    if gap < MIN_GAP_US:
+        return BIT_THRESHOLD_US
+    return (ordered[i] + ordered[i + 1]) / 2
+
+
+def _frame_bytes(widths, threshold):
+    data = bytearray(5)
+    for i, width in enumerate(widths):
+        data[i >> 3] = (data[i >> 3] << 1) | (width > threshold)
+    return data
+
+
+def _checksum_ok(data):
+    # Octets : humidité (2), température (2), checksum
+    return data[4] == (data[0] + data[1] + data[2] + data[3]) & 0xFF
+
+
+def _frame_start(pulses):
+    """Début des 40 bits, repéré par la réponse du capteur : relâchement du bus puis préambule (~80µs)
+
+    Le premier bit (poids fort de l'humidité, DHT11 comme DHT22) est toujours un '0' : le préambule est
+    l'état haut long suivi d'un état haut court. Le relâchement manque si le callback est installé après
+    lui : la capture commence alors au préambule. None si la capture ne commence pas par cette réponse.
+    """
+    for start in (1, 2):
+        if len(pulses) > start and pulses[start - 1] >= PREAMBLE_MIN_US > pulses[start]:
+            return start
+    return None
+
+
+def decode_frame(highs, kind=DHT11, adaptive=True):
+    """Décode les largeurs des états hauts (µs) d'une trame en (température, humidité)
+
+    adaptive : 40 bits comptés à partir de la réponse du capteur et seuil 0/1 calculé pour chaque trame,
+    sinon seuil fixe sur les 40 derniers états hauts.
+    """
+    noise = ADAPTIVE_NOISE_US if adaptive else NOISE_US
+    valid_pulses = [x for x in highs if x > noise] # Filtre bruit
+    if not valid_pulses:
+        raise DHTError("Aucune réponse du capteur", NO_RESPONSE)
+    # On s'attend à voir la réponse initiale puis 40 bits
+    if len(valid_pulses) < 40:
+        raise DHTError("Pas assez de données reçues", SHORT_FRAME)
+
+    if not adaptive:
+        data = _frame_bytes(valid_pulses[-40:], BIT_THRESHOLD_US)
+        if not _checksum_ok(data):
+            raise DHTError("Checksum invalide", CHECKSUM)
+        return convert(data, kind)
+
+    start = _frame_start(valid_pulses)
+    if start is None:
+        raise DHTError("Préambule du capteur absent", NO_PREAMBLE)
+    widths = valid_pulses[start:start + 40]
+    if len(widths) < 40 or max(widths) > BIT_MAX_US:
+        raise DHTError("Pas assez de données reçues", SHORT_FRAME)
+    data = _frame_bytes(widths, bit_threshold(widths))
+    if not _checksum_ok(data):
+        raise DHTError("Checksum invalide", CHECKSUM)
+    return convert(data, kind)
+
+
+class FrameDecoder:
+    """decode_frame() avec compteurs : trames décodées et échecs par cause
+
+    Les compteurs sont modifiés par le thread d'échantillonnage : les autres threads (export des
+    métriques) les lisent par failure_counts().
+    """
+
+    def __init__(self, kind=DHT11, adaptive=True):
+        self.kind = kind
+        self.adaptive = adaptive
+        self.decoded = 0
+        self.failures = Counter()
+        self._lock = threading.Lock()
+
+    def decode(self, highs):
+        try:
+            result = decode_frame(highs, self.kind, self.adaptive)
+        except DHTError as e:
+            with self._lock:
+                self.failures[e.cause] += 1
+            raise
+        self.decoded += 1
+        return result
+
+    def failure_counts(self):
+        """Copie des échecs par cause, lisible depuis n'importe quel thread"""
+        with self._lock:
+            return dict(self.failures)
+
+    def attempts_per_reading(self):
+        """Captures nécessaires par mesure valide (1.0 = aucune nouvelle tentative)"""
+        attempts = self.decoded + sum(self.failures.values())
+        return attempts / self.decoded if self.decoded else float('inf')
+
+    def report(self):
+        causes = ", ".join(f"{cause}={count}" for cause, count in sorted(self.failures.items())) or "aucun"
+        return (f"{'adaptatif' if self.adaptive else 'seuil fixe'}: {self.decoded} trames valides, "
+                f"échecs: {causes}, {self.attempts_per_reading():.2f} captures/mesure")
+
+
+def convert(data, kind=DHT11):
+    """Valeurs physiques d'une trame valide"""
+    if kind == DHT22:
+        # Valeurs 16 bits en dixièmes, bit de poids fort de la température = signe
+        humidity = ((data[0] << 8) | data[1]) / 10.0
+        temperature = (((data[2] & 0x7F) << 8) | data[3]) / 10.0
+        if data[2] & 0x80:
+            temperature = -temperature
+        return temperature, humidity
+    # DHT11 : partie entière puis décimale
+    return float(data[2]) + data[3] / 10.0, float(data[0]) + data[1] / 10.0
+
+
+def build_start_script(pins, pulse_ms=START_PULSE_MS):
+    """Script pigpio qui tire tous les bus à 0 ensemble, attend pulse_ms puis les relâche ensemble"""
+    commands = [f"m {pin} w" for pin in pins] + [f"w {pin} 0" for pin in pins]
+    commands.append(f"mils {pulse_ms}")
+    commands += [f"m {pin} r" for pin in pins] + [f"pud {pin} u" for pin in pins]
+    return " ".join(commands).encode()
+
+
+class PulseCollector:
+    """Largeurs des états hauts d'un GPIO (µs). done est levé dès que la trame est complète"""
+
+    def __init__(self, expected=EXPECTED_HIGHS):
+        self.expected = expected
+        self.highs = []
+        self.rise = None
+        self.done = threading.Event()
+
+    def reset(self):
+        self.highs = []
+        self.rise = None
+        self.done.clear()
+
+    def edge(self, gpio, level, tick):
+        if level == 1: # Front montant (fin de l'état bas)
+            self.rise = tick
+        elif self.rise is not None: # Front descendant (fin de l'état haut)
+            self.highs.append((tick - self.rise) & 0xFFFFFFFF)
+            self.rise = None
+            if len(self.highs) >= self.expected:
+                self.done.set()
+
+
+def _store_script(pi, script):
+    """Stocke un script dans pigpiod et attend qu'il soit prêt"""
+    handle = pi.store_script(script)
+    if handle < 0:
+        raise IOError(f"store_script a échoué ({handle})")
+    deadline = time.monotonic() + 1
+    while pi.script_status(handle)[0] == PI_SCRIPT_INITING:
+        if time.monotonic() > deadline:
+            raise IOError("Script pigpio non initialisé")
+        time.sleep(0.001)
+    return handle
+
+
+class DaemonCapture:
+    """Impulsion de démarrage et capture des fronts exécutées par pigpiod"""
+
+    def __init__(self, pi, pins):
+        self.pi = pi
+        self.pins = list(pins)
+        self.script = _store_script(pi, START_SCRIPT)
+        # Déclenchement simultané de tous les capteurs (script dédié à cet ensemble de GPIO)
+        self.group_script = _store_script(pi, build_start_script(self.pins)) if len(self.pins) > 1 else None
+
+        self.collectors = {pin: PulseCollector() for pin in pins}
+        self.reader = NotifyReader.open_pigpio(pi, {pin: c.edge for pin, c in self.collectors.items()})
+        self.reader.pause() # Notifications actives uniquement pendant une capture
+        self.reader.start()
+
+    def capture(self, pin, timeout=FRAME_TIMEOUT):
+        """Déclenche une mesure et retourne les largeurs des états hauts reçus (trame complète ou non)"""
+        collector = self.collectors[pin]
+        collector.reset()
+        self.reader.resume()
+        try:
+            self.pi.run_script(self.script, [pin, START_PULSE_MS])
+            collector.done.wait(START_PULSE_MS / 1000 + timeout)
+        finally:
+            self.reader.pause()
+        return list(collector.highs)
+
+    def capture_all(self, timeout=FRAME_TIMEOUT):
+        """Déclenche tous les capteurs ensemble. Retourne {gpio: largeurs des états hauts}"""
+        if self.group_script is None:
+            return {pin: self.capture(pin, timeout) for pin in self.pins}
+        for collector in self.collectors.values():
+            collector.reset()
+        self.reader.resume()
+        try:
+            self.pi.run_script(self.group_script)
+            deadline = time.monotonic() + START_PULSE_MS / 1000 + timeout
+            for collector in self.collectors.values():
+                collector.done.wait(max(0.0, deadline - time.monotonic()))
+        finally:
+            self.reader.pause()
+        return {pin: list(collector.highs) for pin, collector in self.collectors.items()}
+
+    def close(self):
+        self.reader.close()
+        self.pi.delete_script(self.script)
+        if self.group_script is not None:
+            self.pi.delete_script(self.group_script)
+
+
+class MultiDHTReader:
+    """Plusieurs capteurs DHT11 / DHT22 lus dans la même fenêtre : sensors = {gpio: DHT11 | DHT22}
+
+    Lire 8 capteurs prend le même temps qu'en lire un (~25ms).
+    """
+
+    def __init__(self, pi, sensors, adaptive=True):
+        self.sensors = dict(sensors)
+        self.decoders = {pin: FrameDecoder(kind, adaptive) for pin, kind in self.sensors.items()}
+        self.capture = DaemonCapture(pi, self.sensors)
+
+    def read_all(self):
+        """{gpio: (température, humidité)} ou {gpio: DHTError} pour les trames inexploitables"""
+        results = {}
+        for pin, highs in self.capture.capture_all().items():
+            try:
+                results[pin] = self.decoders[pin].decode(highs)
+            except DHTError as e:
+                results[pin] = e
+        return results
+
+    def close(self):
+        self.capture.close()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Ingestion des fronts GPIO par lots via les pipes de notification pigpio
+(notify_open / notify_begin) au lieu d'un callback Python par front.
+Fonctionne aussi sur un fichier ou une FIFO (tests sans Raspberry Pi).
+"""
+
+import os
+import sys
+import threading
+from array import array
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Format gpioReport : uint16 seqno, uint16 flags, uint32 tick, uint32 level (12 octets)
+REPORT_SIZE = 12
+NTFY_FLAGS_WDOG = 1 << 5   # Rapport de watchdog (pas un front) : GPIO concerné dans les bits 0-4
+NTFY_FLAGS_GPIO = 0x1F
+TIMEOUT = 2                # Level transmis aux handlers pour un watchdog (comme pigpio.TIMEOUT)
+NTFY_FLAGS_ALIVE = 1 << 6  # Rapport de maintien en vie
+NTFY_FLAGS_EVENT = 1 << 7  # Rapport d'événement
+_SKIP_FLAGS = NTFY_FLAGS_WDOG | NTFY_FLAGS_EVENT
+
+BATCH_REPORTS = 4096       # Nombre de rapports lus à chaque appel système
+NUMPY_MIN_REPORTS = 256    # En dessous, la boucle Python est plus rapide que NumPy
+
+
+class NotifyReader:
+    """Lit des gpioReport par lots et appelle handler(gpio, level, tick) pour chaque front
+    (et handler(gpio, TIMEOUT, tick) pour chaque watchdog, comme un callback pigpio)"""
+
+    def __init__(self, source, handlers, initial_levels=None, use_numpy=NUMPY_AVAILABLE):
+        # source : chemin (fichier, FIFO, /dev/pigpioN) ou descripteur déjà ouvert
+        if isinstance(source, int):
+            self.fd = source
+            self._owns_fd = False
+        else:
+            self.fd = os.open(source, os.O_RDONLY)
+            self._owns_fd = True
+        self.handlers = dict(handlers)  # {gpio: callback(gpio, level, tick)}
+        self.mask = 0
+        for gpio in self.handlers:
+            self.mask |= 1 << gpio
+        self.last_levels = initial_levels  # None : le premier rapport sert de référence
+        self.use_numpy = use_numpy and NUMPY_AVAILABLE
+        self._pending = b''  # Fin de rapport incomplète du lot précédent
+        self.reports = 0
+        self.edges = 0
+        self.running = False
+        self.thread = None
+        # Contexte pigpio (uniquement avec open_pigpio)
+        self.pi = None
+        self.handle = None
+
+    @classmethod
+    def open_pigpio(cls, pi, handlers, **kwargs):
+        """Ouvre un handle de notification pigpio et surveille les GPIO des handlers"""
+        handle = pi.notify_open()
+        if handle < 0:
+            raise IOError(f"notify_open a échoué ({handle})")
+        # Démon simulé (FAKEPIGPIO) : le pipe n'est pas dans /dev
+        path = pi.notify_path(handle) if hasattr(pi, 'notify_path') else f"/dev/pigpio{handle}"
+        reader = cls(path, handlers,
+                     initial_levels=pi.read_bank_1(), **kwargs)
+        reader.pi = pi
+        reader.handle = handle
+        pi.notify_begin(handle, reader.mask)
+        return reader
+
+    def read_batch(self, size=BATCH_REPORTS * REPORT_SIZE):
+        """Lit un lot (bloquant selon le descripteur) et le décode. Retourne le nombre d'octets lus"""
+        try:
+            data = os.read(self.fd, size)
+        except BlockingIOError:
+            return None  # Descripteur non bloquant et rien à lire
+        if data:
+            self.feed_bytes(data)
+        return len(data)
+
+    def drain(self):
+        """Lit tout ce qui est disponible sans bloquer (ex: fin de capture DHT)"""
+        os.set_blocking(self.fd, False)
+        try:
+            while self.read_batch():
+                pass
+        finally:
+            os.set_blocking(self.fd, True)
+
+    def feed_bytes(self, data):
+        """Décode des rapports bruts (lot complet ou morceau)"""
+        if self._pending:
+            data = self._pending + data
+        usable = len(data) - len(data) % REPORT_SIZE
+        self._pending = data[usable:]
+        if not usable:
+            return
+
+        words = array('I')
+        words.frombytes(data[:usable])
+        if sys.byteorder != 'little':
+            words.byteswap()
+
+        count = usable // REPORT_SIZE
+        self.reports += count
+        if self.use_numpy and count >= NUMPY_MIN_REPORTS:
+            self._decode_numpy(words)
+        else:
+            self._decode_loop(words)
+
+    def _decode_loop(self, words):
+        """Boucle serrée : un XOR par rapport, un appel par front utile"""
+        handlers = self.handlers
+        mask = self.mask
+        last = self.last_levels
+        edges = 0
+        for i in range(0, len(words), 3):
+            flags = words[i] >> 16
+            if flags & _SKIP_FLAGS:
+                if flags & NTFY_FLAGS_WDOG:
+                    gpio = flags & NTFY_FLAGS_GPIO
+                    cb = handlers.get(gpio)
+                    if cb is not None:
+                        cb(gpio, TIMEOUT, words[i + 1])
+                continue
+            level = words[i + 2]
+            if last is None:
+                last = level
+                continue
+            changed = (level ^ last) & mask
+            if changed:
+                tick = words[i + 1]
+                for gpio, cb in handlers.items():
+                    if changed & (1 << gpio):
+                        cb(gpio, (level >> gpio) & 1, tick)
+                        edges += 1
+            last = level
+        self.last_levels = last
+        self.edges += edges
+
+    def _decode_numpy(self, words):
+        """Décodage vectorisé de tout le lot (fronts par GPIO, dans l'ordre des ticks)"""
+        reports = np.frombuffer(words, dtype=np.uint32).reshape(-1, 3)
+        flags = reports[:, 0] >> 16
+        if (flags & NTFY_FLAGS_WDOG).any():
+            self._decode_loop(words) # Watchdogs à livrer dans l'ordre des fronts (rares : lot en Python)
+            return
+        keep = (flags & _SKIP_FLAGS) == 0
+        ticks = reports[keep, 1]
+        levels = reports[keep, 2]
+        if not len(levels):
+            return
+        if self.last_levels is None:
+            self.last_levels = int(levels[0])
+        previous = np.empty_like(levels)
+        previous[0] = self.last_levels
+        previous[1:] = levels[:-1]
+        changed = (levels ^ previous) & self.mask
+        self.last_levels = int(levels[-1])
+
+        edges = 0
+        for gpio, cb in self.handlers.items():
+            idx = np.flatnonzero(changed & (1 << gpio))
+            if not len(idx):
+                continue
+            for level, tick in zip(((levels[idx] >> gpio) & 1).tolist(), ticks[idx].tolist()):
+                cb(gpio, level, tick)
+            edges += len(idx)
+        self.edges += edges
+
+    def _loop(self):
+        while self.running:
+            if not self.read_batch():
+                break # Fin de fichier / FIFO fermée
+
+    def start(self):
+        """Lance la lecture dans un thread dédié"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def pause(self):
+        """Suspend les notifications pigpio (le handle reste ouvert)"""
+        if self.pi is not None:
+            self.pi.notify_pause(self.handle)
+
+    def resume(self):
+        """Reprend les notifications pigpio"""
+        if self.pi is not None:
+            self.pi.notify_begin(self.handle, self.mask)
+
+    def close(self):
+        """Arrête la lecture et libère le handle pigpio"""
+        self.running = False
+        if self.pi is not None:
+            self.pi.notify_close(self.handle) # Ferme le pipe côté démon : débloque read()
+            self.pi = None
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+        if self._owns_fd:
+            os.close(self.fd)
+            self._owns_fd = False
+
+
+def pack_reports(records):
+    """Construit des gpioReport à partir de (gpio, level, tick) (tests sans pigpio, level TIMEOUT : watchdog)"""
+    out = array('I')
+    levels = 0
+    for seq, (gpio, level, tick) in enumerate(records):
+        if level == TIMEOUT:
+            out.extend(((seq & 0xFFFF) | ((NTFY_FLAGS_WDOG | gpio) << 16), tick & 0xFFFFFFFF, levels))
+            continue
+        if level:
+            levels |= 1 << gpio
+        else:
+            levels &= ~(1 << gpio)
+        out.extend((seq & 0xFFFF, tick & 0xFFFFFFFF, levels))
+    if sys.byteorder != 'little':
+        out.byteswap()
+    return out.tobytes()
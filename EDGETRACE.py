@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Enregistrement et rejeu de traces de fronts GPIO (gpio, level, tick)
+Format binaire compact : tableaux de taille fixe, ticks en delta, lisible par mmap
+
+Usage :
+  python3 EDGETRACE.py record trace.irt --gpio 18          (nécessite pigpiod)
+  python3 EDGETRACE.py record trace.irt --gpio 27 --dht    (impulsion DHT toutes les 2s)
+  python3 EDGETRACE.py replay trace.irt --target nec --speed 100
+  python3 EDGETRACE.py replay trace.irt --target ir         (tous les protocoles + coût par protocole)
+  python3 EDGETRACE.py replay trace.irt --target dht        (au plus vite, sans pigpiod)
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+# --- FORMAT ---
+# Entête (16 octets) : magic, version, réservé, nombre d'enregistrements, tick initial
+# Puis <count> octets "code" (bits 0-4 : gpio, bit 7 : level) et <count> uint16 de delta (µs)
+# Code GAP : enregistrement sans front qui ajoute seulement son delta (écarts > 65535µs)
+MAGIC = b'EDGT'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHII')
+CODE_GAP = 0x7F
+_LEVEL_BIT = 0x80
+_GPIO_MASK = 0x1F
+_MAX_DELTA = 0xFFFF
+
+
+class TraceRecorder:
+    """Enregistre des fronts en mémoire (signature compatible pi.callback) puis les sauvegarde"""
+
+    def __init__(self):
+        self.codes = array('B')
+        self.deltas = array('H')
+        self.start_tick = None
+        self.last_tick = 0
+        self.edges = 0
+
+    def __call__(self, gpio, level, tick):
+        if level > 1:
+            return # Watchdog pigpio (TIMEOUT) : pas un front
+        if self.start_tick is None:
+            self.start_tick = tick
+            self.last_tick = tick
+        delta = (tick - self.last_tick) & 0xFFFFFFFF
+        self.last_tick = tick
+        # Les écarts trop longs sont découpés en enregistrements GAP
+        while delta > _MAX_DELTA:
+            self.codes.append(CODE_GAP)
+            self.deltas.append(_MAX_DELTA)
+            delta -= _MAX_DELTA
+        self.codes.append((gpio & _GPIO_MASK) | (_LEVEL_BIT if level == 1 else 0))
+        self.deltas.append(delta)
+        self.edges += 1
+
+    record = __call__
+
+    def save(self, path):
+        """Écrit la trace sur disque"""
+        deltas = self.deltas
+        if sys.byteorder != 'little':
+            deltas = array('H', deltas)
+            deltas.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(self.codes), self.start_tick or 0))
+            f.write(self.codes.tobytes())
+            if len(self.codes) % 2:
+                f.write(b'\0') # Alignement des uint16
+            f.write(deltas.tobytes())
+
+
+class Trace:
+    """Trace ouverte en mémoire partagée (mmap) : aucune copie des données"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, start_tick = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Trace invalide: {path}")
+        self.count = count
+        self.start_tick = start_tick
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+        self.codes = view[offset:offset + count]
+        offset += count + (count % 2)
+        if sys.byteorder == 'little':
+            self.deltas = view[offset:offset + 2 * count].cast('H')
+        else:
+            self.deltas = array('H', view[offset:offset + 2 * count].tobytes())
+            self.deltas.byteswap()
+
+    def __len__(self):
+        return self.count
+
+    def edges(self):
+        """Itère sur les fronts (gpio, level, tick)"""
+        tick = self.start_tick
+        for code, delta in zip(self.codes, self.deltas):
+            tick = (tick + delta) & 0xFFFFFFFF
+            if code != CODE_GAP:
+                yield code & _GPIO_MASK, 1 if code & _LEVEL_BIT else 0, tick
+
+    def duration_us(self):
+        """Durée réelle couverte par la trace"""
+        return sum(self.deltas)
+
+    def close(self):
+        # Les vues doivent être libérées avant le mmap
+        if isinstance(self.deltas, memoryview):
+            self.deltas.release()
+        self.codes.release()
+        self._mmap.close()
+
+
+class ReplayWatchdog:
+    """Watchdog pigpio simulé pour replay() : comme pigpiod, un rapport TIMEOUT (level 2) toutes les
+    timeout ms sans front, répété tant que le watchdog est armé (set_watchdog(gpio, 0) : désarmé)"""
+
+    def __init__(self, timeout=0):
+        self.timeout_us = timeout * 1000
+        self.reports = 0 # Rapports émis
+
+    def set_watchdog(self, gpio, timeout):
+        self.timeout_us = timeout * 1000
+
+    def expire(self, handler, gpio, since, silence):
+        """Rapports pendant silence µs sans front depuis le tick since"""
+        elapsed = 0
+        while self.timeout_us and elapsed + self.timeout_us < silence:
+            elapsed += self.timeout_us
+            self.reports += 1
+            handler(gpio, 2, (since + elapsed) & 0xFFFFFFFF)
+
+
+def replay(trace, handler, speed=None, on_gap=None, gap_us=10000, gpio=None, watchdog=None, tail_us=1000000):
+    """Rejoue une trace dans handler(gpio, level, tick)
+
+    speed : None = au plus vite, sinon facteur de vitesse (1 = temps réel, 100 = 100x)
+    gpio : ne rejouer que les fronts de ce GPIO (None = tous)
+    on_gap : appelé avant un front précédé d'un silence > gap_us (découpage des captures DHT)
+    watchdog : ReplayWatchdog, rapports handler(gpio, 2, tick) pendant les silences (et tail_us après le dernier front)
+    Retourne (fronts rejoués, durée en secondes)
+    """
+    codes = trace.codes
+    deltas = trace.deltas
+    tick = trace.start_tick
+    pending = 0  # Silence cumulé (GAP compris) avant le prochain front
+    edges = 0
+    start = time.perf_counter()
+    elapsed_us = 0
+    last = None # (gpio, tick) du dernier front rejoué
+    for i in range(trace.count):
+        delta = deltas[i]
+        tick = (tick + delta) & 0xFFFFFFFF
+        pending += delta
+        code = codes[i]
+        if code == CODE_GAP or (gpio is not None and code & _GPIO_MASK != gpio):
+            continue
+        if watchdog is not None and last is not None:
+            watchdog.expire(handler, last[0], last[1], pending)
+        if speed is not None:
+            elapsed_us += pending
+            late = elapsed_us / (speed * 1e6) - (time.perf_counter() - start)
+            if late > 0.001:
+                time.sleep(late)
+        if on_gap is not None and pending > gap_us:
+            on_gap()
+        pending = 0
+        last = (code & _GPIO_MASK, tick)
+        handler(last[0], 1 if code & _LEVEL_BIT else 0, tick)
+        edges += 1
+    if watchdog is not None and last is not None:
+        watchdog.expire(handler, last[0], last[1], tail_us) # Silence après le dernier front
+    return edges, time.perf_counter() - start
+
+
+# ===== CIBLES DE REJEU =====
+
+def _replay_nec(trace, speed, gpio):
+    """Rejeu dans le moteur NEC partagé (IRController._cb / IRDecoder._cb)"""
+    from IRDECODER import NECDecoder
+    frames = []
+    decoder = NECDecoder(lambda code, tick: frames.append(code),
+                         lambda code, tick: frames.append(None))
+    edges, seconds = replay(trace, decoder.feed, speed, gpio=gpio)
+    for code in frames:
+        if code is not None:
+            print(f"NEC : 0x{code:08X}")
+    print(f"Trames: {decoder.frames} | Répétitions: {decoder.repeats} | Abandons: {decoder.aborts}")
+    return edges, seconds, decoder.frames + decoder.repeats
+
+
+def _replay_ir(trace, speed, gpio):
+    """Rejeu dans l'ensemble multi-protocole (IRController._cb) avec coût CPU par protocole"""
+    from IRDECODER import IRDecoderSet, format_key, EDGE_BUDGET_NS
+    # Watchdog armé pendant les trames comme IRController : fin des trames Sony 12 / 15 bits
+    watchdog = ReplayWatchdog()
+    decoder = IRDecoderSet(lambda event: None if event.repeat else
+                           print(f"{event.protocol} : {format_key(event.key)}"), profile=True,
+                           watchdog=lambda ms: watchdog.set_watchdog(gpio, ms))
+    edges, seconds = replay(trace, decoder.feed, speed, gpio=gpio, watchdog=watchdog)
+    frames = 0
+    for name, st in decoder.stats().items():
+        frames += st['frames'] + st['repeats']
+        print(f"{name:8} trames={st['frames']} répétitions={st['repeats']} abandons={st['aborts']}"
+              f" appels={st['calls']} coût={st['ns_per_edge']:.0f} ns/front")
+    print(f"Fronts hors budget ({EDGE_BUDGET_NS} ns) : {decoder.over_budget}")
+    print(f"Rapports du watchdog : {watchdog.reports}")
+    return edges, seconds, frames
+
+
+def _replay_dht(trace, speed, gpio, on_decode=None):
+    """Rejeu dans DHT11Reader._cb_dht : une lecture par capture (séparées par l'impulsion de démarrage)
+
+    Chaque capture est décodée avec le seuil fixe et avec le décodage adaptatif (échecs par cause).
+    on_decode(résultat) : appelé pour chaque capture avec (température, humidité) ou la DHTError du décodage adaptatif.
+    """
+    from IRCMRPi import DHT11Reader, DHT_PIN, DHT_SENSOR
+    from DHTCAPTURE import FrameDecoder, DHTError
+    reader = DHT11Reader(DHT_PIN, DHT_SENSOR)
+    fixed = FrameDecoder(reader.sensor_type, adaptive=False)
+    adaptive = FrameDecoder(reader.sensor_type, adaptive=True)
+
+    def decode():
+        if not reader.high_ticks:
+            return
+        try:
+            fixed.decode(reader.high_ticks)
+        except DHTError:
+            pass
+        try:
+            temperature, humidity = result = adaptive.decode(reader.high_ticks)
+            print(f"DHT : {temperature:.1f}°C, {humidity:.1f}%")
+        except DHTError as e:
+            result = e
+            print(f"DHT : {e}")
+        if on_decode is not None:
+            on_decode(result)
+        reader.high_ticks = []
+        reader.last_tick = 0
+
+    edges, seconds = replay(trace, reader._cb_dht, speed, on_gap=decode, gpio=gpio)
+    decode()
+    print(fixed.report())
+    print(adaptive.report())
+    return edges, seconds, adaptive.decoded
+
+
+REPLAY_TARGETS = {
+    'nec': _replay_nec,
+    'ir': _replay_ir,
+    'dht': _replay_dht,
+}
+
+
+def _record(args):
+    import pigpio
+    pi = pigpio.pi()
+    if not pi.connected:
+        print("Impossible de se connecter au démon pigpio.")
+        sys.exit(1)
+
+    recorder = TraceRecorder()
+    callbacks = []
+    for gpio in args.gpio:
+        pi.set_mode(gpio, pigpio.INPUT)
+        if not args.dht:
+            pi.set_glitch_filter(gpio, 100)
+        callbacks.append(pi.callback(gpio, pigpio.EITHER_EDGE, recorder))
+    print(f"Enregistrement des GPIO {args.gpio} dans {args.path} (Ctrl+C pour arrêter)")
+
+    try:
+        while True:
+            if args.dht:
+                # Impulsion de démarrage DHT sur chaque GPIO puis relâchement du bus
+                for gpio in args.gpio:
+                    pi.set_mode(gpio, pigpio.OUTPUT)
+                    pi.write(gpio, 0)
+                time.sleep(0.018)
+                for gpio in args.gpio:
+                    pi.set_mode(gpio, pigpio.INPUT)
+                    pi.set_pull_up_down(gpio, pigpio.PUD_UP)
+            time.sleep(2 if args.dht else 1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for cb in callbacks:
+            cb.cancel()
+        pi.stop()
+        recorder.save(args.path)
+        print(f"\n{recorder.edges} fronts enregistrés.")
+
+
+def _replay(args):
+    trace = Trace(args.path)
+    try:
+        print(f"Trace: {len(trace)} enregistrements, {trace.duration_us() / 1e6:.2f}s réelles")
+        edges, seconds, frames = REPLAY_TARGETS[args.target](trace, args.speed, args.gpio)
+        seconds = max(seconds, 1e-9)
+        print(f"Rejeu: {edges} fronts en {seconds:.3f}s "
+              f"({edges / seconds:,.0f} fronts/s, {frames / seconds:,.0f} trames/s)")
+    finally:
+        trace.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enregistrement / rejeu de traces de fronts GPIO")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="Enregistrer une trace (nécessite pigpiod)")
+    rec.add_argument('path')
+    rec.add_argument('--gpio', type=int, nargs='+', default=[18])
+    rec.add_argument('--dht', action='store_true', help="Envoyer une impulsion de démarrage DHT toutes les 2s")
+
+    rep = sub.add_parser('replay', help="Rejouer une trace (sans pigpiod)")
+    rep.add_argument('path')
+    rep.add_argument('--target', choices=sorted(REPLAY_TARGETS), default='nec')
+    rep.add_argument('--gpio', type=int, default=None, help="Ne rejouer que ce GPIO")
+    rep.add_argument('--speed', type=float, default=None,
+                     help="Facteur de vitesse (1 = temps réel). Par défaut : au plus vite")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        _record(args)
+    else:
+        _replay(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Démon pigpio simulé (tests et benchmarks sans Raspberry Pi)
+
+Reproduit le sous-ensemble de l'API pigpio.pi utilisé par le programme : modes et écritures GPIO,
+callbacks, pipes de notification (FIFO lisible par EDGESTREAM.NotifyReader) et scripts stockés.
+Des capteurs DHT simulés répondent à l'impulsion de démarrage (bus tiré à 0 puis relâché).
+"""
+
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+
+# Valeurs de l'API pigpio
+INPUT = 0
+OUTPUT = 1
+PUD_OFF = 0
+PUD_DOWN = 1
+PUD_UP = 2
+RISING_EDGE = 0
+FALLING_EDGE = 1
+EITHER_EDGE = 2
+PI_SCRIPT_INITING = 0
+PI_SCRIPT_HALTED = 1
+PI_SCRIPT_RUNNING = 2
+
+MIN_START_PULSE = 0.001 # Impulsion de démarrage minimale reconnue par le capteur (s)
+
+_REPORT = struct.Struct('<HHII') # gpioReport : seqno, flags, tick, niveaux
+
+
+class DHTSensorModel:
+    """Capteur DHT11 / DHT22 simulé : trame de 40 bits émise après l'impulsion de démarrage"""
+
+    def __init__(self, temperature=21.0, humidity=45.0, jitter_us=0, seed=None, kind='DHT11',
+                 bit_us=(26, 70), glitch_rate=0.0):
+        self.kind = kind
+        self.bit_us = bit_us           # États hauts des bits 0 / 1 (câble long, clone : autres valeurs)
+        self.glitch_rate = glitch_rate # Probabilité d'un parasite sur le bus au repos après la trame
+        self.temperature = temperature
+        self.humidity = humidity
+        self.jitter_us = jitter_us
+        self.rng = random.Random(seed)
+
+    def frame(self):
+        """Les 5 octets de la trame : humidité, température, checksum"""
+        if self.kind == 'DHT22':
+            # Dixièmes sur 16 bits, bit de poids fort = signe de la température
+            humidity = round(self.humidity * 10)
+            temperature = round(abs(self.temperature) * 10) | (0x8000 if self.temperature < 0 else 0)
+            data = [humidity >> 8, humidity & 0xFF, temperature >> 8, temperature & 0xFF]
+            return data + [sum(data) & 0xFF]
+        # DHT11 : partie entière, décimale
+        hum_int, hum_dec = int(self.humidity), int(round(self.humidity * 10)) % 10
+        temp_int, temp_dec = int(self.temperature), int(round(self.temperature * 10)) % 10
+        data = [hum_int, hum_dec, temp_int, temp_dec]
+        return data + [sum(data) & 0xFF]
+
+    def _us(self, nominal):
+        if not self.jitter_us:
+            return nominal
+        return max(1, nominal + self.rng.randint(-self.jitter_us, self.jitter_us))
+
+    def response(self):
+        """Réponse au relâchement du bus : [(délai µs depuis le front précédent, niveau)]"""
+        edges = [(self._us(30), 0), (self._us(80), 1), (self._us(80), 0)] # Préambule du capteur
+        for byte in self.frame():
+            for i in range(7, -1, -1):
+                edges.append((self._us(50), 1))
+                edges.append((self._us(self.bit_us[byte >> i & 1]), 0))
+        edges.append((self._us(50), 1)) # Fin de trame : bus relâché
+        if self.rng.random() < self.glitch_rate:
+            edges += [(self.rng.randint(100, 2000), 0), (self.rng.randint(2, 20), 1)]
+        return edges
+
+
+class _Callback:
+    def __init__(self, pi, gpio, edge, func):
+        self.pi = pi
+        self.gpio = gpio
+        self.edge = edge
+        self.func = func
+
+    def cancel(self):
+        with self.pi._lock:
+            if self in self.pi._callbacks:
+                self.pi._callbacks.remove(self)
+
+
+class FakePi:
+    """Remplaçant de pigpio.pi() : sensors = {gpio: DHTSensorModel}"""
+
+    def __init__(self, sensors=None):
+        self.connected = True
+        self.sensors = dict(sensors or {})
+        self.modes = {}
+        self.levels = 0xFFFFFFFF # Bus au repos (résistances de tirage)
+        self._low_since = {}     # {gpio: instant où le GPIO a été tiré à 0}
+        self._callbacks = []
+        self._notify = {}        # {handle: [chemin, fd d'écriture, masque, actif]}
+        self._scripts = {}
+        self._next_handle = 0
+        self._dir = None
+        self._lock = threading.RLock()
+        self.start_pulses = 0
+        self.watchdogs = {}      # {gpio: délai en ms} (set_watchdog)
+
+    # --- Horloge ---
+    def get_current_tick(self):
+        return int(time.perf_counter() * 1e6) & 0xFFFFFFFF
+
+    # --- GPIO ---
+    def set_mode(self, gpio, mode):
+        self.modes[gpio] = mode
+        low_since = self._low_since.pop(gpio, None)
+        if mode == INPUT and low_since is not None:
+            self._emit([(gpio, 1, self.get_current_tick())]) # Bus relâché
+            if gpio in self.sensors and time.perf_counter() - low_since >= MIN_START_PULSE:
+                self._respond([gpio])
+        return 0
+
+    def get_mode(self, gpio):
+        return self.modes.get(gpio, INPUT)
+
+    def write(self, gpio, level):
+        if self.modes.get(gpio) == OUTPUT and not level and gpio not in self._low_since:
+            self._low_since[gpio] = time.perf_counter()
+            self._emit([(gpio, 0, self.get_current_tick())])
+        return 0
+
+    def read(self, gpio):
+        return (self.levels >> gpio) & 1
+
+    def read_bank_1(self):
+        return self.levels
+
+    def set_pull_up_down(self, gpio, pud):
+        return 0
+
+    def set_glitch_filter(self, gpio, steady):
+        return 0
+
+    def set_watchdog(self, gpio, timeout):
+        self.watchdogs[gpio] = timeout # Enregistré seulement (aucun TIMEOUT émis)
+        return 0
+
+    def callback(self, gpio, edge=RISING_EDGE, func=None):
+        cb = _Callback(self, gpio, edge, func)
+        with self._lock:
+            self._callbacks.append(cb)
+        return cb
+
+    # --- Capteurs simulés ---
+    def _respond(self, gpios):
+        """Les capteurs répondent ensemble (fronts entrelacés dans l'ordre des ticks), en temps réel"""
+        start = self.get_current_tick()
+        edges = []
+        for gpio in gpios:
+            tick = start
+            for delay, level in self.sensors[gpio].response():
+                tick += delay
+                edges.append((tick, gpio, level))
+        edges.sort()
+        self.start_pulses += 1
+
+        def deliver():
+            # La trame dure ~4ms : livrée d'un bloc à sa fin (comme un lot de notifications)
+            time.sleep(((edges[-1][0] - start) & 0xFFFFFFFF) / 1e6)
+            self._emit([(gpio, level, tick & 0xFFFFFFFF) for tick, gpio, level in edges])
+
+        threading.Thread(target=deliver, daemon=True).start()
+
+    def _emit(self, edges):
+        """Diffuse des fronts aux callbacks et aux pipes de notification actifs"""
+        with self._lock:
+            reports = {handle: bytearray() for handle, (_, _, _, active) in self._notify.items() if active}
+            callbacks = list(self._callbacks)
+            for gpio, level, tick in edges:
+                if level:
+                    self.levels |= 1 << gpio
+                else:
+                    self.levels &= ~(1 << gpio) & 0xFFFFFFFF
+                for handle, out in reports.items():
+                    if self._notify[handle][2] & (1 << gpio):
+                        out += _REPORT.pack(0, 0, tick, self.levels)
+            for handle, out in reports.items():
+                if out:
+                    os.write(self._notify[handle][1], bytes(out))
+        for gpio, level, tick in edges:
+            for cb in callbacks:
+                if cb.gpio == gpio and (cb.edge == EITHER_EDGE or cb.edge == (RISING_EDGE if level else FALLING_EDGE)):
+                    cb.func(gpio, level, tick)
+
+    # --- Notifications ---
+    def notify_open(self):
+        with self._lock:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix="fakepigpio")
+            handle = self._next_handle
+            self._next_handle += 1
+            path = os.path.join(self._dir, f"pigpio{handle}")
+            os.mkfifo(path)
+            # Ouvert en lecture/écriture : l'ouverture côté lecteur ne bloque pas
+            self._notify[handle] = [path, os.open(path, os.O_RDWR), 0, False]
+            return handle
+
+    def notify_path(self, handle):
+        """Chemin du pipe de notification (/dev/pigpio<handle> sur un vrai démon)"""
+        return self._notify[handle][0]
+
+    def notify_begin(self, handle, bits):
+        with self._lock:
+            self._notify[handle][2] = bits
+            self._notify[handle][3] = True
+        return 0
+
+    def notify_pause(self, handle):
+        with self._lock:
+            self._notify[handle][3] = False
+        return 0
+
+    def notify_close(self, handle):
+        with self._lock:
+            path, fd, _, _ = self._notify.pop(handle)
+            os.close(fd)
+            os.unlink(path)
+        return 0
+
+    def notify_handles(self):
+        """Nombre de handles de notification encore ouverts (fuite si non nul après close())"""
+        return len(self._notify)
+
+    # --- Scripts (sous-ensemble : m, w, mils, pud avec paramètres p0-p9) ---
+    def store_script(self, script):
+        handle = len(self._scripts)
+        self._scripts[handle] = script.decode().split()
+        return handle
+
+    def script_status(self, handle):
+        return PI_SCRIPT_HALTED, [0] * 10
+
+    def run_script(self, handle, params=None):
+        params = list(params or [])
+        tokens = self._scripts[handle]
+
+        def arg(token):
+            return params[int(token[1:])] if token.startswith('p') else int(token)
+
+        def run():
+            i = 0
+            while i < len(tokens):
+                cmd = tokens[i].lower()
+                if cmd == 'm':
+                    self.set_mode(arg(tokens[i + 1]), {'r': INPUT, 'w': OUTPUT}[tokens[i + 2]])
+                    i += 3
+                elif cmd == 'w':
+                    self.write(arg(tokens[i + 1]), arg(tokens[i + 2]))
+                    i += 3
+                elif cmd == 'mils':
+                    time.sleep(arg(tokens[i + 1]) / 1000)
+                    i += 2
+                elif cmd == 'pud':
+                    i += 3
+                else:
+                    raise ValueError(f"Commande de script non simulée: {cmd}")
+
+        threading.Thread(target=run, daemon=True).start() # Le script s'exécute côté démon
+        return 0
+
+    def delete_script(self, handle):
+        self._scripts.pop(handle, None)
+        return 0
+
+    def stop(self):
+        for handle in list(self._notify):
+            self.notify_close(handle)
+        if self._dir is not None:
+            os.rmdir(self._dir)
+            self._dir = None
+        self.connected = False
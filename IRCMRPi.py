@@ -9,9 +9,17 @@ import sys
 import time
 import random
 import subprocess
+import signal
 import threading
-import asyncio
 import queue
+import heapq
+import math
+import itertools
+import importlib.util
+import json
+from array import array
+from collections import Counter, OrderedDict, deque, namedtuple
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 
@@ -29,24 +37,64 @@ except ImportError:
     IR_AVAILABLE = False
     DHT_AVAILABLE = False
 
+# Imports différés : pygame (SDL), Pillow et bleak ne sont chargés qu'à leur première utilisation
+# (menu texte, mode console sans BLE, outils important ce module : aucun coût au lancement)
+def _lazy_import(name):
+    """Module chargé au premier accès à l'un de ses attributs (None s'il n'est pas installé)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError: # Paquet parent absent
+        return None
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
 # Import pour affichage graphique
-try:
-    import pygame
-    from PIL import Image
-    PYGAME_AVAILABLE = True
-except ImportError:
+pygame = _lazy_import('pygame')
+Image = _lazy_import('PIL.Image')
+PYGAME_AVAILABLE = pygame is not None and Image is not None # Paquets présents (chargés par load_display_modules)
+if not PYGAME_AVAILABLE:
     print("PyGame non disponible. Affichage désactivé.")
     print("Installez: sudo apt install python3-pygame & sudo apt install python3-pillow & pip3 install Pillow pygame (Pour l'environnement Python)")
-    PYGAME_AVAILABLE = False
 
-# Import pour BLE
-try:
-    from bleak import BleakScanner
-    BLE_AVAILABLE = True
-except ImportError:
+def load_display_modules():
+    """Exécute réellement pygame et Pillow (l'import différé ne vérifie que leur présence).
+    Un paquet cassé (SDL, bibliothèque partagée manquante) désactive l'affichage : PYGAME_AVAILABLE = False"""
+    global PYGAME_AVAILABLE
+    if not PYGAME_AVAILABLE:
+        return False
+    try:
+        pygame.display, Image.open # Premier accès : exécution des modules
+    except Exception as e: # ImportError, OSError...
+        print(f"PyGame / Pillow inutilisable ({e}). Affichage désactivé.")
+        PYGAME_AVAILABLE = False
+    return PYGAME_AVAILABLE
+
+# Import pour BLE (bleak est importé par BLESCAN au démarrage du premier scan)
+BLE_AVAILABLE = importlib.util.find_spec('bleak') is not None
+if not BLE_AVAILABLE:
     print("Bleak non disponible. BLE désactivé.")
     print("Installez: sudo apt install python3-bleak & pip3 install bleak (Pour l'environnement Python)")
-    BLE_AVAILABLE = False
+
+from IRDECODER import IRDecoderSet, format_key
+from EDGESTREAM import NotifyReader
+from BLESCAN import LoopThread, BACKENDS
+from BLEPAYLOAD import PayloadReader, DUPLICATE
+from BLEREGISTRY import SensorRegistry, SensorState
+from DHTCAPTURE import DaemonCapture, MultiDHTReader, FrameDecoder, DHTError, DHT11
+from TIMESERIES import SeriesStore, sparkline_points
+from SENSORLOG import SensorLog
+from METRICS import MetricsRegistry, MetricsServer
+from TRACING import Tracer
+from PROFILING import CommandProfiler, FrameStats, rss_bytes
+from STARTUP import InitStage
 
 # ===== CONFIGURATION =====
 # Chemin des images (à modifier selon vos fichiers)
@@ -56,20 +104,102 @@ IMAGE_PATHS = {
     '3': 'IMAGES/RTvsGEII.jpeg', # Image 3
 }
 
+# Cache des images déjà redimensionnées (évite lecture SD + redimensionnement à chaque touche)
+IMAGE_CACHE_BYTES = 64 * 1024 * 1024 # Budget mémoire du cache (octets)
+IMAGE_SCALE_MODE = 'scale'           # 'scale' (rapide) ou 'smooth' (meilleure qualité)
+IMAGE_JPEG_DRAFT = True              # Décodage JPEG directement à taille réduite (mode draft de Pillow)
+
+# Cache des textes rendus et des écrans statiques (aide, fonds de menu)
+RENDER_CACHE = True
+TEXT_CACHE_SIZE = 256 # Nombre maximum de textes gardés en cache
+
+# Police de l'interface : None → police intégrée de pygame (aucune recherche fontconfig),
+# sinon nom d'une police système (ex: "dejavusans") cherchée une seule fois puis gardée dans FONT_CACHE
+FONT_NAME = None
+FONT_CACHE = os.path.expanduser("~/.cache/ircmrpi-fonts.json")
+
+# Mise à jour partielle de l'écran : au-delà de cette fraction de surface modifiée, flip complet
+DIRTY_FULL_RATIO = 0.5
+
 # Configuration DHT11
 DHT_PIN = 27  # GPIO 27 (Remplacer si besoin)
-DHT_SENSOR = None 
+DHT_SENSOR = None # Modèle du capteur : None / 'DHT11' ou 'DHT22'
+# Plusieurs capteurs déclenchés ensemble par pigpiod (capture 'daemon') : {gpio: 'DHT11' | 'DHT22'}, ex: {27: 'DHT11', 22: 'DHT22'}
+# None : un seul capteur (DHT_PIN, DHT_SENSOR). La touche 4 affiche alors une carte par capteur
+DHT_SENSORS = None
+DHT_ADAPTIVE = True # Seuil 0/1 recalculé pour chaque trame (câbles longs, clones) au lieu du seuil fixe de 40µs
+DHT_INTERVAL = 2.0      # Période d'échantillonnage en arrière-plan (s)
+DHT_MIN_INTERVAL = 1.0  # Délai minimal entre deux lectures imposé par le DHT11 (s)
+DHT_MAX_BACKOFF = 30.0  # Attente maximale entre deux essais après des échecs répétés (s)
+DHT_FAILURE_LIMIT = 3   # Échecs consécutifs sans mesure avant d'afficher l'erreur au lieu de "Mesure en cours"
+# Capture d'une mesure :
+# 'daemon' : impulsion de démarrage jouée par un script pigpiod, fronts reçus par le pipe de notification
+# 'python' : impulsion et fenêtre de capture temporisées par time.sleep() côté Python
+DHT_CAPTURE = 'daemon'
 
 # Configuration BLE
 BLE_CONFIG = {
     'target_name': "...", #  Remplacez '...' par le nom du dispositif BLE (Format attendu : "Nom-du-BLE|température|humidité")
-    'interval': 5
+    'backend': 'bleak', # 'bleak' : adaptateur Bluetooth, 'fake' / 'fake-binary' : capteur simulé (tests sans Bluetooth)
+    # Charge utile binaire (voir BLEPAYLOAD.py) : manufacturer data de ce constructeur, sinon service data de cet UUID
+    'company_id': 0xFFFF,
+    'service_uuid': None,
+    # Adresses des capteurs acceptés (ex: ["AA:BB:CC:DD:EE:FF"]). None : charges utiles des appareils dont le nom contient target_name
+    'addresses': None,
+    # Registre multi-capteurs (mémoire bornée) : nombre max de capteurs suivis et mesures gardées par capteur
+    'max_sensors': 64,
+    'history_size': 32
+}
+
+# Historique des mesures (TIMESERIES.py) : tampons circulaires de taille fixe, mémoire constante
+# None : en mémoire seulement, sinon répertoire des fichiers projetés en mémoire (conservés au redémarrage)
+TIMESERIES_DIR = None
+SPARKLINE_POINTS = 120 # Dernières mesures brutes tracées sous les valeurs
+
+# Journal SQLite des mesures DHT / BLE et des commandes (SENSORLOG.py). 'path': None → désactivé
+SENSOR_LOG = {
+    'path': None, # ex: "/home/pi/capteurs.db"
+    'flush_interval': 5.0, # Écriture groupée toutes les 5s (limite l'usure de la carte SD)
+    'retention_days': 30, # Mesures brutes et événements, les moyennes horaires sont gardées 2 ans
+    'rollup_retention_days': 730
+}
+
+# Métriques de latence (METRICS.py) au format Prometheus : curl http://127.0.0.1:9108/metrics
+# ('127.0.0.1', port) : HTTP local, "/chemin/socket" : socket Unix, None : pas d'export
+METRICS_ADDRESS = ('127.0.0.1', 9108)
+IR_TICK_CALIBRATION = 60.0 # Recalage de l'horloge pigpio (ticks) sur time.perf_counter() (s)
+
+# Trace des intervalles (TRACING.py) : touche T ou kill -USR1 <pid> → trace-*.json dans TRACE_DIR
+# (à ouvrir dans https://ui.perfetto.dev). Désactivé : aucune mémoire réservée
+TRACE_ENABLED = False
+TRACE_DIR = "."
+TRACER = Tracer(enabled=TRACE_ENABLED)
+
+# Diagnostic sur site (PROFILING.py) : python3 IRCMRPi.py --profile [répertoire] --hud
+PROFILE_DIR = "profiles" # Fichiers .pstats par commande (--profile)
+HUD_REFRESH = 0.5        # Rafraîchissement du HUD : img/s, durée de rendu, files d'attente, RSS (--hud)
+
+# Initialisation parallèle (STARTUP.py) : étapes lancées en arrière-plan pendant l'affichage du menu,
+# délai maximal de chacune (s) au-delà duquel le matériel correspondant est considéré absent
+INIT_TIMEOUTS = {
+    'images': 5.0,  # Vérification des fichiers de IMAGE_PATHS
+    'pigpio': 3.0,  # Connexion à pigpiod (partagée par l'IR et le DHT)
+    'ble': 5.0,     # Import de bleak et présence d'un adaptateur Bluetooth
 }
 
 # Configuration IR et Mapping
 GPIO_IR = 18 # Broche de réception (BCM 18) (Remplacer si besoin)
 
+# Réception des fronts (IR + DHT) :
+# 'callback' : un appel Python par front (pi.callback)
+# 'notify'   : lecture par lots du pipe de notification pigpio (moins de charge CPU sous bruit IR)
+EDGE_INGESTION = 'callback'
+
+# Protocoles IR décodés en parallèle (NEC, SAMSUNG, SIRC, RC5)
+IR_PROTOCOLS = ('NEC', 'SAMSUNG', 'SIRC', 'RC5')
+
 # Remplacez les 0xFFFFFF par vos codes hexadécimaux obtenus avec le script IRCODENEC.py  
+# (NEC/Samsung : code hexadécimal, Sony/RC5 : clé affichée par IRNECCODE.py, ex: ('RC5', 0x05, 0x35))
 REMOTE_KEY_MAP = {
     0xFFFFFF: '1',  # Touche 1 (Image 1)
     0xFFFFFF: '2',  # Touche 2 (Image 2)
@@ -87,8 +217,184 @@ REMOTE_KEY_MAP = {
     0xFFFFFF: 'RIGHT',  # Flèche Droite
 }
 
+# Touches répétées tant que le bouton de la télécommande reste appuyé (trames de répétition)
+IR_REPEAT_KEYS = {'UP', 'DOWN', 'LEFT', 'RIGHT'}
+
+# Snake : vitesse du jeu et lecture des entrées (indépendantes)
+SNAKE_TICK = 0.1        # Secondes entre deux déplacements
+SNAKE_INPUT_HZ = 100    # Fréquence de lecture des entrées (clavier + IR)
+SNAKE_INPUT_QUEUE = 3   # Virages mémorisés d'avance (un seul appliqué par déplacement)
+
 # ===== CLASSES ET FONCTIONS =====
 
+# --- SurfaceCache ---
+class SurfaceCache:
+    """Cache LRU des images redimensionnées, borné en octets"""
+
+    def __init__(self, max_bytes=IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict() # (chemin, mtime, taille, mode) -> surface
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock() # Dictionnaires seulement : les chargements se font hors du verrou
+        self.loading = {} # Clé -> threading.Event des chargements en cours (un fichier n'est décodé qu'une fois)
+        self.generation = 0 # Incrémenté par invalidate() : chargement commencé avant = résultat non gardé
+        self.warm_thread = None
+
+    def get(self, path, size, mode=IMAGE_SCALE_MODE):
+        """Retourne la surface de l'image à la taille demandée (None si le fichier n'existe pas)"""
+        try:
+            mtime = os.stat(path).st_mtime_ns # Un fichier modifié change de clé
+        except OSError:
+            return None
+        key = (path, mtime, size, mode)
+
+        while True:
+            with self.lock:
+                surface = self.entries.get(key)
+                if surface is not None:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return surface
+                pending = self.loading.get(key)
+                if pending is None:
+                    pending = self.loading[key] = threading.Event()
+                    generation = self.generation
+                    self.misses += 1
+                    break
+            pending.wait() # Même image en cours de chargement (préchargement) : on attend son résultat
+
+        surface = None
+        try:
+            surface = self._load(path, size, mode)
+        finally:
+            with self.lock:
+                del self.loading[key]
+                if surface is not None and generation == self.generation and key not in self.entries:
+                    self._insert(key, surface)
+            pending.set()
+        return surface
+
+    def _insert(self, key, surface):
+        self._discard(lambda k: k[0] == key[0]) # Anciennes versions de ce fichier / anciennes tailles
+        self.entries[key] = surface
+        self.used_bytes += self._surface_bytes(surface)
+        while self.used_bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.used_bytes -= self._surface_bytes(old)
+
+    def _load(self, path, size, mode):
+        """Charge et redimensionne une image (lecture SD : lent)"""
+        with TRACER.span('image_load', 'image', path=os.path.basename(path)):
+            image = self._load_draft(path, size) if IMAGE_JPEG_DRAFT else None
+            if image is None:
+                image = pygame.image.load(path)
+        with TRACER.span('image_scale', 'image', mode=mode):
+            if mode == 'smooth':
+                image = pygame.transform.smoothscale(image.convert(), size)
+            else:
+                image = pygame.transform.scale(image, size)
+            return image.convert() # Même format que l'écran : blit direct
+
+    @staticmethod
+    def _load_draft(path, size):
+        """Décode un JPEG à ~la taille cible (réduction 1/2, 1/4 ou 1/8 dans le domaine DCT)"""
+        with Image.open(path) as im:
+            if im.format != 'JPEG':
+                return None # Autres formats : chargement pygame classique
+            im.draft('RGB', size) # Ne réduit jamais sous la taille demandée
+            if im.mode != 'RGB':
+                im = im.convert('RGB')
+            # frombuffer partage les octets décodés : pas de copie supplémentaire
+            return pygame.image.frombuffer(im.tobytes(), im.size, 'RGB')
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def _discard(self, predicate):
+        for key in [k for k in self.entries if predicate(k)]:
+            self.used_bytes -= self._surface_bytes(self.entries.pop(key))
+
+    def invalidate(self, size=None):
+        """Vide le cache (ou seulement les entrées qui ne sont pas à la taille donnée)"""
+        with self.lock:
+            self.generation += 1
+            self._discard(lambda k: size is None or k[2] != size)
+
+    def warm(self, paths, size, mode=IMAGE_SCALE_MODE):
+        """Précharge les images en arrière-plan"""
+        def run():
+            for path in paths:
+                try:
+                    self.get(path, size, mode)
+                except Exception as e:
+                    print(f"Préchargement impossible ({path}): {e}")
+
+        self.warm_thread = threading.Thread(target=run, name="image-warm", daemon=True)
+        self.warm_thread.start()
+
+# --- TextCache ---
+class TextCache:
+    """Cache LRU des textes rendus, clé (police, texte, couleur, anticrénelage)"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        with TRACER.span('font_render', 'render'):
+            surface = font.render(text, antialias, color)
+        if self.max_entries > 0:
+            self.entries[key] = surface
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+# --- Polices ---
+_font_paths = {} # Nom -> fichier (None : police intégrée)
+
+def font_path(name):
+    """Fichier de la police système name (None : police intégrée de pygame)
+
+    pygame.font.SysFont() parcourt toutes les polices installées (fc-list, plusieurs secondes sur Pi)
+    à chaque lancement : le chemin trouvé est gardé en mémoire et dans FONT_CACHE.
+    """
+    if name is None:
+        return None
+    if name in _font_paths:
+        return _font_paths[name]
+    try:
+        with open(FONT_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    path = cache.get(name)
+    if name not in cache or (path is not None and not os.path.exists(path)):
+        path = pygame.font.match_font(name) # Recherche fontconfig (lente)
+        cache[name] = path
+        try:
+            os.makedirs(os.path.dirname(FONT_CACHE), exist_ok=True)
+            with open(FONT_CACHE, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Cache des polices non enregistré ({FONT_CACHE}): {e}")
+    _font_paths[name] = path
+    return path
+
 # --- ImageDisplay ---
 class ImageDisplay:
     """Gestion de l'affichage d'images plein écran"""
@@ -97,168 +403,445 @@ class ImageDisplay:
         if not PYGAME_AVAILABLE:
             raise ImportError("PyGame non disponible")
             
-        pygame.init()
+        # Seuls l'affichage et les polices sont utilisés (pygame.init() ouvrirait aussi l'audio, le joystick...)
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((800, 600),pygame.RESIZABLE) # Gérer ici la taille de la fenêtre.
         pygame.display.set_caption("Contrôleur IR Multimode") # Le titre de la fenêtre.
         self.clock = pygame.time.Clock()
         self.current_image = None
-        self.font = pygame.font.SysFont(None, 36)
-        self.small_font = pygame.font.SysFont(None, 24)
+        self.font = pygame.font.Font(font_path(FONT_NAME), 36)
+        self.small_font = pygame.font.Font(font_path(FONT_NAME), 24)
+        
+        # Cache de rendu du texte et des calques statiques
+        self.render_cache = RENDER_CACHE
+        self.text_cache = TextCache()
+        self.layers = {} # (nom, taille écran) -> (surface, données du calque)
         
+        # Zones modifiées depuis la dernière mise à jour de l'écran
+        self.dirty = []
+        self.full_redraw = True
+        self.shown_size = None     # Taille de la fenêtre lors du dernier affichage
+        self.current_layer = None  # Calque actuellement affiché (clé) et sa surface
+        self.current_layer_surface = None
+        self.slots = {}            # Emplacement dynamique -> (police, texte, couleur, rectangle)
+        self.on_frame = None       # Appelé une fois (puis retiré) avec l'heure de la prochaine mise à jour de l'écran
+        self.frame_stats = FrameStats()
+        self.frame_start = None    # Premier dessin de l'image en cours (durée de rendu)
+        self.hud = None            # Sources du HUD [(libellé, fonction)], None : pas de HUD
+        self.hud_surface = None
+        self.hud_rect = None
+        self.hud_next = 0.0
+        
+        # Préchargement des images à la taille de la fenêtre
+        self.image_cache = SurfaceCache()
+        self.cache_size = self.screen.get_size()
+        self.image_cache.warm(list(IMAGE_PATHS.values()), self.cache_size)
+        
+    def text(self, font, text, color):
+        """Rend un texte en passant par le cache"""
+        if not self.render_cache:
+            with TRACER.span('font_render', 'render'):
+                return font.render(text, True, color)
+        return self.text_cache.render(font, text, color)
+
+    def blit_text(self, font, text, color, slot=None, background=None, **position):
+        """Rend et affiche un texte (position : center=..., topleft=..., etc.). Retourne son rectangle
+
+        slot : emplacement dynamique sur le calque courant. L'ancien texte est effacé avec le
+        fond du calque, et rien n'est redessiné si le texte n'a pas changé.
+        background : couleur de fond à peindre sous le texte
+        """
+        surface = self.text(font, text, color)
+        rect = surface.get_rect(**position)
+        if slot is not None:
+            state = (font, text, color, rect)
+            previous = self.slots.get(slot)
+            if previous == state:
+                return rect # Inchangé : aucune zone à mettre à jour
+            if previous is not None:
+                self.restore(previous[3])
+            self.slots[slot] = state
+        if background is not None:
+            self.screen.fill(background, rect)
+        self.screen.blit(surface, rect)
+        self.mark_dirty(rect)
+        return rect
+
+    def restore(self, rect):
+        """Recopie le fond du calque courant sur une zone de l'écran"""
+        if self.current_layer_surface is None:
+            self.full_redraw = True
+            return
+        self.screen.blit(self.current_layer_surface, rect, rect)
+        self.mark_dirty(rect)
+
+    def mark_dirty(self, rect):
+        """Signale une zone modifiée de l'écran"""
+        if self.frame_start is None:
+            self.frame_start = time.perf_counter()
+        self.dirty.append(pygame.Rect(rect))
+
+    def mark_full(self):
+        """Tout l'écran a été redessiné hors calque"""
+        if self.frame_start is None:
+            self.frame_start = time.perf_counter()
+        self.full_redraw = True
+        self.current_layer = None
+        self.current_layer_surface = None
+        self.slots = {}
+
+    def present(self, frame=True):
+        """Met à jour l'écran : seulement les zones modifiées, ou flip complet si elles sont trop grandes
+
+        frame=False : rafraîchissement du HUD seul, non compté dans les images (img/s, durée de rendu)
+        """
+        hud_only = not frame and self.frame_start is None # Aucun dessin en attente en dehors du HUD
+        if self.hud is not None:
+            self.draw_hud()
+            if hud_only:
+                self.frame_start = None # Le dessin du HUD seul ne commence pas une image
+        size = self.screen.get_size()
+        rects = self._merge_dirty(self.dirty)
+        self.dirty = []
+        if not self.full_redraw and size == self.shown_size:
+            area = sum(r.width * r.height for r in rects)
+            if area <= DIRTY_FULL_RATIO * size[0] * size[1]:
+                if rects:
+                    with TRACER.span('display_update', 'display', rects=len(rects)):
+                        pygame.display.update(rects)
+                self._frame_shown(not hud_only)
+                return
+        self.full_redraw = False
+        self.shown_size = size
+        with TRACER.span('display_flip', 'display'):
+            pygame.display.flip()
+        self._frame_shown(not hud_only)
+
+    def present_hud(self):
+        """Minuterie du HUD (--hud) : valeurs à jour même sans activité, sans compter d'image"""
+        self.present(frame=False)
+
+    def _frame_shown(self, frame=True):
+        if not frame:
+            return
+        now = time.perf_counter()
+        self.frame_stats.tick(now - (self.frame_start if self.frame_start is not None else now))
+        self.frame_start = None
+        if self.on_frame is not None:
+            callback, self.on_frame = self.on_frame, None
+            callback(now)
+
+    def draw_hud(self):
+        """HUD en haut à droite : img/s, durée d'image, sources (files d'attente...) et mémoire résidente"""
+        now = time.perf_counter()
+        if self.hud_surface is None or now >= self.hud_next:
+            self.hud_next = now + HUD_REFRESH
+            stats = self.frame_stats
+            parts = [f"{stats.rate(now):.1f} img/s", f"rendu {stats.render_time * 1000:.1f} ms"]
+            parts += [f"{label}: {source()}" for label, source in self.hud]
+            parts.append(f"RSS {rss_bytes() / 1048576:.1f} Mo")
+            # Rendu direct : ces textes changent sans cesse et videraient le cache de texte
+            self.hud_surface = self.small_font.render("  ".join(parts), True, (255, 255, 0), (0, 0, 0))
+        rect = self.hud_surface.get_rect(topright=(self.screen.get_width() - 4, 4))
+        if self.hud_rect is not None and self.hud_rect != rect:
+            # Ancien texte plus long : fond du calque, ou noir hors calque (images, jeu)
+            if self.current_layer_surface is not None:
+                self.restore(self.hud_rect)
+            else:
+                self.screen.fill((0, 0, 0), self.hud_rect)
+                self.mark_dirty(self.hud_rect)
+        self.screen.blit(self.hud_surface, rect)
+        self.hud_rect = rect
+        self.mark_dirty(rect)
+
+    @staticmethod
+    def _merge_dirty(rects):
+        """Fusionne les rectangles qui se chevauchent (peu de rectangles par image)"""
+        merged = []
+        for rect in rects:
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def static_layer(self, name, builder):
+        """Calque statique précomposé : builder(surface) n'est appelé qu'une fois par taille d'écran
+
+        builder peut retourner des données (ex: positions des lignes) rendues avec le calque.
+        Si le calque est déjà affiché, il n'est pas recopié : seuls les emplacements changent.
+        """
+        key = (name, self.screen.get_size())
+        layer = self.layers.get(key) if self.render_cache else None
+        if layer is not None and key == self.current_layer:
+            return layer[1]
+        if layer is None:
+            surface = pygame.Surface(key[1]).convert()
+            layer = (surface, builder(surface))
+            if self.render_cache:
+                # Une seule taille gardée par calque (fenêtre redimensionnée)
+                for old in [k for k in self.layers if k[0] == name]:
+                    del self.layers[old]
+                self.layers[key] = layer
+        self.screen.blit(layer[0], (0, 0))
+        self.mark_full()
+        if self.render_cache:
+            self.current_layer = key
+            self.current_layer_surface = layer[0]
+        return layer[1]
+
+    def draw_text(self, surface, font, text, color, **position):
+        """Dessine un texte sur une surface de calque"""
+        rendered = self.text(font, text, color)
+        rect = rendered.get_rect(**position)
+        surface.blit(rendered, rect)
+        return rect
+
     def display_image(self, image_path):
         """Affiche une image en plein écran"""
-        if not os.path.exists(image_path):
-            self.display_error(f"Image non trouvée: {image_path}") # Si l'image n'est pas trouvée par le programme.
-            return
-            
         try:
-            image = pygame.image.load(image_path)
             screen_width, screen_height = self.screen.get_size()
-            image = pygame.transform.scale(image, (screen_width, screen_height))
+            if (screen_width, screen_height) != self.cache_size:
+                # Fenêtre redimensionnée : les images en cache ne sont plus à la bonne taille
+                self.cache_size = (screen_width, screen_height)
+                self.image_cache.invalidate(self.cache_size)
+                self.image_cache.warm(list(IMAGE_PATHS.values()), self.cache_size)
+            
+            image = self.image_cache.get(image_path, (screen_width, screen_height))
+            if image is None:
+                self.display_error(f"Image non trouvée: {image_path}") # Si l'image n'est pas trouvée par le programme.
+                return
             
             self.screen.blit(image, (0, 0))
             
             # Afficher le nom du fichier en bas à droite
             filename = os.path.basename(image_path)
-            info_text = self.small_font.render(f"Image: {filename}", True, (255, 255, 255))
-            info_rect = info_text.get_rect(bottomright=(screen_width - 10, screen_height - 10))
-            self.screen.blit(info_text, info_rect)
+            self.blit_text(self.small_font, f"Image: {filename}", (255, 255, 255),
+                           bottomright=(screen_width - 10, screen_height - 10))
             
-            pygame.display.flip()
+            self.mark_full()
+            self.present()
             print(f"Image affichée: {image_path}")
             
         except Exception as e:
             self.display_error(f"Erreur image: {str(e)}")
     
-    def display_dht_data(self, temperature, humidity, is_test=False):
-        """Affiche les données DHT11"""
-        self.screen.fill((0, 0, 0))  # Fond noir
-        
-        # Titre
-        title = "  DONNÉES CAPTEUR DHT11"
-        if is_test:
-            title = "  DONNÉES DE TEST (DHT11 non disponible)"
+    def display_dht_data(self, temperature, humidity, is_test=False, timestamp=None, age=None, series=None):
+        """Affiche les données DHT11 (timestamp / age : heure et ancienneté de la mesure en cache)
+
+        series : historique (SeriesStore) tracé sous les valeurs
+        """
+        # Titre + message info : calque statique (fond noir)
+        def build(surface):
+            surface.fill((0, 0, 0))  # Fond noir
+            title = "  DONNÉES CAPTEUR DHT11"
+            if is_test:
+                title = "  DONNÉES DE TEST (DHT11 non disponible)"
+            center_x = surface.get_width()//2
+            self.draw_text(surface, self.font, title, (255, 255, 255), center=(center_x, 100))
+            info = "Appuyez sur une autre touche pour continuer"
+            self.draw_text(surface, self.small_font, info, (200, 200, 200), center=(center_x, 450))
         
-        title_text = self.font.render(title, True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(self.screen.get_width()//2, 100))
-        self.screen.blit(title_text, title_rect)
+        self.static_layer('dht_test' if is_test else 'dht', build)
+        center_x = self.screen.get_width()//2
         
         # Température
         temp_color = (255, 100, 100) if temperature > 30 else (100, 255, 100) if temperature > 20 else (100, 150, 255)
-        temp_text = self.font.render(f" Température: {temperature:.1f} °C", True, temp_color)
-        temp_rect = temp_text.get_rect(center=(self.screen.get_width()//2, 200))
-        self.screen.blit(temp_text, temp_rect)
+        self.blit_text(self.font, f" Température: {temperature:.1f} °C", temp_color,
+                       slot='temperature', center=(center_x, 200))
         
         # Humidité
         hum_color = (100, 100, 255) if humidity > 60 else (100, 255, 100) if humidity > 30 else (255, 200, 100)
-        hum_text = self.font.render(f" Humidité: {humidity:.1f} %", True, hum_color)
-        hum_rect = hum_text.get_rect(center=(self.screen.get_width()//2, 300))
-        self.screen.blit(hum_text, hum_rect)
-        
-        # Message info
-        info = "Appuyez sur une autre touche pour continuer"
-        info_text = self.small_font.render(info, True, (200, 200, 200))
-        info_rect = info_text.get_rect(center=(self.screen.get_width()//2, 450))
-        self.screen.blit(info_text, info_rect)
+        self.blit_text(self.font, f" Humidité: {humidity:.1f} %", hum_color, slot='humidity', center=(center_x, 300))
         
         # Timestamp
-        time_str = datetime.now().strftime("%H:%M:%S")
-        time_text = self.small_font.render(f"Dernière lecture: {time_str}", True, (150, 150, 150))
-        time_rect = time_text.get_rect(center=(self.screen.get_width()//2, 500))
-        self.screen.blit(time_text, time_rect)
+        if timestamp is None:
+            time_str = datetime.now().strftime("%H:%M:%S")
+        else:
+            time_str = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+        if age is not None:
+            time_str += f" (il y a {int(age)}s)"
+        self.blit_text(self.small_font, f"Dernière lecture: {time_str}", (150, 150, 150),
+                       slot='time', center=(center_x, 500))
         
-        pygame.display.flip()
-        print(f"Données affichées: {temperature}°C, {humidity}%")
+        if series is not None:
+            self.draw_history(series)
+        self.present()
 
-    def display_ble_data(self, name, temperature, humidity):
-        """Affiche les données BLE reçues (CORRECTIF: Méthode ajoutée)"""
-        self.screen.fill((0, 0, 50))  # Fond bleu nuit
+    def display_ble_data(self, name, temperature, humidity, series=None, address=None):
+        """Affiche les données BLE reçues (CORRECTIF: Méthode ajoutée)
+
+        series / address : historique du capteur (SeriesStore du BLEMonitor) tracé sous les valeurs
+        """
+        # Message info : calque statique (fond bleu nuit)
+        def build(surface):
+            surface.fill((0, 0, 50))  # Fond bleu nuit
+            info = "Scan en cours... Appuyez sur une touche pour arrêter"
+            self.draw_text(surface, self.small_font, info, (200, 200, 200),
+                            center=(surface.get_width()//2, 450))
+        
+        self.static_layer('ble', build)
+        center_x = self.screen.get_width()//2
         
         # Titre
-        title = f"SCAN BLE: {name}"
-        title_text = self.font.render(title, True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(self.screen.get_width()//2, 100))
-        self.screen.blit(title_text, title_rect)
+        self.blit_text(self.font, f"SCAN BLE: {name}", (255, 255, 255), slot='title', center=(center_x, 100))
         
         # Température
-        temp_text = self.font.render(f" Température: {temperature:.1f} °C", True, (255, 200, 100))
-        temp_rect = temp_text.get_rect(center=(self.screen.get_width()//2, 200))
-        self.screen.blit(temp_text, temp_rect)
+        self.blit_text(self.font, f" Température: {temperature:.1f} °C", (255, 200, 100),
+                       slot='temperature', center=(center_x, 200))
         
         # Humidité
-        hum_text = self.font.render(f" Humidité: {humidity:.1f} %", True, (100, 200, 255))
-        hum_rect = hum_text.get_rect(center=(self.screen.get_width()//2, 300))
-        self.screen.blit(hum_text, hum_rect)
-        
-        # Info
-        info = "Scan en cours... Appuyez sur une touche pour arrêter"
-        info_text = self.small_font.render(info, True, (200, 200, 200))
-        info_rect = info_text.get_rect(center=(self.screen.get_width()//2, 450))
-        self.screen.blit(info_text, info_rect)
+        self.blit_text(self.font, f" Humidité: {humidity:.1f} %", (100, 200, 255),
+                       slot='humidity', center=(center_x, 300))
         
         # Timestamp
         time_str = datetime.now().strftime("%H:%M:%S")
-        time_text = self.small_font.render(f"Reçu à: {time_str}", True, (150, 150, 150))
-        time_rect = time_text.get_rect(center=(self.screen.get_width()//2, 500))
-        self.screen.blit(time_text, time_rect)
+        self.blit_text(self.small_font, f"Reçu à: {time_str}", (150, 150, 150), slot='time', center=(center_x, 500))
         
-        pygame.display.flip()
+        if series is not None:
+            self.draw_history(series, f"{address}/")
+        self.present()
+    
+    def draw_history(self, series, prefix=''):
+        """Courbes des dernières mesures (température, humidité) et min / moy / max glissants"""
+        center_x = self.screen.get_width()//2
+        rect = pygame.Rect(center_x - 200, 330, 400, 70)
+        temperatures = series.values(prefix + 'temperature', last=SPARKLINE_POINTS)
+        humidities = series.values(prefix + 'humidity', last=SPARKLINE_POINTS)
+        self.draw_sparkline('sparkline', rect, ((temperatures, (255, 200, 100)), (humidities, (100, 200, 255))))
+        stats = series.stats(prefix + 'temperature')
+        text = f"min {stats[0]:.1f} / moy {stats[2]:.1f} / max {stats[1]:.1f} °C" if stats else ""
+        self.blit_text(self.small_font, text, (150, 150, 150), slot='stats', center=(center_x, 420))
+    
+    def draw_sparkline(self, slot, rect, lines):
+        """Trace des courbes [(valeurs, couleur), ...] dans rect, chacune à sa propre échelle
+
+        Comme pour les textes, rien n'est redessiné si les valeurs n'ont pas changé.
+        """
+        state = ('sparkline', tuple((tuple(values), color) for values, color in lines), rect)
+        if self.slots.get(slot) == state:
+            return
+        self.restore(rect)
+        self.slots[slot] = state
+        for values, color in lines:
+            points = sparkline_points(values, rect.inflate(-4, -4))
+            if points:
+                pygame.draw.lines(self.screen, color, False, points, 2)
+        self.mark_dirty(rect)
+    
+    def display_ble_dashboard(self, states, now):
+        """Tableau de bord des capteurs BLE (now : même horloge que state.timestamp)"""
+        self.display_sensor_dashboard(states, now, "CAPTEURS BLE", "Scan en cours... Appuyez sur une touche pour arrêter")
+    
+    def display_sensor_dashboard(self, states, now, title, info):
+        """Tableau de bord multi-capteurs : une carte par capteur (nom, mesures, âge de la mesure)"""
+        card_w, card_h, columns, top = 240, 100, 3, 150
+        
+        # Titre, consigne et cadres des cartes : calque statique (un par titre)
+        def build(surface):
+            surface.fill((0, 0, 50))  # Fond bleu nuit
+            width, height = surface.get_size()
+            self.draw_text(surface, self.font, title, (255, 255, 255), center=(width//2, 60))
+            self.draw_text(surface, self.small_font, info, (200, 200, 200), center=(width//2, height - 30))
+            rows = max(1, (height - top - 60) // card_h)
+            left = (width - columns * card_w) // 2
+            cards = []
+            for i in range(rows * columns):
+                rect = pygame.Rect(left + (i % columns) * card_w + 5, top + (i // columns) * card_h + 5,
+                                   card_w - 10, card_h - 10)
+                pygame.draw.rect(surface, (40, 40, 90), rect, border_radius=6)
+                cards.append(rect)
+            return cards
+        
+        cards = self.static_layer(('dashboard', title), build)
+        center_x = self.screen.get_width()//2
+        self.blit_text(self.small_font, f"{len(states)} capteur(s)", (150, 150, 150),
+                       slot='count', center=(center_x, 100))
+        
+        for i, rect in enumerate(cards):
+            if i < len(states):
+                state = states[i]
+                age = int(now - state.timestamp)
+                battery = f" | {state.battery}%" if state.battery is not None else ""
+                lines = (state.name or state.address,
+                         f"{state.temperature:.1f}°C  {state.humidity:.0f}%",
+                         f"il y a {age}s{battery}")
+            else:
+                lines = ("", "", "") # Carte libre : l'ancien texte est effacé
+            self.blit_text(self.small_font, lines[0], (255, 255, 255), slot=('card', i, 0),
+                           midtop=(rect.centerx, rect.top + 8))
+            self.blit_text(self.font, lines[1], (255, 200, 100), slot=('card', i, 1),
+                           center=(rect.centerx, rect.centery))
+            self.blit_text(self.small_font, lines[2], (150, 150, 150), slot=('card', i, 2),
+                           midbottom=(rect.centerx, rect.bottom - 8))
+        
+        hidden = len(states) - len(cards)
+        self.blit_text(self.small_font, f"+{hidden} autres capteurs" if hidden > 0 else "", (200, 200, 200),
+                       slot='hidden', center=(center_x, self.screen.get_height() - 60))
+        self.present()
     
     def display_menu(self, title, options, selected=0):
         """Affiche un menu avec options"""
-        self.screen.fill((30, 30, 50))  # Fond bleu foncé
-        
-        # Titre
-        title_text = self.font.render(title, True, (255, 255, 200))
-        title_rect = title_text.get_rect(center=(self.screen.get_width()//2, 100))
-        self.screen.blit(title_text, title_rect)
-        
-        # Options
-        y_pos = 200
-        for i, (option, description) in enumerate(options):
-            color = (255, 255, 100) if i == selected else (200, 200, 255)
-            option_text = self.font.render(f"{i+1}. {option}", True, color)
-            option_rect = option_text.get_rect(center=(self.screen.get_width()//2, y_pos))
-            self.screen.blit(option_text, option_rect)
+        # Fond + titre + toutes les options non sélectionnées : calque statique
+        def build(surface):
+            surface.fill((30, 30, 50))  # Fond bleu foncé
+            center_x = surface.get_width()//2
+            self.draw_text(surface, self.font, title, (255, 255, 200), center=(center_x, 100))
             
-            if description:
-                desc_text = self.small_font.render(description, True, (180, 180, 180))
-                desc_rect = desc_text.get_rect(center=(self.screen.get_width()//2, y_pos + 30))
-                self.screen.blit(desc_text, desc_rect)
-                y_pos += 60
-            else:
-                y_pos += 50
+            # Options
+            rows = []
+            y_pos = 200
+            for i, (option, description) in enumerate(options):
+                rows.append(self.draw_text(surface, self.font, f"{i+1}. {option}", (200, 200, 255),
+                                            center=(center_x, y_pos)))
+                
+                if description:
+                    self.draw_text(surface, self.small_font, description, (180, 180, 180),
+                                    center=(center_x, y_pos + 30))
+                    y_pos += 60
+                else:
+                    y_pos += 50
+            
+            # Instructions
+            self.draw_text(surface, self.small_font,
+                            "Utilisez flèche du (Haut) et flèche du (Bas) pour naviguer, ENTREE pour valider",
+                            (150, 150, 150), center=(center_x, surface.get_height() - 50))
+            return rows
+        
+        rows = self.static_layer(('menu', title, tuple(options)), build)
         
-        # Instructions
-        instr_text = self.small_font.render("Utilisez flèche du (Haut) et flèche du (Bas) pour naviguer, ENTREE pour valider", True, (150, 150, 150))
-        instr_rect = instr_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height() - 50))
-        self.screen.blit(instr_text, instr_rect)
+        # Seule la ligne sélectionnée est redessinée (l'ancienne est restaurée depuis le calque)
+        if 0 <= selected < len(options):
+            row = rows[selected]
+            self.blit_text(self.font, f"{selected+1}. {options[selected][0]}", (255, 255, 100),
+                           slot='selection', background=(30, 30, 50), center=row.center)
         
-        pygame.display.flip()
+        self.present()
     
     def display_error(self, message):
         """Affiche un message d'erreur"""
         self.screen.fill((50, 0, 0))
-        error_text = self.font.render(f"{message}", True, (255, 200, 200))
-        error_rect = error_text.get_rect(center=(self.screen.get_width()//2, 
-                                               self.screen.get_height()//2))
-        self.screen.blit(error_text, error_rect)
-        pygame.display.flip()
+        self.blit_text(self.font, f"{message}", (255, 200, 200),
+                       center=(self.screen.get_width()//2, self.screen.get_height()//2))
+        self.mark_full()
+        self.present()
         print(f"Erreur: {message}")
     
     def display_info(self, message):
         """Affiche un message d'information"""
         self.screen.fill((0, 30, 0))
-        info_text = self.font.render(message, True, (200, 255, 200))
-        info_rect = info_text.get_rect(center=(self.screen.get_width()//2,
-                                             self.screen.get_height()//2))
-        self.screen.blit(info_text, info_rect)
-        pygame.display.flip()
+        self.blit_text(self.font, message, (200, 255, 200),
+                       center=(self.screen.get_width()//2, self.screen.get_height()//2))
+        self.mark_full()
+        self.present()
     
     def clear_screen(self):
         """Efface l'écran"""
         self.screen.fill((0, 0, 0))
-        pygame.display.flip()
+        self.mark_full()
+        self.present()
     
     def close(self):
         """Ferme proprement Pygame"""
@@ -268,20 +851,36 @@ class ImageDisplay:
 class DHT11Reader:
     """Lecture des données du capteur DHT11 via PIGPIO"""
     
-    def __init__(self, pin, sensor_type=None):
+    def __init__(self, pin, sensor_type=None, pi=None, capture=DHT_CAPTURE, connect=True, sensors=None):
         self.pin = pin
-        self.sensor_type = sensor_type # Gardé pour compatibilité signature mais non utilisé
+        self.sensor_type = sensor_type or DHT11 # 'DHT11' ou 'DHT22' (format de la trame)
+        self.decoder = FrameDecoder(self.sensor_type, DHT_ADAPTIVE) # Compte aussi les échecs par cause
+        self.sensors = dict(sensors) if sensors else None # Capteurs lus ensemble (DHT_SENSORS), None : pin seul
+        self.multi_reader = None # MultiDHTReader préparé à la première lecture de self.sensors
         self.last_reading = None
-        self.pi = None
+        self.pi = pi # Connexion pigpio fournie (ex: FAKEPIGPIO.FakePi), sinon ouverte ici
         self.high_ticks = []
         self.last_tick = 0
-        
-        # Connexion pigpio
-        if PIGPIO_AVAILABLE:
-            self.pi = pigpio.pi()
-            if not self.pi.connected:
-                print("Impossible de connecter à pigpio daemon pour DHT")
-                self.pi = None
+        self.notify_reader = None # Ouvert à la première lecture en mode 'notify'
+        self.capture_mode = capture
+        self.daemon_capture = None # Préparée à la première lecture en mode 'daemon'
+        self.log = None # Journal SQLite (SensorLog) : mesures et échecs de décodage
+        # Connexion pigpio ouverte au premier usage (connect()), jamais tentée si connect=False (démon injoignable)
+        self._connected = self.pi is not None or not connect
+        self._connect_lock = threading.Lock()
+
+    def connect(self):
+        """Connexion au démon pigpio, tentée une seule fois au premier usage (pas d'attente au lancement)"""
+        with self._connect_lock:
+            if not self._connected:
+                self._connected = True
+                if PIGPIO_AVAILABLE:
+                    pi = pigpio.pi()
+                    if pi.connected:
+                        self.pi = pi
+                    else:
+                        print("Impossible de connecter à pigpio daemon pour DHT")
+        return self.pi
 
     def _cb_dht(self, gpio, level, tick):
         """Callback interne pour mesurer les durées d'impulsion"""
@@ -289,81 +888,138 @@ class DHT11Reader:
             self.last_tick = tick
         elif level == 0: # Front descendant (fin de l'état haut)
             if self.last_tick != 0:
-                diff = pigpio.tickDiff(self.last_tick, tick)
+                diff = (tick - self.last_tick) & 0xFFFFFFFF # pigpio.tickDiff (utilisable en rejeu sans pigpio)
                 self.high_ticks.append(diff)
 
+    def decode_pulses(self):
+        """Décode les largeurs d'impulsions capturées (self.high_ticks) en (température, humidité)"""
+        try:
+            temperature, humidity = self.decoder.decode(self.high_ticks)
+        except DHTError as e:
+            if self.log is not None:
+                self.log.event('dht', e.cause or 'error', str(e))
+            raise
+        if self.log is not None:
+            self.log.reading('dht', f"GPIO{self.pin}", temperature, humidity)
+        return temperature, humidity
+
+    def _open_daemon_capture(self):
+        """Prépare le script de démarrage et le pipe de notification (repli sur la capture Python si échec)"""
+        try:
+            self.daemon_capture = DaemonCapture(self.pi, [self.pin])
+        except Exception as e:
+            print(f"Capture DHT côté démon indisponible ({e}) - capture Python")
+            self.capture_mode = 'python'
+
+    def close(self):
+        """Libère le script et le pipe de notification"""
+        if self.daemon_capture is not None:
+            self.daemon_capture.close()
+            self.daemon_capture = None
+        if self.multi_reader is not None:
+            self.multi_reader.close()
+            self.multi_reader = None
+        if self.notify_reader is not None:
+            self.notify_reader.close() # pigpiod n'a que quelques handles de notification
+            self.notify_reader = None
+
+    def failure_counts(self):
+        """Échecs de décodage par cause, tous capteurs confondus (copie : appelée par l'export des métriques)"""
+        counts = Counter(self.decoder.failure_counts())
+        multi_reader = self.multi_reader
+        if multi_reader is not None:
+            for decoder in multi_reader.decoders.values():
+                counts.update(decoder.failure_counts())
+        return counts
+
+    def _notify_start(self):
+        """Active le pipe de notification avant l'impulsion de démarrage (aucun front perdu)"""
+        if self.notify_reader is None:
+            self.notify_reader = NotifyReader.open_pigpio(self.pi, {self.pin: self._cb_dht})
+        else:
+            self.notify_reader.resume()
+
+    def _notify_stop(self):
+        """Suspend les notifications puis décode tous les fronts capturés en un seul lot"""
+        self.notify_reader.pause()
+        self.notify_reader.drain()
+
+    @property
+    def available(self):
+        self.connect()
+        return self.pi is not None and self.pi.connected
+
     def read(self):
         """Lit les données du capteur manuellement avec pigpio"""
-        if not DHT_AVAILABLE or self.pi is None or not self.pi.connected:
+        if not self.available:
             print("Pigpio/DHT non disponible - Valeurs de test")
             return self._return_test_values()
 
         try:
-            self.high_ticks = []
-            self.last_tick = 0
-            
-            # 1. Signal de démarrage (MCU tire vers le bas > 18ms)
-            self.pi.set_mode(self.pin, pigpio.OUTPUT)
-            self.pi.write(self.pin, 0)
-            time.sleep(0.018) 
-            
-            # 2. Relâcher le bus (Pull up) et passer en écoute
-            self.pi.set_mode(self.pin, pigpio.INPUT)
-            self.pi.set_pull_up_down(self.pin, pigpio.PUD_UP)
-            
-            # 3. Enregistrer les transitions pendant 50ms (temps suffisant pour tout recevoir)
-            cb_id = self.pi.callback(self.pin, pigpio.EITHER_EDGE, self._cb_dht)
-            time.sleep(0.05)
-            cb_id.cancel()
-            
-            # 4. Décoder les données
-            # On ignore généralement les premiers ticks (réponse du capteur)
-            # On cherche 40 bits de données
-            data_bits = []
-            
-            # Les pulses de données : '0' (~26-28us HIGH), '1' (~70us HIGH)
-            # On utilise un seuil à ~40us
-            valid_pulses = [x for x in self.high_ticks if x > 10] # Filtre bruit
-            
-            # On s'attend à voir la réponse initiale puis 40 bits
-            if len(valid_pulses) >= 40:
-                # On prend les 40 derniers pulses qui correspondent aux données
-                data_pulses = valid_pulses[-40:]
-                
-                for width in data_pulses:
-                    if width > 40: # C'est un 1
-                        data_bits.append(1)
-                    else:          # C'est un 0
-                        data_bits.append(0)
-                
-                # Convertir en octets
-                bytes_data = [0, 0, 0, 0, 0]
-                for i in range(40):
-                    byte_idx = i // 8
-                    bytes_data[byte_idx] = (bytes_data[byte_idx] << 1) | data_bits[i]
-                
-                # Vérifier le checksum
-                # DHT11 format: IntRH, DecRH, IntT, DecT, Checksum
-                checksum = (bytes_data[0] + bytes_data[1] + bytes_data[2] + bytes_data[3]) & 0xFF
-                
-                if bytes_data[4] == checksum:
-                    humidity = float(bytes_data[0]) + float(bytes_data[1])/10.0
-                    temperature = float(bytes_data[2]) + float(bytes_data[3])/10.0
-                    
-                    # Correction pour DHT11 standard qui n'a parfois pas de décimale
-                    if self.sensor_type is None: # Comportement générique
-                        pass 
-                        
-                    print(f"DHT11 (Pigpio): {temperature:.1f}°C, {humidity:.1f}%")
-                    return temperature, humidity, False
-                else:
-                    raise Exception("Checksum invalide")
-            else:
-                raise Exception("Pas assez de données reçues")
+            temperature, humidity = self.measure()
+            return temperature, humidity, False
 
         except Exception as e:
             print(f"Erreur lecture DHT (Pigpio): {str(e)}")
             return self._return_test_values()
+
+    def measure_all(self):
+        """Une mesure de tous les capteurs de self.sensors, déclenchés ensemble par un seul script pigpiod
+
+        Retourne {gpio: (température, humidité) ou DHTError}
+        """
+        if self.multi_reader is None:
+            self.multi_reader = MultiDHTReader(self.pi, self.sensors, DHT_ADAPTIVE)
+        results = self.multi_reader.read_all()
+        for pin, result in results.items():
+            if isinstance(result, DHTError):
+                print(f"DHT GPIO{pin}: {result}")
+                if self.log is not None:
+                    self.log.event('dht', result.cause or 'error', f"GPIO{pin}: {result}")
+            elif self.log is not None:
+                self.log.reading('dht', f"GPIO{pin}", *result)
+        return results
+
+    def measure(self):
+        """Une mesure. Retourne (température, humidité), lève une exception en cas d'échec"""
+        if self.capture_mode == 'daemon':
+            if self.daemon_capture is None:
+                self._open_daemon_capture()
+            if self.daemon_capture is not None:
+                # ~25ms : retour dès la réception du dernier bit
+                self.high_ticks = self.daemon_capture.capture(self.pin)
+                temperature, humidity = self.decode_pulses()
+                print(f"{self.sensor_type} (Pigpio): {temperature:.1f}°C, {humidity:.1f}%")
+                return temperature, humidity
+        
+        # Capture temporisée côté Python (~70ms)
+        self.high_ticks = []
+        self.last_tick = 0
+        if EDGE_INGESTION == 'notify':
+            self._notify_start()
+        
+        # 1. Signal de démarrage (MCU tire vers le bas > 18ms)
+        self.pi.set_mode(self.pin, pigpio.OUTPUT)
+        self.pi.write(self.pin, 0)
+        time.sleep(0.018) 
+        
+        # 2. Relâcher le bus (Pull up) et passer en écoute
+        self.pi.set_mode(self.pin, pigpio.INPUT)
+        self.pi.set_pull_up_down(self.pin, pigpio.PUD_UP)
+        
+        # 3. Enregistrer les transitions pendant 50ms (temps suffisant pour tout recevoir)
+        if EDGE_INGESTION == 'notify':
+            time.sleep(0.05)
+            self._notify_stop()
+        else:
+            cb_id = self.pi.callback(self.pin, pigpio.EITHER_EDGE, self._cb_dht)
+            time.sleep(0.05)
+            cb_id.cancel()
+        
+        # 4. Décoder les données
+        temperature, humidity = self.decode_pulses()
+        print(f"{self.sensor_type} (Pigpio): {temperature:.1f}°C, {humidity:.1f}%")
+        return temperature, humidity
             
     def _return_test_values(self):
         """Retourne des valeurs aléatoires pour le test"""
@@ -372,55 +1028,414 @@ class DHT11Reader:
         self.last_reading = (temperature, humidity)
         return temperature, humidity, True
 
-# --- BLEMonitor ---
-class BLEMonitor:
-    """Monitoring BLE avec File d'attente """
-    def __init__(self, target_name, interval=5):
-        self.target_name = target_name
-        self.interval = interval
+def _series_dir(name):
+    """Répertoire de l'historique d'un sous-système (None : en mémoire seulement)"""
+    return None if TIMESERIES_DIR is None else os.path.join(TIMESERIES_DIR, name)
+
+# Dernière mesure valide : timestamp = heure de la mesure (time.time()), age en secondes
+DHTReading = namedtuple('DHTReading', 'temperature humidity timestamp age')
+
+class DHTSampler:
+    """Échantillonnage du DHT en arrière-plan : l'affichage lit la dernière mesure sans jamais attendre le capteur
+
+    Une lecture toutes les interval secondes, jamais plus d'une par min_interval (limite du DHT11).
+    Après un échec (checksum, fronts manquants), nouvel essai avec une attente doublée à chaque échec.
+    Avec plusieurs capteurs (reader.sensors), tous sont lus ensemble (read_all) : une mesure et un
+    historique ("GPIO<n>/temperature", "GPIO<n>/humidity") par capteur ; échec si aucun ne répond.
+    """
+    
+    def __init__(self, reader, interval=DHT_INTERVAL, min_interval=DHT_MIN_INTERVAL, max_backoff=DHT_MAX_BACKOFF):
+        self.reader = reader
+        self.interval = max(interval, min_interval)
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self.on_update = None # Appelé (thread d'échantillonnage) après chaque nouvelle mesure valide
+        self.reads = 0
+        self.failures = 0     # Échecs consécutifs
+        self.total_failures = 0
+        self.last_error = None
+        self.sensors = reader.sensors if reader is not None else None
+        # Capteur de latest() : reader.pin, ou le premier de reader.sensors s'il n'en fait pas partie
+        self.primary = reader.pin if reader is not None else None
+        if self.sensors and self.primary not in self.sensors:
+            self.primary = next(iter(self.sensors))
+        self.sensor_failures = Counter() # {gpio: échecs consécutifs} (plusieurs capteurs)
+        self._readings = {}   # {gpio: (température, humidité, time.time(), time.monotonic())}
+        self.series = SeriesStore(_series_dir('dht')) # Historique : voies 'temperature' et 'humidity'
+        self._wake = threading.Event()
         self.running = False
         self.thread = None
-        # Création d'une file d'attente pour communiquer avec l'affichage principal
-        self.data_queue = queue.Queue()
         
-    async def _monitor(self):
-        if not BLE_AVAILABLE: return
-        print(f"BLE Scan démarré pour: {self.target_name}")
+    @property
+    def available(self):
+        """Capteur utilisable (la première consultation ouvre la connexion pigpio)"""
+        return self.reader is not None and self.reader.available
         
+    def latest(self, pin=None):
+        """Dernière mesure valide du capteur pin (défaut : self.primary) avec son âge (None si aucune). Ne bloque jamais"""
+        reading = self._readings.get(self.primary if pin is None else pin)
+        if reading is None:
+            return None
+        temperature, humidity, timestamp, measured = reading
+        return DHTReading(temperature, humidity, timestamp, time.monotonic() - measured)
+
+    def states(self):
+        """Dernières mesures de chaque capteur (SensorState, comme le registre BLE), dans l'ordre de reader.sensors"""
+        states = []
+        for pin, kind in (self.sensors or {self.primary: self.reader.sensor_type}).items():
+            reading = self._readings.get(pin)
+            if reading is not None:
+                states.append(SensorState(f"GPIO{pin}", f"{kind} GPIO{pin}", reading[0], reading[1],
+                                          None, None, reading[2], 0))
+        return states
+    
+    def request(self):
+        """Demande une mesure dès que le délai minimal du capteur le permet"""
+        self._wake.set()
+    
+    def _delay(self):
+        """Attente avant la prochaine lecture"""
+        if self.failures:
+            return min(self.min_interval * 2 ** (self.failures - 1), self.max_backoff)
+        return self.interval
+    
+    def _store(self, pin, temperature, humidity):
+        now = time.time()
+        self._readings[pin] = (temperature, humidity, now, time.monotonic())
+        prefix = f"GPIO{pin}/" if self.sensors else ""
+        self.series.add(f"{prefix}temperature", now, temperature)
+        self.series.add(f"{prefix}humidity", now, humidity)
+
+    def _measure(self):
+        """Une lecture (tous les capteurs ensemble si plusieurs). Lève une exception si aucune mesure n'est valide"""
+        if not self.sensors:
+            self._store(self.reader.pin, *self.reader.measure())
+            return
+        errors = []
+        for pin, result in self.reader.measure_all().items():
+            if isinstance(result, DHTError):
+                self.sensor_failures[pin] += 1
+                errors.append(f"GPIO{pin}: {result}")
+            else:
+                self.sensor_failures[pin] = 0
+                self._store(pin, *result)
+        if len(errors) == len(self.sensors):
+            raise DHTError(", ".join(errors))
+
+    def _run(self):
+        if not self.available: # Connexion pigpio ouverte ici : le lancement n'attend pas le démon
+            self.running = False
+            return
         while self.running:
+            start = time.monotonic()
+            self.reads += 1
             try:
-                devices = await BleakScanner.discover(timeout=3)
-                found = False
-                for d in devices:
-                    if d.name and self.target_name in d.name:
-                        found = True
-                        try:
-                            parts = d.name.split('|')
-                            if len(parts) == 5:
-                                temp = float(parts[1])
-                                hum = float(parts[2])
-                                name = parts[0]
-                                # Au lieu de print, on met dans la file d'attente
-                                self.data_queue.put((name, temp, hum))
-                                print(f"Donnée reçue: {temp}°C {hum}%")
-                        except:
-                            pass
-                        break
-                if not found:
-                    print(".", end="", flush=True) # Indicateur de vie console
+                with TRACER.span('dht_capture', 'dht', mode=self.reader.capture_mode):
+                    self._measure()
             except Exception as e:
-                print(f"Err BLE: {e}")
-            await asyncio.sleep(self.interval)
+                self.failures += 1
+                self.total_failures += 1
+                self.last_error = str(e)
+                print(f"Erreur lecture DHT (Pigpio): {e} (essai suivant dans {self._delay():.1f}s)")
+            else:
+                self.failures = 0
+                if self.on_update is not None:
+                    self.on_update()
+            
+            # Une demande (request) écourte l'attente, mais jamais sous le délai minimal du capteur
+            self._wake.wait(max(0.0, start + self._delay() - time.monotonic()))
+            self._wake.clear()
+            remaining = start + self.min_interval - time.monotonic()
+            if remaining > 0 and self.running:
+                time.sleep(remaining)
     
     def start(self):
+        if self.running or self.reader is None:
+            return
         self.running = True
-        self.thread = threading.Thread(target=lambda: asyncio.run(self._monitor()), daemon=True)
+        self.thread = threading.Thread(target=self._run, name="dht-sampler", daemon=True)
         self.thread.start()
     
     def stop(self):
+        if not self.running:
+            return
         self.running = False
+        self._wake.set()
+        self.thread.join(timeout=2)
+        self.thread = None
+    
+    def close(self):
+        """Arrête l'échantillonnage et libère le capteur"""
+        self.stop()
+        self.series.close()
+        if self.reader is not None:
+            self.reader.close()
+
+# --- BLEMonitor ---
+class BLEMonitor:
+    """Monitoring BLE multi-capteurs
+
+    Un scanner permanent (detection_callback) tourne sur une boucle asyncio réutilisée :
+    chaque annonce est traitée dès sa réception. start() / stop() sont idempotents.
+    Les mesures alimentent un registre indexé par adresse (dernière valeur + historique borné).
+    """
+    def __init__(self, target_name, backend='bleak', company_id=0xFFFF, service_uuid=None, addresses=None,
+                 max_sensors=64, history_size=32):
+        self.target_name = target_name
+        self.company_id = company_id
+        self.service_uuid = service_uuid
+        self.addresses = addresses
+        self.max_sensors = max_sensors
+        self.payloads = self._payload_reader()
+        self.backend = BACKENDS[backend]
+        self.available = self.backend.available
+        self.running = False
+        self.scanner = None
+        self.loop_thread = LoopThread()
+        self._lock = threading.Lock()
+        # Registre partagé avec l'affichage principal (remplace la file d'attente non bornée)
+        self.registry = SensorRegistry(max_sensors, history_size)
+        # Historique long par capteur : voies "<adresse>/temperature" et "<adresse>/humidity"
+        self.series = SeriesStore(_series_dir('ble'), max_channels=2 * max_sensors)
+        self.on_data = None # Appelé à la première donnée non lue (réveil de la boucle d'événements)
+        self.log = None # Journal SQLite (SensorLog)
+        self.received = 0
+        self.last_timestamp = 0.0
+        self.latency_total = 0.0 # Réception de l'annonce -> donnée dans le registre (s)
+        
+    def _payload_reader(self):
+        """Lecteur de charges utiles binaires : mêmes capteurs que le format nom (target_name) ou liste blanche"""
+        return PayloadReader(self.company_id, self.service_uuid, self.target_name, self.addresses, self.max_sensors)
+
+    def _on_advertisement(self, adv):
+        """Callback du scanner (thread de la boucle asyncio) : une annonce reçue"""
+        with TRACER.span('ble_advertisement', 'ble'):
+            self._read_advertisement(adv)
+    
+    def _read_advertisement(self, adv):
+        """Extrait la mesure d'une annonce (charge utile binaire ou nom)"""
+        # 1. Charge utile binaire (aucune chaîne construite, doublons éliminés par numéro de séquence)
+        reading = self.payloads.read(adv)
+        if reading is not None:
+            if reading is not DUPLICATE:
+                self._publish(adv, adv.name or adv.address, reading[0], reading[1], reading[2])
+            return
+        
+        # 2. Ancien format : données dans le nom "Nom|temp|hum|..."
+        if not adv.name or self.target_name not in adv.name:
+            return
+        parts = adv.name.split('|')
+        if len(parts) == 5:
+            try:
+                temp = float(parts[1])
+                hum = float(parts[2])
+            except ValueError:
+                return
+            self._publish(adv, parts[0], temp, hum)
+            
+    def _publish(self, adv, name, temp, hum, battery=None):
+        """Transmet une mesure à l'affichage"""
+        self.received += 1
+        self.last_timestamp = adv.timestamp
+        # Les mesures non encore affichées sont remplacées : un seul réveil par lecture du registre
+        wake = self.registry.update(adv.address, name, temp, hum, battery, adv.rssi, adv.timestamp)
+        now = time.time()
+        self.series.add(f"{adv.address}/temperature", now, temp)
+        self.series.add(f"{adv.address}/humidity", now, hum)
+        if self.log is not None:
+            self.log.reading('ble', adv.address, temp, hum)
+        self.latency_total += time.monotonic() - adv.timestamp
+        print(f"Donnée reçue: {name} {temp}°C {hum}%")
+        if wake and self.on_data is not None:
+            self.on_data()
+    
+    def start(self):
+        with self._lock:
+            if self.running or not self.available:
+                return
+            print(f"BLE Scan démarré pour: {self.target_name}")
+            # Nouvelle session : les capteurs ont pu redémarrer (numéros de séquence repartis de 0)
+            self.payloads = self._payload_reader()
+            self.scanner = self.backend(self._on_advertisement)
+            try:
+                with TRACER.span('ble_scan_start', 'ble'):
+                    self.loop_thread.call(self.scanner.start())
+            except Exception as e:
+                print(f"Err BLE: {e}")
+                self.scanner = None
+                return
+            self.running = True
+    
+    def stop(self):
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+            try:
+                with TRACER.span('ble_scan_stop', 'ble'):
+                    self.loop_thread.call(self.scanner.stop())
+            except Exception as e:
+                print(f"Err BLE: {e}")
+            self.scanner = None
+
+    def close(self):
+        """Arrête le scan et la boucle asyncio"""
+        self.stop()
+        self.loop_thread.close()
+        self.series.close()
+
+    def mean_latency_ms(self):
+        return self.latency_total * 1000 / self.received if self.received else 0.0
 
 # --- JEU SNAKE ---
+class SnakeState:
+    """État du Snake sur une grille d'entiers : coût constant par tour, quelle que soit la longueur"""
+    
+    def __init__(self, cols, rows, rng=random):
+        self.cols = cols
+        self.rows = rows
+        self.rng = rng
+        size = cols * rows
+        self.occupied = bytearray(size)   # 1 si la case est occupée par le serpent
+        self.free = array('I', range(size))      # Cases libres (tirage uniforme de la pomme en O(1))
+        self.free_index = array('I', range(size)) # Position de chaque case dans self.free
+        self.body = deque()                # Cases du serpent, la tête à droite
+        
+        start = (rows // 2) * cols + cols // 2
+        self._occupy(start)
+        self.body.append(start)
+        self.food = self._spawn_food()
+        
+    def _occupy(self, cell):
+        """Retire une case de l'ensemble libre (échange avec la dernière)"""
+        free = self.free
+        i = self.free_index[cell]
+        last = free[-1]
+        free[i] = last
+        self.free_index[last] = i
+        free.pop()
+        self.occupied[cell] = 1
+        
+    def _release(self, cell):
+        """Remet une case dans l'ensemble libre"""
+        self.free_index[cell] = len(self.free)
+        self.free.append(cell)
+        self.occupied[cell] = 0
+        
+    def _spawn_food(self):
+        """Place la pomme sur une case libre tirée uniformément (None si la grille est pleine)"""
+        if not self.free:
+            return None
+        return self.free[self.rng.randrange(len(self.free))]
+    
+    @property
+    def length(self):
+        return len(self.body)
+    
+    def step(self, dx, dy):
+        """Avance d'une case. Retourne (tête, queue effacée ou None, pomme mangée) ou None si perdu"""
+        head = self.body[-1]
+        x = head % self.cols + dx
+        y = head // self.cols + dy
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return None # Limites écran
+        new = y * self.cols + x
+        
+        ate = new == self.food
+        tail = None
+        if not ate:
+            # La queue avance en même temps : la tête peut prendre sa place
+            tail = self.body.popleft()
+            self._release(tail)
+        if self.occupied[new]:
+            return None # Collision avec soi-même
+        self._occupy(new)
+        self.body.append(new)
+        if ate:
+            self.food = self._spawn_food()
+        return new, tail, ate
+
+class InputBuffer:
+    """File des virages du Snake : tous les événements clavier et codes IR sont conservés"""
+    
+    DIRECTIONS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+    KEY_ACTIONS = None # Touche pygame -> action, construit à la première partie (pygame chargé à ce moment)
+    
+    def __init__(self, code_queue=None, max_turns=SNAKE_INPUT_QUEUE):
+        if InputBuffer.KEY_ACTIONS is None:
+            InputBuffer.KEY_ACTIONS = {
+                pygame.K_UP: 'UP',
+                pygame.K_DOWN: 'DOWN',
+                pygame.K_LEFT: 'LEFT',
+                pygame.K_RIGHT: 'RIGHT',
+                pygame.K_q: 'q',
+            }
+        self.code_queue = code_queue
+        self.max_turns = max_turns
+        self.turns = deque()     # (dx, dy, horodatage de réception)
+        self.direction = (0, 0)  # Direction appliquée au dernier déplacement
+        self.quit = False
+        self.dropped = 0         # Virages ignorés (file pleine)
+        # Latence entrée -> déplacement
+        self.latency_count = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        
+    def poll(self):
+        """Vide toutes les entrées en attente (pygame + file IR)"""
+        now = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit = True
+            elif event.type == pygame.KEYDOWN:
+                action = self.KEY_ACTIONS.get(event.key)
+                if action:
+                    # Horodatage d'origine si l'événement en porte un (injection synthétique)
+                    self.push(action, getattr(event, 'stamp', now))
+        
+        if self.code_queue is not None:
+            while True:
+                try:
+                    code, edge, _ = self.code_queue.get_nowait()
+                except queue.Empty:
+                    break
+                action = REMOTE_KEY_MAP.get(code)
+                if action:
+                    self.push(action, edge) # Latence mesurée depuis le dernier front de la trame
+                    
+    def push(self, action, stamp):
+        """Ajoute un virage (les demi-tours et doublons par rapport au précédent sont filtrés)"""
+        if action == 'q':
+            self.quit = True
+            return
+        turn = self.DIRECTIONS.get(action)
+        if turn is None:
+            return
+        last = self.turns[-1][:2] if self.turns else self.direction
+        if turn == last or (turn[0] == -last[0] and turn[1] == -last[1]):
+            return # Même axe que la direction précédente
+        if len(self.turns) >= self.max_turns:
+            self.dropped += 1
+            return
+        self.turns.append((turn[0], turn[1], stamp))
+        
+    def next_direction(self):
+        """Applique au plus un virage par déplacement et retourne la direction"""
+        if self.turns:
+            dx, dy, stamp = self.turns.popleft()
+            self.direction = (dx, dy)
+            latency = time.perf_counter() - stamp
+            self.latency_count += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+        return self.direction
+    
+    def latency_report(self):
+        if not self.latency_count:
+            return "Latence entrée -> déplacement : aucune mesure"
+        return (f"Latence entrée -> déplacement : moy {self.latency_total / self.latency_count * 1000:.1f} ms,"
+                f" max {self.latency_max * 1000:.1f} ms ({self.latency_count} virages, {self.dropped} ignorés)")
+
 class SnakeGame:
     """Jeu du Snake simple intégré"""
     def __init__(self, display):
@@ -438,99 +1453,170 @@ class SnakeGame:
         """Boucle principale du jeu Snake"""
         print("Démarrage du Snake...")
         
-        # Init variables
-        game_over = False
-        x = self.width / 2
-        y = self.height / 2
+        # Grille à la taille actuelle de la fenêtre
+        self.width, self.height = self.display.screen.get_size()
+        state = SnakeState(self.width // self.block_size, self.height // self.block_size)
+        dx = dy = 0
         
-        x_change = 0
-        y_change = 0
-        
-        snake_list = []
-        snake_length = 1
-        
-        # Nourriture
-        foodx = round(random.randrange(0, self.width - self.block_size) / 20.0) * 20.0
-        foody = round(random.randrange(0, self.height - self.block_size) / 20.0) * 20.0
+        # Première image complète, ensuite seulement les cases modifiées
+        self.display.screen.fill(self.c_bg)
+        self.draw_cell(state, state.body[-1], self.c_snake)
+        self.draw_cell(state, state.food, self.c_food)
+        self.show_score(state, 0)
+        self.display.mark_full()
+        self.display.present()
         
         clock = pygame.time.Clock()
+        inputs = InputBuffer(getattr(input_controller_ref, 'code_queue', None))
+        next_move = time.perf_counter() + SNAKE_TICK
         
-        while not game_over:
-            # 1. Gestion des entrées (IR et Clavier unifié)
-            # On vérifie les inputs disponibles
-            action = input_controller_ref._get_input_action()
-            
-            if action == 'q':
-                return # Quitter le jeu
-            elif action == 'LEFT' and x_change == 0:
-                x_change = -self.block_size
-                y_change = 0
-            elif action == 'RIGHT' and x_change == 0:
-                x_change = self.block_size
-                y_change = 0
-            elif action == 'UP' and y_change == 0:
-                y_change = -self.block_size
-                x_change = 0
-            elif action == 'DOWN' and y_change == 0:
-                y_change = self.block_size
-                x_change = 0
-            
-            # 2. Logique de mouvement
-            x += x_change
-            y += y_change
-            
-            # Limites écran
-            if x >= self.width or x < 0 or y >= self.height or y < 0:
-                self.show_message("Game Over! Appuyez sur Q", (255, 0, 0))
-                time.sleep(2)
-                return
-            
-            self.display.screen.fill(self.c_bg)
-            
-            # Dessin Pomme
-            pygame.draw.rect(self.display.screen, self.c_food, [foodx, foody, self.block_size, self.block_size])
-            
-            # Dessin Snake
-            snake_head = []
-            snake_head.append(x)
-            snake_head.append(y)
-            snake_list.append(snake_head)
-            
-            if len(snake_list) > snake_length:
-                del snake_list[0]
+        profiler = getattr(input_controller_ref, 'profiler', None)
+        try:
+            while True:
+                # Mode --profile : chaque image (entrées, déplacement, dessin) est profilée
+                with profiler.frame() if profiler is not None else nullcontext():
+                    # 1. Gestion des entrées (IR et Clavier unifié), lues à SNAKE_INPUT_HZ
+                    inputs.poll()
+                    if inputs.quit:
+                        return # Quitter le jeu
                 
-            # Collision avec soi-même
-            for x_segment in snake_list[:-1]:
-                if x_segment == snake_head:
-                    self.show_message("Game Over! Appuyez sur Q", (255, 0, 0))
-                    time.sleep(2)
-                    return
-            
-            self.draw_snake(snake_list)
-            self.show_score(snake_length - 1)
-            pygame.display.update()
+                    # 2. Logique de mouvement, cadencée à SNAKE_TICK (le serpent attend la première direction)
+                    now = time.perf_counter()
+                    if now >= next_move:
+                        next_move += SNAKE_TICK
+                        if next_move < now:
+                            next_move = now + SNAKE_TICK # Retard (fenêtre déplacée...) : pas de rattrapage
+                        dx, dy = inputs.next_direction()
+                        if dx or dy:
+                            moved = state.step(dx, dy)
+                            if moved is None:
+                                self.show_message("Game Over! Appuyez sur Q", (255, 0, 0))
+                                time.sleep(2)
+                                return
+                        
+                            # 3. Dessin : tête ajoutée, queue effacée, nouvelle pomme
+                            head, tail, ate = moved
+                            if tail is not None:
+                                self.draw_cell(state, tail, self.c_bg)
+                            self.draw_cell(state, head, self.c_snake)
+                            if ate:
+                                if state.food is not None:
+                                    self.draw_cell(state, state.food, self.c_food)
+                                self.show_score(state, state.length - 1)
+                            self.display.present()
+                    
+                clock.tick(SNAKE_INPUT_HZ)
+        finally:
+            print(inputs.latency_report())
+            if profiler is not None:
+                profiler.save_frames('snake')
             
-            # Manger la pomme
-            if x == foodx and y == foody:
-                foodx = round(random.randrange(0, self.width - self.block_size) / 20.0) * 20.0
-                foody = round(random.randrange(0, self.height - self.block_size) / 20.0) * 20.0
-                snake_length += 1
-                
-            clock.tick(10) # Vitesse du serpent
+    def cell_rect(self, state, cell):
+        return (cell % state.cols * self.block_size, cell // state.cols * self.block_size,
+                self.block_size, self.block_size)
             
-    def draw_snake(self, snake_list):
-        for x in snake_list:
-            pygame.draw.rect(self.display.screen, self.c_snake, [x[0], x[1], self.block_size, self.block_size])
+    def draw_cell(self, state, cell, color):
+        rect = self.cell_rect(state, cell)
+        self.display.screen.fill(color, rect)
+        self.display.mark_dirty(rect)
             
     def show_message(self, msg, color):
-        mesg = self.display.font.render(msg, True, color)
+        mesg = self.display.text(self.display.font, msg, color)
         rect = mesg.get_rect(center=(self.width/2, self.height/2))
         self.display.screen.blit(mesg, rect)
-        pygame.display.update()
+        self.display.mark_dirty(rect)
+        self.display.present()
         
-    def show_score(self, score):
-        value = self.display.small_font.render("Score: " + str(score), True, self.c_text)
+    def show_score(self, state, score):
+        value = self.display.text(self.display.small_font, "Score: " + str(score), self.c_text)
+        # Zone du score : fond effacé puis cases du serpent situées dessous redessinées
+        rect = pygame.Rect(0, 0, max(150, value.get_width()), value.get_height())
+        self.display.screen.fill(self.c_bg, rect)
+        bs = self.block_size
+        for y in range(min(state.rows, (rect.bottom + bs - 1) // bs)):
+            for x in range(min(state.cols, (rect.right + bs - 1) // bs)):
+                cell = y * state.cols + x
+                if state.occupied[cell]:
+                    self.display.screen.fill(self.c_snake, self.cell_rect(state, cell))
+                elif cell == state.food:
+                    self.display.screen.fill(self.c_food, self.cell_rect(state, cell))
         self.display.screen.blit(value, [0, 0])
+        self.display.mark_dirty(rect.union((0, 0, (rect.right + bs - 1) // bs * bs, (rect.bottom + bs - 1) // bs * bs)))
+
+# --- EVENT LOOP ---
+class EventLoop:
+    """Boucle d'événements unique basée sur la file d'événements pygame
+
+    Le thread principal dort dans pygame.event.wait() : il est réveillé immédiatement par
+    le clavier, par les autres threads (codes IR, données BLE) via wake(), ou par la
+    prochaine minuterie. Aucune attente active.
+    """
+    
+    def __init__(self):
+        self.wake_type = pygame.USEREVENT + 1 # Type des réveils postés par un autre thread (IR, BLE)
+        self.timers = []               # Tas (échéance, n°, callback, période ou None)
+        self._seq = itertools.count()
+        self.cancelled = set()
+        self.wakeups = 0
+        self.started = time.monotonic()
+        
+    def wake(self, source):
+        """Réveille la boucle depuis n'importe quel thread (source : 'ir', 'ble', ...)"""
+        try:
+            pygame.event.post(pygame.event.Event(self.wake_type, source=source))
+        except pygame.error:
+            pass # File d'événements pleine : la boucle se réveillera de toute façon
+        
+    def call_later(self, delay, callback, interval=None):
+        """Programme callback() dans delay secondes (puis toutes les interval secondes si donné)"""
+        handle = next(self._seq)
+        heapq.heappush(self.timers, (time.monotonic() + delay, handle, callback, interval))
+        return handle
+    
+    def call_every(self, interval, callback):
+        return self.call_later(interval, callback, interval)
+    
+    def cancel(self, handle):
+        self.cancelled.add(handle)
+        
+    def _run_timers(self):
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            deadline, handle, callback, interval = heapq.heappop(self.timers)
+            if handle in self.cancelled:
+                self.cancelled.discard(handle)
+                continue
+            if interval is not None:
+                heapq.heappush(self.timers, (max(deadline + interval, now), handle, callback, interval))
+            callback()
+            
+    def wait(self, timeout=None):
+        """Dort jusqu'au prochain événement, minuterie ou timeout. Retourne les événements pygame"""
+        delay = timeout
+        if self.timers:
+            until_timer = self.timers[0][0] - time.monotonic()
+            delay = until_timer if delay is None else min(delay, until_timer)
+            
+        if delay is None:
+            first = pygame.event.wait()
+        elif delay > 0:
+            # Arrondi supérieur : un réveil en avance ferait tourner la boucle à vide
+            first = pygame.event.wait(math.ceil(delay * 1000))
+        else:
+            first = pygame.event.poll() # Échéance déjà atteinte (wait(0) bloquerait indéfiniment)
+            
+        self.wakeups += 1
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events.extend(pygame.event.get())
+        self._run_timers()
+        return events
+    
+    def wakeup_rate(self):
+        """Réveils par seconde depuis la création de la boucle"""
+        return self.wakeups / max(time.monotonic() - self.started, 1e-6)
+    
+    def report(self):
+        print(f"Boucle d'événements : {self.wakeups} réveils, {self.wakeup_rate():.2f} réveils/s")
 
 # --- INPUT CONTROLLER ---
 class InputController:
@@ -543,6 +1629,40 @@ class InputController:
         self.ble_active = False
         self.running = True
         self.snake_game = SnakeGame(display)
+        self.loop = EventLoop()
+        # Le capteur DHT est lu en continu en arrière-plan (touche 4 : affichage immédiat)
+        self.dht_sampler = DHTSampler(dht_reader)
+        self.dht_sampler.start()
+        self.log = None # Journal SQLite (SensorLog) : commandes traitées
+        self.input_stamps = None # (dernier front, sortie de file) du code IR en cours de traitement
+        self.profiler = None # CommandProfiler (mode --profile)
+        self.metrics = MetricsRegistry()
+        self._setup_metrics()
+        
+    def hud_sources(self):
+        """Valeurs affichées par le HUD (--hud) : profondeur des files et état des capteurs"""
+        sources = []
+        if hasattr(self, 'code_queue'):
+            sources.append(("file IR", self.code_queue.qsize))
+        if self.ble_monitor is not None:
+            sources.append(("capteurs BLE", lambda: len(self.ble_monitor.registry)))
+        if self.log is not None:
+            sources.append(("journal", lambda: len(self.log.pending)))
+        return sources
+    
+    def _setup_metrics(self):
+        """Latences des commandes et compteurs d'échecs exportés par MetricsServer"""
+        metrics = self.metrics
+        self.command_latency = metrics.histogram(
+            'ircmrpi_command_to_frame_seconds', "Début de process_command -> mise à jour de l'écran qui suit")
+        self.dispatch_latency = metrics.histogram(
+            'ircmrpi_ir_dequeue_to_command_seconds', "Code IR sorti de la file -> début de process_command")
+        self.end_to_end_latency = metrics.histogram(
+            'ircmrpi_ir_edge_to_frame_seconds', "Dernier front de la trame IR -> mise à jour de l'écran")
+        self.commands = metrics.counter('ircmrpi_commands_total', "Commandes traitées")
+        if self.dht_reader is not None:
+            metrics.counter_func('ircmrpi_dht_decode_failures_total', "Trames DHT inexploitables par cause",
+                                 self.dht_reader.failure_counts, label='cause')
         
     def handle_key(self, key):
         """Traite les touches (à implémenter par les sous-classes)"""
@@ -554,106 +1674,136 @@ class InputController:
         
     def cleanup(self):
         """Nettoyage"""
-        if self.ble_active:
-            self.ble_monitor.stop()
+        self.dht_sampler.close()
+        self.ble_monitor.close()
         self.display.clear_screen()
         
-    def _check_any_key_press(self):
-        """Vérifie si une touche est pressée (Clavier ou IR)"""
+    def _is_key_press(self, events):
+        """Indique si les événements contiennent une touche (Clavier ou IR)"""
+        pressed = False
         # 1. Vérification Clavier
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.KEYDOWN or event.type == pygame.QUIT:
-                return True
-        
-        # 2. Vérification IR (Si file d'attente existante)
-        if hasattr(self, 'code_queue') and not self.code_queue.empty():
-            try:
-                self.code_queue.get_nowait() # On consomme l'événement
-                return True
-            except queue.Empty:
-                pass
+                pressed = True
         
-        return False
-
-    def _get_input_action(self):
-        """Récupère la prochaine action (Clavier ou IR) pour le jeu"""
-        # 1. Clavier
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: return 'q'
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP: return 'UP'
-                elif event.key == pygame.K_DOWN: return 'DOWN'
-                elif event.key == pygame.K_LEFT: return 'LEFT'
-                elif event.key == pygame.K_RIGHT: return 'RIGHT'
-                elif event.key == pygame.K_q: return 'q'
-        
-        # 2. IR (si disponible)
+        # 2. Vérification IR (Si file d'attente existante) : on consomme les codes reçus
         if hasattr(self, 'code_queue'):
-            try:
-                # On ne bloque pas pour ne pas figer le jeu
-                code = self.code_queue.get_nowait()
-                if code in REMOTE_KEY_MAP:
-                    return REMOTE_KEY_MAP[code]
-            except queue.Empty:
-                pass
+            while True:
+                try:
+                    self.code_queue.get_nowait()
+                    pressed = True
+                except queue.Empty:
+                    break
         
-        return None
+        return pressed
+
+    def _wait_key_press(self):
+        """Dort jusqu'à l'appui d'une touche (Clavier ou IR), les minuteries restent actives"""
+        while not self._is_key_press(self.loop.wait()):
+            pass
 
     def process_command(self, key):
+        """Traite une commande et mesure sa latence jusqu'à la mise à jour de l'écran qui suit"""
+        start = time.perf_counter()
+        self.commands.inc()
+        stamps, self.input_stamps = self.input_stamps, None
+        edge = None
+        if stamps is not None:
+            edge, dequeued = stamps
+            self.dispatch_latency.observe(start - dequeued)
+        
+        def frame_shown(shown):
+            self.command_latency.observe(shown - start)
+            if edge is not None:
+                self.end_to_end_latency.observe(shown - edge)
+        
+        self.display.on_frame = frame_shown
+        try:
+            with TRACER.span(f"command {key}", 'command'):
+                if self.profiler is not None:
+                    return self.profiler.run(f"command-{key}", self._process_command, key)
+                return self._process_command(key)
+        finally:
+            self.display.on_frame = None # Commande sans affichage : rien n'est mesuré
+    
+    def _process_command(self, key):
         """Traite une commande (commun aux deux modes)"""
         print(f"Commande: {key}")
+        if self.log is not None:
+            self.log.event('command', key)
         
         # Arrêter le monitoring BLE si actif
         if self.ble_active:
             self.ble_monitor.stop()
             self.ble_active = False
-            time.sleep(1)
         
         if key in ['1', '2', '3']: # Touche des images
             # Afficher l'image correspondante
             image_path = IMAGE_PATHS.get(key)
-            if image_path and os.path.exists(image_path):
+            if image_path: # L'existence du fichier est vérifiée par le cache d'images
                 self.display.display_image(image_path)
             else:
                 self.display.display_error(f"Image non trouvée pour {key}")
                 
         elif key == '4': # Touche 4 du clavier
-            # Lire et afficher données DHT11 avec timeout de 5s
-            start = time.time()
-            temperature = humidity = None
-            is_test = False
-
-            while time.time() - start < 1:
-                t, h, test = self.dht_reader.read()
-                if not test:   # vraie donnée
-                    temperature, humidity, is_test = t, h, False
-                    break
-                time.sleep(0.5)
-
-            # Si aucune donnée réelle après le timeout → mode test en continu
-            if temperature is None:
-                print("Aucun signal DHT après attente → Mode test activé")
-                is_test = True
+            sampler = self.dht_sampler
+            # Sans capteur → mode test en continu
+            if not sampler.available:
+                print("Capteur DHT non disponible → Mode test activé")
 
-                # boucle d’affichage test toutes les 3 secondes
-                while True:
+                # affichage test toutes les 3 secondes (minuterie de la boucle d'événements)
+                def refresh():
                     temperature = round(random.uniform(18.0, 25.0), 1)
                     humidity = round(random.uniform(40.0, 70.0), 1)
-
                     self.display.display_dht_data(temperature, humidity, True)
 
-                    # sortir si une touche est pressée (clavier ou IR via queue)
-                    if self._check_any_key_press():
-                        return True
-                    
-                    time.sleep(3)
+                refresh()
+                timer = self.loop.call_every(3, refresh)
+                # sortir dès qu'une touche est pressée (clavier ou IR via queue)
+                self._wait_key_press()
+                self.loop.cancel(timer)
+                return True
+
+            # Affichage immédiat de la dernière mesure en cache, mis à jour à chaque nouvelle mesure
+            shown_failures = None # Échecs affichés : l'erreur n'est redessinée qu'à chaque nouvel échec
+
+            def refresh():
+                nonlocal shown_failures
+                states = sampler.states()
+                if not states:
+                    if sampler.failures < DHT_FAILURE_LIMIT:
+                        self.display.display_info("Mesure DHT en cours...")
+                    elif sampler.total_failures != shown_failures:
+                        # Le capteur ne répond pas : nouvel essai en arrière-plan, l'écran affichera la mesure dès qu'elle arrive
+                        shown_failures = sampler.total_failures
+                        self.display.display_error(f"DHT : {sampler.last_error} ({sampler.total_failures} échecs)")
+                elif sampler.sensors:
+                    # Plusieurs capteurs (DHT_SENSORS) : une carte par capteur ayant déjà une mesure valide
+                    self.display.display_sensor_dashboard(states, time.time(), "CAPTEURS DHT",
+                                                          "Appuyez sur une touche pour revenir")
+                else:
+                    reading = sampler.latest()
+                    self.display.display_dht_data(reading.temperature, reading.humidity, False,
+                                                  timestamp=reading.timestamp, age=reading.age,
+                                                  series=sampler.series)
 
-            # Affichage normal si donnée réelle obtenue
-            self.display.display_dht_data(temperature, humidity, is_test)
+            sampler.on_update = lambda: self.loop.wake('dht')
+            if not sampler.states():
+                sampler.request()
+            refresh()
+            timer = self.loop.call_every(1, refresh) # Âge de la mesure
+            while True:
+                events = self.loop.wait()
+                if self._is_key_press(events):
+                    break
+                if any(event.type == self.loop.wake_type and event.source == 'dht' for event in events):
+                    refresh()
+            self.loop.cancel(timer)
+            sampler.on_update = None
       
             
         elif key == '5': # Touche 5 du clavier
-            if not BLE_AVAILABLE:
+            if not self.ble_monitor.available:
                 self.display.display_error("BLE non disponible")
                 return True
 
@@ -662,35 +1812,42 @@ class InputController:
             
             # Boucle d'affichage dédiée au BLE (bloque le menu, affiche les data)
             in_ble_mode = True
-            last_update = 0
+            registry = self.ble_monitor.registry
+            shown = -1 # Version du registre affichée
+            
+            def refresh():
+                """Affiche l'état le plus récent de tous les capteurs"""
+                nonlocal shown
+                version, states = registry.snapshot()
+                if not states:
+                    return
+                if len(states) == 1:
+                    if version != shown:
+                        state = states[0]
+                        self.display.display_ble_data(state.name, state.temperature, state.humidity,
+                                                      series=self.ble_monitor.series, address=state.address)
+                else:
+                    self.display.display_ble_dashboard(states, time.monotonic()) # Âges mis à jour
+                shown = version
             
-            # On vide la file avant de commencer
-            while not self.ble_monitor.data_queue.empty():
-                self.ble_monitor.data_queue.get()
+            # Nouvelle donnée : un réveil de la boucle d'événements, âges rafraîchis chaque seconde
+            self.ble_monitor.on_data = lambda: self.loop.wake('ble')
+            timer = self.loop.call_every(1, refresh)
+            refresh()
 
             while in_ble_mode:
-                # 1. Vérifier si nouvelles données BLE
-                try:
-                    # On regarde la queue sans bloquer
-                    data = self.ble_monitor.data_queue.get(block=False)
-                    name, t, h = data
-                    # CORRECTIF: Appel de la méthode display_ble_data qui manquait
-                    self.display.display_ble_data(name, t, h)
-                    last_update = time.time()
-                except queue.Empty:
-                    pass
+                events = self.loop.wait()
 
-                # 2. Gestion du timeout visuel (si pas de données)
-                if time.time() - last_update > 10 and last_update != 0:
-                     # Optionnel : afficher "Perte de signal" si besoin
-                     pass
+                # 1. Nouvelles données BLE (dernière valeur de chaque capteur, sans file à vider)
+                if any(event.type == self.loop.wake_type and event.source == 'ble' for event in events):
+                    refresh()
 
-                # 3. Vérifier si l'utilisateur veut quitter (IR ou Clavier)
-                if self._check_any_key_press():
+                # 2. Vérifier si l'utilisateur veut quitter (IR ou Clavier)
+                if self._is_key_press(events):
                     in_ble_mode = False
-                
-                time.sleep(0.1)
             
+            self.loop.cancel(timer)
+            self.ble_monitor.on_data = None
             # Arrêt du monitoring quand on quitte l'écran
             self.ble_monitor.stop()
             self.display.display_info("Arrêt du monitoring BLE")
@@ -702,17 +1859,29 @@ class InputController:
             self.snake_game.run_game(self)
             self.display.clear_screen()
 
+        elif key == 't': # Trace des derniers intervalles (TRACE_ENABLED)
+            if TRACER.enabled:
+                self.display.display_info(f"Trace: {dump_trace()}")
+            else:
+                self.display.display_info("Trace désactivée (TRACE_ENABLED)")
         elif key in ['q', 'Q', 'escape']: return False # Quitter le jeu
         elif key == 'h': self.display_help() # Retourner au menu d'aide
         return True
     
     def display_help(self):
         """Affiche l'aide"""
-        self.display.screen.fill((30, 30, 60))
+        # Écran entièrement statique : composé une seule fois puis simplement copié
+        self.display.static_layer('help', self._draw_help)
+        self.display.present()
+        time.sleep(0.5)  # Petite pause pour éviter les appuis accidentels
+
+    def _draw_help(self, surface):
+        """Compose l'écran d'aide sur un calque"""
+        display = self.display
+        surface.fill((30, 30, 60))
         
-        title_text = self.display.font.render("AIDE - TOUCHES DISPONIBLES", True, (255, 255, 200))
-        title_rect = title_text.get_rect(center=(self.display.screen.get_width()//2, 80))
-        self.display.screen.blit(title_text, title_rect)
+        display.draw_text(surface, display.font, "AIDE - TOUCHES DISPONIBLES", (255, 255, 200),
+                           center=(surface.get_width()//2, 80))
         
         # Affichage du texte du menu aide  
         commands = [
@@ -726,74 +1895,91 @@ class InputController:
         
         y_pos = 150
         for key, desc in commands:
-            key_text = self.display.font.render(key, True, (100, 255, 100))
-            key_rect = key_text.get_rect(topleft=(200, y_pos))
-            self.display.screen.blit(key_text, key_rect)
-            
-            desc_text = self.display.small_font.render(desc, True, (200, 200, 255))
-            desc_rect = desc_text.get_rect(topleft=(350, y_pos + 5))
-            self.display.screen.blit(desc_text, desc_rect)
-            
+            display.draw_text(surface, display.font, key, (100, 255, 100), topleft=(200, y_pos))
+            display.draw_text(surface, display.small_font, desc, (200, 200, 255), topleft=(350, y_pos + 5))
             y_pos += 60
         
         # Instructions pour retour
-        back_text = self.display.small_font.render("Appuyez sur n'importe quelle touche pour continuer", 
-                                                  True, (150, 150, 150))
-        back_rect = back_text.get_rect(center=(self.display.screen.get_width()//2, 
-                                             self.display.screen.get_height() - 50))
-        self.display.screen.blit(back_text, back_rect)
-        
-        pygame.display.flip()
-        time.sleep(0.5)  # Petite pause pour éviter les appuis accidentels
+        display.draw_text(surface, display.small_font, "Appuyez sur n'importe quelle touche pour continuer",
+                           (150, 150, 150), center=(surface.get_width()//2, surface.get_height() - 50))
 
 # --- IR CONTROLLER ---
 class IRController(InputController):
     """Contrôleur par télécommande IR utilisant PIGPIO"""
     
-    def __init__(self, display, dht_reader, ble_monitor):
+    def __init__(self, display, dht_reader, ble_monitor, pi=None):
         super().__init__(display, dht_reader, ble_monitor)
         
         if not IR_AVAILABLE:
             raise ImportError("Pigpio non disponible")
             
-        self.pi = pigpio.pi()
+        self.pi = pi or pigpio.pi() # Connexion ouverte pendant l'initialisation parallèle, sinon ici
         if not self.pi.connected:
             raise ImportError("Impossible de se connecter à pigpiod")
             
-        self.code_queue = queue.Queue()
+        self.code_queue = queue.Queue() # (code, heure du dernier front, heure de mise en file)
         self.setup_ir_receiver()
+        self._calibrate_ticks()
+        
+        self.edge_latency = self.metrics.histogram(
+            'ircmrpi_ir_edge_to_enqueue_seconds', "Dernier front de la trame IR -> code dans la file")
+        self.queue_latency = self.metrics.histogram(
+            'ircmrpi_ir_queue_wait_seconds', "Code IR dans la file -> lu par la boucle principale")
+        self.unknown_codes = self.metrics.counter('ircmrpi_ir_unknown_codes_total', "Codes IR absents de REMOTE_KEY_MAP")
+        self.metrics.counter_func('ircmrpi_ir_decode_aborts_total', "Trames IR abandonnées en cours de lecture",
+                                  lambda: {name: stats['aborts'] for name, stats in self.decoder.stats().items()},
+                                  label='protocol')
         
     def setup_ir_receiver(self):
         """Initialise la réception NEC sur le GPIO"""
+        # Watchdog armé pendant chaque trame seulement : silence après une trame Sony 12 / 15 bits, émise sans attendre
+        self.decoder = IRDecoderSet(self._on_event, IR_PROTOCOLS,
+                                    watchdog=lambda ms: self.pi.set_watchdog(GPIO_IR, ms))
         self.pi.set_mode(GPIO_IR, pigpio.INPUT)
         self.pi.set_glitch_filter(GPIO_IR, 100)
-        self.pi.callback(GPIO_IR, pigpio.EITHER_EDGE, self._cb)
-        
-        self.in_code = False
-        self.code = 0
-        self.bits = 0
-        self.last_tick = 0
+        self.notify_reader = None
+        if EDGE_INGESTION == 'notify':
+            # Lecture par lots dans un thread dédié
+            self.notify_reader = NotifyReader.open_pigpio(self.pi, {GPIO_IR: self.decoder.feed})
+            self.notify_reader.start()
+        else:
+            # Le décodeur est branché directement sur le callback pigpio (pas d'appel intermédiaire)
+            self.pi.callback(GPIO_IR, pigpio.EITHER_EDGE, self.decoder.feed)
         print(f"Récepteur IR (Pigpio) actif sur GPIO {GPIO_IR}")
 
     def _cb(self, gpio, level, tick):
-        """Callback bas niveau pour décoder le NEC"""
-        if self.last_tick != 0:
-            diff = pigpio.tickDiff(self.last_tick, tick)
-            
-            if 8000 < diff < 10000 and level == 1: # Header Start
-                self.in_code = False
-            elif 4000 < diff < 5000 and level == 0: # Header Space
-                self.in_code = True; self.code = 0; self.bits = 0
-            elif self.in_code and level == 0:
-                if 400 < diff < 700: self.code = self.code << 1; self.bits += 1
-                elif 1500 < diff < 1800: self.code = (self.code << 1) | 1; self.bits += 1
-                else: self.in_code = False
-                
-                if self.bits == 32:
-                    # Code reçu ! On l'ajoute à la file d'attente
-                    self.code_queue.put(self.code)
-                    self.in_code = False
-        self.last_tick = tick
+        """Callback bas niveau pour décoder les trames IR"""
+        self.decoder.feed(gpio, level, tick)
+
+    def _calibrate_ticks(self):
+        """Décalage entre l'horloge de pigpiod (ticks en µs) et time.perf_counter()"""
+        before = time.perf_counter()
+        tick = self.pi.get_current_tick()
+        after = time.perf_counter()
+        self.tick_offset = (before + after) / 2 - tick / 1e6
+        self.tick_calibrated = after
+
+    def _on_event(self, event):
+        """Trame décodée : on ajoute sa clé à la file d'attente"""
+        # Répétitions (touche maintenue) : seules les touches de IR_REPEAT_KEYS sont répétées
+        if event.repeat and REMOTE_KEY_MAP.get(event.key) not in IR_REPEAT_KEYS:
+            return
+        now = time.perf_counter()
+        if now - self.tick_calibrated > IR_TICK_CALIBRATION:
+            self._calibrate_ticks() # Dérive entre les deux horloges (thread du callback, hors affichage)
+        # Âge du dernier front (ticks sur 32 bits : rebouclage toutes les ~72 min)
+        age = ((int((now - self.tick_offset) * 1e6) - event.tick) & 0xFFFFFFFF) / 1e6
+        if age > 1.0:
+            age = 0.0 # Front "dans le futur" (erreur de recalage) : latence inconnue
+        self.edge_latency.observe(age)
+        edge = now - age
+        if TRACER.enabled:
+            # Trame entière : du front précédant l'en-tête au dernier front
+            duration = ((event.tick - self.decoder.frame_start) & 0xFFFFFFFF) / 1e6
+            TRACER.complete('ir_frame', edge - duration, edge, cat='ir', track='pigpio-callback',
+                            args={'protocol': event.protocol, 'code': format_key(event.key), 'repeat': event.repeat})
+        self.code_queue.put((event.key, edge, now))
+        self.loop.wake('ir') # Réveil immédiat du thread principal
 
     def run(self):
         """Boucle principale de lecture des commandes IR."""
@@ -803,29 +1989,39 @@ class IRController(InputController):
 
         try:
             while self.running:
-                # 1. Vérifier si un code IR est arrivé dans la file d'attente
-                try:
-                    code = self.code_queue.get(timeout=0.1) # Attente non bloquante 100ms
+                # 1. Dormir jusqu'au prochain événement (code IR reçu, fenêtre Pygame)
+                for event in self.loop.wait():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                
+                # 2. Traiter les codes IR arrivés dans la file d'attente
+                while self.running:
+                    try:
+                        code, edge, enqueued = self.code_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    dequeued = time.perf_counter()
+                    self.queue_latency.observe(dequeued - enqueued)
+                    TRACER.complete('queue_wait', enqueued, dequeued, cat='ir')
                     
                     if code in REMOTE_KEY_MAP:
                         key = REMOTE_KEY_MAP[code]
-                        print(f"Code IR: 0x{code:X} -> Touche '{key}'")
+                        print(f"Code IR: {format_key(code)} -> Touche '{key}'")
+                        self.input_stamps = (edge, dequeued)
                         self.running = self.process_command(key)
                     else:
-                        print(f"Code IR inconnu: 0x{code:X}") #Si la touche est mal configurée.
-                        
-                except queue.Empty:
-                    pass
-                
-                # 2. Garder la fenêtre Pygame active (sinon elle gèle)
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
+                        self.unknown_codes.inc()
+                        print(f"Code IR inconnu: {format_key(code)}") #Si la touche est mal configurée.
 
         except KeyboardInterrupt:
             print("Arrêt...")
         finally:
+            self.dht_sampler.close()
+            if self.notify_reader is not None:
+                self.notify_reader.close()
+            self.pi.set_watchdog(GPIO_IR, 0) # Le watchdog survit à la connexion dans pigpiod
             self.pi.stop()
+            self.loop.report()
             print("IRController arrêté.")
 
 # --- KEYBOARD CONTROLLER ---
@@ -849,7 +2045,8 @@ class KeyboardController(InputController):
         
         try:
             while self.running:
-                for event in pygame.event.get():
+                # Dort jusqu'au prochain événement clavier (aucune attente active)
+                for event in self.loop.wait():
                     if event.type == pygame.QUIT:
                         self.running = False
                         break
@@ -859,12 +2056,13 @@ class KeyboardController(InputController):
                         
                         if key:
                             self.running = self.process_command(key)
-                
-                time.sleep(0.05)
+                            if not self.running:
+                                break
                 
         except KeyboardInterrupt:
             print("\nInterruption manuelle")
         finally:
+            self.loop.report()
             self.cleanup()
     
     def get_key_name(self, key_code):
@@ -879,6 +2077,7 @@ class KeyboardController(InputController):
             pygame.K_q: 'q', # Touche q du clavier (Quitter le programme)
             pygame.K_ESCAPE: 'escape', # Touche échap du clavier (Quitter le programme)
             pygame.K_h: 'h', # Touche 1 du clavier (Menu d'aide)
+            pygame.K_t: 't', # Touche t du clavier (Trace, si TRACE_ENABLED)
         }
         
         # Touches numériques du pavé numérique
@@ -891,13 +2090,20 @@ class KeyboardController(InputController):
 class MenuManager:
     """Gère le menu de sélection au démarrage"""
     
+    MODE_OPTIONS = [
+        ("Télécommande IR", "Utilise la télécommande (Pigpio)"),
+        ("Clavier", "Utilise le clavier de l'ordinateur"),
+        ("Mode Console", "Sans affichage graphique"),
+        ("Quitter", "Arrêter le programme")
+    ]
+    
     def __init__(self):
         self.display = None
         self.selected_mode = None
         
     def init_display(self):
         """Initialise l'affichage"""
-        if not PYGAME_AVAILABLE:
+        if not load_display_modules():
             print("PyGame non disponible - Mode console uniquement")
             return False
             
@@ -935,20 +2141,16 @@ class MenuManager:
     
     def show_graphical_menu(self):
         """Affiche le menu en mode graphique"""
-        options = [
-            ("Télécommande IR", "Utilise la télécommande (Pigpio)"),
-            ("Clavier", "Utilise le clavier de l'ordinateur"),
-            ("Mode Console", "Sans affichage graphique"),
-            ("Quitter", "Arrêter le programme")
-        ]
+        options = self.MODE_OPTIONS
         
         selected = 0
         self.display.display_menu("SÉLECTIONNEZ LE MODE D'ENTRÉE", options, selected)
         
         # Gestion des touches pour le menu
+        loop = EventLoop()
         waiting = True
         while waiting:
-            for event in pygame.event.get():
+            for event in loop.wait():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_DOWN:
                         selected = (selected + 1) % len(options)
@@ -960,8 +2162,6 @@ class MenuManager:
                         waiting = False
                     elif event.key in [pygame.K_q, pygame.K_ESCAPE]:
                         return 'quit'
-            
-            time.sleep(0.05)
         
         # Retourne le choix
         if selected == 0:
@@ -973,9 +2173,10 @@ class MenuManager:
         else:
             return 'quit'
     
-    def get_mode_selection(self):
-        """Obtient la sélection de mode de l'utilisateur"""
-        if self.init_display():
+    def get_mode_selection(self, init=None):
+        """Obtient la sélection de mode de l'utilisateur (init : InitStage, démarrage de l'affichage chronométré)"""
+        shown = init.run('display', self.init_display) if init is not None else self.init_display()
+        if shown:
             return self.show_graphical_menu()
         else:
             return self.show_text_menu()
@@ -984,10 +2185,13 @@ class MenuManager:
 class ConsoleMode:
     """Mode console uniquement (sans affichage graphique)"""
     
-    def __init__(self):
-        self.dht_reader = DHT11Reader(DHT_PIN, DHT_SENSOR)
+    def __init__(self, display=None, dht_reader=None):
+        self.display = display # Fenêtre du menu réutilisée (sinon ouverte par run())
+        self.dht_reader = dht_reader or DHT11Reader(DHT_PIN, DHT_SENSOR, sensors=DHT_SENSORS)
         self.ble_monitor = BLEMonitor(**BLE_CONFIG)
         self.ble_active = False
+        self.log = open_sensor_log()
+        self.dht_reader.log = self.ble_monitor.log = self.log
         
     def run(self):
         """Exécute le mode console avec affichage pygame."""
@@ -1002,27 +2206,45 @@ class ConsoleMode:
         print("  q       : Quitter")
         print("="*50)
 
-        # On crée une fenêtre pygame pour afficher les images
-        from pygame import display
-        display.init()
-        self.display = ImageDisplay()
+        # Fenêtre pygame pour afficher les images (celle du menu si elle est déjà ouverte), sinon sortie texte
+        if self.display is None and load_display_modules():
+            try:
+                self.display = ImageDisplay()
+            except Exception as e:
+                print(f"Impossible d'initialiser l'affichage ({e}) - sortie texte uniquement")
 
         try:
             while True:
                 cmd = input("\nCommande> ").strip().lower()
+                if self.log is not None and cmd:
+                    self.log.event('console', cmd)
 
                 if cmd in ['1', '2', '3']:
                     path = IMAGE_PATHS.get(cmd)
-                    if path and os.path.exists(path):
+                    if not path or not os.path.exists(path):
+                        print(f"Image introuvable : {path}")
+                    elif self.display is not None:
                         self.display.display_image(path)
                     else:
-                        print(f"Image introuvable : {path}")
+                        print(f"Image : {path}")
+
+                elif cmd == '4' and self.dht_reader.sensors and self.dht_reader.available:
+                    # Plusieurs capteurs (DHT_SENSORS) : une ligne par capteur
+                    for pin, result in self.dht_reader.measure_all().items():
+                        if not isinstance(result, DHTError):
+                            print(f"DHT GPIO{pin} : {result[0]:.1f}°C, {result[1]:.1f}%")
 
                 elif cmd == '4':
                     temp, hum, is_test = self.dht_reader.read()
-                    self.display.display_dht_data(temp, hum, is_test)
+                    if self.display is not None:
+                        self.display.display_dht_data(temp, hum, is_test)
+                    else:
+                        print(f"DHT : {temp:.1f}°C, {hum:.1f}%{' (valeurs de test)' if is_test else ''}")
 
                 elif cmd == '5':
+                    if not self.ble_monitor.available:
+                        print("BLE non disponible")
+                        continue
                     if self.ble_active:
                         self.ble_monitor.stop()
                     print("Lancement du monitoring BLE...")
@@ -1042,26 +2264,141 @@ class ConsoleMode:
         except KeyboardInterrupt:
             print("\nAu revoir!")
         finally:
-            if self.ble_active:
-                self.ble_monitor.stop()
+            self.ble_monitor.close()
+            if self.log is not None:
+                self.log.close()
 
 
 # ===== MAIN =====
 
-def check_dependencies():
-    """Vérifie les dépendances système"""
+def dump_trace():
+    """Écrit la trace des derniers intervalles dans TRACE_DIR et retourne son chemin"""
+    path = TRACER.dump(TRACE_DIR)
+    print(f"Trace écrite: {path}")
+    return path
+
+def install_trace_signal():
+    """kill -USR1 <pid> : écrit la trace sans toucher à l'interface (thread séparé)"""
+    if not TRACER.enabled or not hasattr(signal, 'SIGUSR1'):
+        return
+    signal.signal(signal.SIGUSR1, lambda signum, frame: threading.Thread(target=dump_trace, daemon=True).start())
+
+def open_metrics_server(registry):
+    """Export des métriques sur METRICS_ADDRESS (None si désactivé ou adresse indisponible)"""
+    if METRICS_ADDRESS is None:
+        return None
+    try:
+        server = MetricsServer(registry, METRICS_ADDRESS)
+    except OSError as e:
+        print(f"Export des métriques impossible sur {METRICS_ADDRESS}: {e}")
+        return None
+    print(f"Métriques: {METRICS_ADDRESS}")
+    return server
+
+def open_sensor_log():
+    """Démarre le journal SQLite configuré dans SENSOR_LOG (None si désactivé ou impossible à ouvrir)"""
+    config = dict(SENSOR_LOG)
+    path = config.pop('path')
+    if path is None:
+        return None
+    log = SensorLog(path, **config)
+    try:
+        log.start()
+    except Exception as e:
+        print(f"Journal SQLite indisponible ({path}): {e}")
+        return None
+    print(f"Journal SQLite: {path}")
+    return log
+
+def missing_images():
+    """Images de IMAGE_PATHS absentes : [(touche, chemin)]"""
+    return [(key, path) for key, path in IMAGE_PATHS.items() if not os.path.exists(path)]
+
+def check_dependencies(missing=None):
+    """Vérifie les dépendances système (missing : résultat de missing_images() déjà obtenu)"""
     print("Vérification des dépendances...")
     
     # Vérifier images
-    for key, path in IMAGE_PATHS.items():
-        if not os.path.exists(path):
-            print(f"⚠️ Image manquante pour touche {key}: {path}")
-            print(f"   Créez: touch {path}  # ou placez une vraie image")
+    for key, path in missing_images() if missing is None else missing:
+        print(f"⚠️ Image manquante pour touche {key}: {path}")
+        print(f"   Créez: touch {path}  # ou placez une vraie image")
     
     print("\nVérifications terminées")
 
-def main():
+def connect_pigpio():
+    """Connexion à pigpiod partagée par l'IR et le DHT (exception si le démon est injoignable)"""
+    if not PIGPIO_AVAILABLE:
+        raise RuntimeError("module pigpio non installé")
+    pi = pigpio.pi()
+    if not pi.connected:
+        raise ConnectionError("pigpiod injoignable (sudo pigpiod)")
+    return pi
+
+def probe_ble():
+    """Importe bleak (lent : dbus) et vérifie la présence d'un adaptateur. Retourne les adaptateurs trouvés"""
+    backend = BLE_CONFIG.get('backend', 'bleak')
+    if backend != 'bleak':
+        return [backend] # Capteur simulé : rien à vérifier
+    if not BLE_AVAILABLE:
+        raise RuntimeError("module bleak non installé")
+    import bleak # Chargé ici plutôt qu'au premier scan (touche 5)
+    if not sys.platform.startswith('linux'):
+        return []
+    adapters = sorted(os.listdir('/sys/class/bluetooth')) if os.path.isdir('/sys/class/bluetooth') else []
+    if not adapters:
+        raise RuntimeError("aucun adaptateur Bluetooth (hci)")
+    return adapters
+
+def _trace_init_step(step):
+    TRACER.complete(f"init_{step.name}", step.start, step.end, cat='startup', track=f"init-{step.name}")
+
+def start_init():
+    """Lance les étapes indépendantes du démarrage en arrière-plan (le menu s'affiche sans les attendre)"""
+    init = InitStage(on_step=_trace_init_step)
+    init.start('images', missing_images, timeout=INIT_TIMEOUTS['images'])
+    if PIGPIO_AVAILABLE:
+        # Connexion établie après le délai : le programme a continué sans elle, on la ferme
+        init.start('pigpio', connect_pigpio, timeout=INIT_TIMEOUTS['pigpio'], on_late=lambda pi: pi.stop())
+    init.start('ble', probe_ble, timeout=INIT_TIMEOUTS['ble'])
+    return init
+
+def run_console(init, dht_reader, display=None):
+    """Mode console, avec le résultat de l'initialisation (BLE indisponible si l'adaptateur est absent)"""
+    console = ConsoleMode(display, dht_reader)
+    if not init.ok('ble'):
+        console.ble_monitor.available = False # Commande 5 : "BLE non disponible" au lieu d'un échec du scan
+    report_init(init, console.log)
+    console.run()
+
+def report_init(init, log=None):
+    """Affiche la durée et l'état de chaque étape du démarrage (et les enregistre dans le journal SQLite)"""
+    init.wait()
+    missing = init.result('images')
+    if missing is not None:
+        check_dependencies(missing)
+    print("Initialisation :")
+    for line in init.report():
+        print(f"  {line}")
+    if log is not None:
+        for step in init.steps.values():
+            log.event('startup', step.name, f"{step.status} {step.duration * 1000:.1f}ms")
+    failed = [step.name for step in init.failures()]
+    if failed:
+        print(f"⚠️ Étapes en échec : {', '.join(failed)}")
+
+def parse_args(argv=None):
+    """Options de diagnostic (aucune par défaut)"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Contrôleur IR/Clavier multifonction pour Raspberry Pi")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar="RÉPERTOIRE",
+                        help=f"Profil cProfile de chaque commande et des images du Snake (.pstats, défaut: {PROFILE_DIR})")
+    parser.add_argument('--hud', action='store_true',
+                        help="Affiche img/s, durée de rendu, files d'attente et mémoire résidente")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Fonction principale"""
+    args = parse_args(argv)
     print("\n" + "="*50)
     print("CONTRÔLEUR MULTIMODE RASPBERRY PI")
     print("="*50)
@@ -1069,11 +2406,13 @@ def main():
     # Assurez-vous que le démon pigpiod est lancé
     # os.system("sudo pigpiod") 
     
-    check_dependencies()
+    # Images, pigpiod et adaptateur Bluetooth vérifiés en arrière-plan pendant l'affichage du menu
+    init = start_init()
+    install_trace_signal()
     
     # Menu de sélection
     menu = MenuManager()
-    mode = menu.get_mode_selection()
+    mode = menu.get_mode_selection(init)
     
     if mode == 'quit':
         print("👋 Au revoir!")
@@ -1081,37 +2420,59 @@ def main():
             menu.display.close()
         return
     
+    # Résultats de l'initialisation (attendus au plus jusqu'à l'échéance de chaque étape)
+    pi = init.result('pigpio') if 'pigpio' in init.steps else None
+    dht_reader = DHT11Reader(DHT_PIN, DHT_SENSOR, pi=pi, connect=False, sensors=DHT_SENSORS) # Jamais de seconde tentative
+    
     # Initialisation selon le mode choisi
+    sensor_log = None
+    metrics_server = None
     try:
         if mode == 'console':
             # Mode console uniquement
-            console = ConsoleMode()
-            console.run()
+            run_console(init, dht_reader, menu.display)
             
         else:
-            # Modes avec affichage graphique
-            if not PYGAME_AVAILABLE:
+            # Modes avec affichage graphique (la fenêtre du menu est réutilisée : pas de second pygame.init())
+            display = menu.display
+            if display is None and load_display_modules():
+                try:
+                    display = ImageDisplay()
+                except Exception as e:
+                    print(f"Impossible d'initialiser l'affichage ({e})")
+            if display is None:
                 print("PyGame requis pour ce mode. Passage en mode console.")
-                console = ConsoleMode()
-                console.run()
+                run_console(init, dht_reader)
                 return
             
             # Initialiser les composants
-            display = ImageDisplay()
-            dht_reader = DHT11Reader(DHT_PIN, DHT_SENSOR)
             ble_monitor = BLEMonitor(**BLE_CONFIG)
+            if not init.ok('ble'):
+                ble_monitor.available = False # Touche 5 : "BLE non disponible" au lieu d'un échec du scan
+            sensor_log = open_sensor_log()
+            dht_reader.log = ble_monitor.log = sensor_log
+            report_init(init, sensor_log)
             
             # Créer le contrôleur approprié
             if mode == 'ir':
-                if not IR_AVAILABLE:
+                if not IR_AVAILABLE or pi is None:
                     print("PIGPIO non disponible. Passage en mode clavier.")
                     mode = 'keyboard'
             
             if mode == 'ir':
-                controller = IRController(display, dht_reader, ble_monitor)
+                controller = IRController(display, dht_reader, ble_monitor, pi=pi)
             else:  # keyboard
                 controller = KeyboardController(display, dht_reader, ble_monitor)
             
+            controller.log = sensor_log
+            metrics_server = open_metrics_server(controller.metrics)
+            if args.profile:
+                controller.profiler = CommandProfiler(args.profile)
+                print(f"Profilage des commandes: {args.profile}/")
+            if args.hud:
+                display.hud = controller.hud_sources()
+                controller.loop.call_every(HUD_REFRESH, display.present_hud) # HUD à jour même sans activité
+            
             # Lancer le contrôleur
             controller.run()
             
@@ -1120,6 +2481,10 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        if sensor_log is not None:
+            sensor_log.close()
         print("\nProgramme terminé")
 
 if __name__ == "__main__":
@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Décodeurs IR partagés (IRCMRPi.py et IRNECCODE.py)
+NEC / Samsung : machine à états pré-calculée, une consultation de table par front
+RC5 et Sony SIRC : machines à états O(1) par front
+IRDecoderSet : tous les protocoles en parallèle sur le même flux de fronts
+"""
+
+import time
+from collections import namedtuple
+
+# --- TIMINGS NEC (en microsecondes) ---
+# Trame complète : 9ms pulse + 4.5ms espace + 32 bits + burst final
+# Trame de répétition : 9ms pulse + 2.25ms espace + burst 560µs (toutes les ~108ms)
+# Bit 0 : Pulse 560µs + Espace 560µs / Bit 1 : Pulse 560µs + Espace 1690µs
+NEC_BITS = 32
+REPEAT_TIMEOUT_US = 150000 # Délai max entre deux trames pour accepter une répétition
+
+# Watchdog pigpio (pi.set_watchdog) : après WATCHDOG_MS sans front, le callback reçoit level = 2 (pigpio.TIMEOUT).
+# Les trames Sony de 12 / 15 bits n'ont pas de fin explicite : elles sont terminées par ce silence.
+# pigpio répète le rapport tant qu'aucun front n'arrive : le watchdog n'est armé que pendant une trame
+WATCHDOG_MS = 10
+SIRC_PERIOD_US = 45000 # Période des trames Sony (début à début) : silence plus long = trame périmée
+
+# Budget de temps CPU par front pour l'ensemble des protocoles (vérifié en mode profilage)
+EDGE_BUDGET_NS = 20000
+
+# Résolution de la quantification des durées (1 << 5 = 32µs par case)
+_SHIFT = 5
+_MAX_US = 12000
+_NBUCKETS = (_MAX_US >> _SHIFT) + 1
+
+# --- Classes de fronts ---
+# Front montant (level == 1) : fin d'un pulse / Front descendant (level == 0) : fin d'un espace
+C_OTHER = 0
+C_MARK = 1       # Pulse 560µs
+C_MARK_HDR = 2   # Pulse d'entête (9ms NEC, 4.5ms Samsung)
+C_SPACE_0 = 3    # Espace court (bit 0)
+C_SPACE_1 = 4    # Espace long (bit 1)
+C_SPACE_HDR = 5  # Espace d'entête 4.5ms
+C_SPACE_RPT = 6  # Espace de répétition 2.25ms (NEC uniquement)
+_NCLASS = 7
+
+# --- États ---
+# 0..31 : lecture du bit n / puis états de contrôle
+S_IDLE = NEC_BITS
+S_HDR = NEC_BITS + 1     # Pulse d'entête reçu, on attend l'espace
+S_RPT = NEC_BITS + 2     # Espace 2.25ms reçu, on attend le burst final
+_NSTATES = NEC_BITS + 3
+
+# --- Actions (encodées dans les bits de poids fort de la table) ---
+A_NONE = 0
+A_START = 1        # Début de trame : code = 0
+A_BIT0 = 2
+A_BIT1 = 3
+A_BIT0_EMIT = 4    # Dernier bit (0) : trame complète
+A_BIT1_EMIT = 5    # Dernier bit (1) : trame complète
+A_REPEAT = 6
+_ACTION_SHIFT = 8
+_STATE_MASK = (1 << _ACTION_SHIFT) - 1
+
+# Inversion de l'ordre des bits d'un octet (NEC/Samsung transmettent le bit de poids faible en premier)
+_REV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def _bucket_index(level, lo, hi):
+    """Cases (niveau, durée quantifiée) dont le centre est dans ]lo, hi["""
+    for b in range(_NBUCKETS):
+        center = (b << _SHIFT) + (1 << (_SHIFT - 1))
+        if b == _NBUCKETS - 1:
+            center = _MAX_US + 1 # Dernière case : toutes les durées plus longues
+        if lo < center < hi:
+            yield level * _NBUCKETS + b
+
+
+def _build_class_table(ranges):
+    """Table (niveau, durée quantifiée) -> classe de front"""
+    table = bytearray(2 * _NBUCKETS)
+    for cls, level, lo, hi in ranges:
+        for idx in _bucket_index(level, lo, hi):
+            table[idx] = cls
+    return bytes(table)
+
+
+def _build_transition_table(with_repeat):
+    """Table (état, classe) -> état suivant | action << 8"""
+    table = [S_IDLE] * (_NSTATES * _NCLASS)
+
+    def put(state, cls, nxt, action=A_NONE):
+        table[state * _NCLASS + cls] = nxt | (action << _ACTION_SHIFT)
+
+    for state in range(_NSTATES):
+        # Un pulse d'entête relance toujours la détection
+        put(state, C_MARK_HDR, S_HDR)
+
+    put(S_HDR, C_SPACE_HDR, 0, A_START)
+    if with_repeat:
+        put(S_HDR, C_SPACE_RPT, S_RPT)
+        put(S_RPT, C_MARK, S_IDLE, A_REPEAT)
+
+    for bit in range(NEC_BITS):
+        last = bit == NEC_BITS - 1
+        put(bit, C_MARK, bit) # Pulse entre deux espaces : on reste sur le même bit
+        put(bit, C_SPACE_0, S_IDLE if last else bit + 1, A_BIT0_EMIT if last else A_BIT0)
+        put(bit, C_SPACE_1, S_IDLE if last else bit + 1, A_BIT1_EMIT if last else A_BIT1)
+
+    return tuple(table)
+
+
+class IREvent(namedtuple('IREvent', 'protocol address command code repeat tick')):
+    """Trame décodée, étiquetée avec son protocole et son adresse"""
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Clé utilisable dans REMOTE_KEY_MAP"""
+        if self.protocol in ('NEC', 'SAMSUNG'):
+            return self.code # Code 32 bits brut (compatible avec les codes relevés par IRNECCODE.py)
+        return (self.protocol, self.address, self.command)
+
+
+def format_key(key):
+    """Représentation lisible d'une clé de REMOTE_KEY_MAP"""
+    if isinstance(key, int):
+        return f"0x{key:08X}"
+    protocol, address, command = key
+    return f"('{protocol}', 0x{address:02X}, 0x{command:02X})"
+
+
+class IRProtocol:
+    """Base commune des décodeurs : signature compatible avec pi.callback()"""
+
+    name = None
+    header = ()                 # (niveau, min, max) des fronts pouvant démarrer une trame
+    repeats_full_frames = True  # La télécommande renvoie la trame complète quand la touche est maintenue
+
+    def __init__(self, on_frame, on_repeat=None, repeat_timeout=REPEAT_TIMEOUT_US):
+        self.on_frame = on_frame    # Appelé avec (code, tick) pour chaque nouvelle trame
+        self.on_repeat = on_repeat  # Appelé avec (code, tick) pour chaque répétition
+        self.repeat_timeout = repeat_timeout
+        self.reset()
+
+    def reset(self):
+        """Remet la machine à états au repos"""
+        self.last_tick = 0
+        self.last_code = None      # Dernier code complet (référence des répétitions)
+        self.last_frame_tick = 0   # Tick de la dernière trame ou répétition acceptée
+        self.frames = 0
+        self.repeats = 0
+        self.aborts = 0            # Trames abandonnées en cours de lecture
+
+    def feed(self, gpio, level, tick):
+        """Traite un front (gpio, level, tick) en O(1)"""
+        last = self.last_tick
+        if level > 1: # pigpio.TIMEOUT (watchdog) : silence depuis le dernier front, pas un front
+            if last:
+                self.expire((tick - last) & 0xFFFFFFFF, last)
+            return
+        self.last_tick = tick
+        if last == 0:
+            return
+        self.step(level, (tick - last) & 0xFFFFFFFF, tick)
+
+    __call__ = feed
+
+    def step(self, level, diff, tick):
+        """Traite un front déjà mesuré. Retourne True tant qu'une trame est en cours"""
+        raise NotImplementedError
+
+    def expire(self, silence, tick):
+        """Silence de silence µs depuis le dernier front (tick) signalé par le watchdog.
+        Retourne True tant qu'une trame est en cours (par défaut : trames terminées par un front)"""
+        return True
+
+    def fields(self, code):
+        """Retourne (adresse, commande) d'un code"""
+        raise NotImplementedError
+
+    def _emit(self, code, tick):
+        """Trame complète : nouvelle trame ou répétition (même code dans le délai)"""
+        recent = ((tick - self.last_frame_tick) & 0xFFFFFFFF) < self.repeat_timeout
+        self.last_frame_tick = tick
+        if self.repeats_full_frames and recent and code == self.last_code:
+            self._emit_repeat(tick)
+            return
+        self.last_code = code
+        self.frames += 1
+        self.on_frame(code, tick)
+
+    def _emit_repeat(self, tick):
+        self.repeats += 1
+        if self.on_repeat is not None:
+            self.on_repeat(self.last_code, tick)
+
+
+class _PulseDistanceProtocol(IRProtocol):
+    """NEC et dérivés : bits codés par la durée de l'espace, machine à états pré-calculée"""
+
+    _classes = b''
+    _transitions = ()
+
+    def reset(self):
+        super().reset()
+        self.state = S_IDLE
+        self.code = 0
+
+    def step(self, level, diff, tick):
+        bucket = diff >> _SHIFT
+        if bucket >= _NBUCKETS:
+            bucket = _NBUCKETS - 1
+
+        state = self.state
+        entry = self._transitions[state * _NCLASS + self._classes[level * _NBUCKETS + bucket]]
+        self.state = nxt = entry & _STATE_MASK
+        action = entry >> _ACTION_SHIFT
+
+        if action == A_NONE:
+            if nxt == S_IDLE and state < NEC_BITS:
+                self.aborts += 1 # Erreur de timing en plein milieu de la trame
+        elif action == A_BIT0:
+            self.code <<= 1
+        elif action == A_BIT1:
+            self.code = (self.code << 1) | 1
+        elif action == A_START:
+            self.code = 0
+        elif action == A_REPEAT:
+            if (self.last_code is not None
+                    and ((tick - self.last_frame_tick) & 0xFFFFFFFF) < self.repeat_timeout):
+                self.last_frame_tick = tick
+                self._emit_repeat(tick)
+        else: # A_BIT0_EMIT / A_BIT1_EMIT
+            code = (self.code << 1) | (action - A_BIT0_EMIT)
+            self.code = code
+            self._emit(code, tick)
+        return nxt != S_IDLE
+
+    def fields(self, code):
+        address = _REV8[(code >> 24) & 0xFF]
+        inverse = _REV8[(code >> 16) & 0xFF]
+        if address ^ inverse != 0xFF:
+            address |= inverse << 8 # Adresse étendue 16 bits
+        return address, _REV8[(code >> 8) & 0xFF]
+
+
+class NECDecoder(_PulseDistanceProtocol):
+    """Décodeur NEC (trames complètes + trames de répétition)"""
+
+    name = 'NEC'
+    header = ((1, 8000, 10000),)
+    repeats_full_frames = False # NEC envoie des trames de répétition dédiées
+    # (classe, niveau, min exclu, max exclu) : mêmes tolérances que le décodeur d'origine
+    _classes = _build_class_table((
+        (C_MARK, 1, 400, 700),
+        (C_MARK_HDR, 1, 8000, 10000),
+        (C_SPACE_0, 0, 400, 700),
+        (C_SPACE_1, 0, 1500, 1800),
+        (C_SPACE_HDR, 0, 4000, 5000),
+        (C_SPACE_RPT, 0, 2000, 2500),
+    ))
+    _transitions = _build_transition_table(with_repeat=True)
+
+
+class SamsungDecoder(_PulseDistanceProtocol):
+    """Décodeur Samsung : entête 4.5ms + 4.5ms, bits NEC, trame complète répétée"""
+
+    name = 'SAMSUNG'
+    header = ((1, 4000, 5000),)
+    _classes = _build_class_table((
+        (C_MARK, 1, 400, 700),
+        (C_MARK_HDR, 1, 4000, 5000),
+        (C_SPACE_0, 0, 400, 700),
+        (C_SPACE_1, 0, 1500, 1800),
+        (C_SPACE_HDR, 0, 4000, 5000),
+    ))
+    _transitions = _build_transition_table(with_repeat=False)
+
+
+class SonyDecoder(IRProtocol):
+    """Décodeur Sony SIRC (12, 15 ou 20 bits) : bits codés par la durée du pulse, LSB en premier"""
+
+    name = 'SIRC'
+    header = ((1, 2000, 2800),)
+    _VALID_BITS = (12, 15, 20)
+
+    def reset(self):
+        super().reset()
+        self.bits = -1 # -1 : au repos
+        self.code = 0
+
+    def step(self, level, diff, tick):
+        bits = self.bits
+        if level == 1:
+            # Fin d'un pulse : entête (2.4ms) ou bit (600µs = 0, 1200µs = 1)
+            if 2000 < diff < 2800:
+                self.bits = 0
+                self.code = 0
+                return True
+            if bits < 0:
+                return False
+            if 400 < diff < 800:
+                bit = 0
+            elif 1000 < diff < 1400:
+                bit = 1
+            else:
+                self.aborts += 1
+                self.bits = -1
+                return False
+            self.code |= bit << bits
+            self.bits = bits = bits + 1
+            if bits == 20:
+                self.bits = -1
+                self._emit(self.code, tick)
+                return False
+            return True
+
+        # Fin d'un espace : 600µs entre deux bits, ou silence de fin de trame
+        if bits < 0:
+            return False
+        if 400 < diff < 800:
+            return True
+        self.bits = -1
+        if 2800 < diff < SIRC_PERIOD_US and bits in self._VALID_BITS:
+            # Pas de watchdog : fin de trame vue à l'entête de la trame suivante (répétition)
+            self._emit(self.code, (tick - diff) & 0xFFFFFFFF)
+        else:
+            self.aborts += 1 # Silence trop long : trame périmée, jamais émise plus tard
+        return False
+
+    def expire(self, silence, tick):
+        bits = self.bits
+        if bits < 0:
+            return False
+        if silence <= 2800:
+            return True
+        self.bits = -1
+        if bits in self._VALID_BITS:
+            self._emit(self.code, tick) # Tick du dernier front : fin réelle de la trame
+        else:
+            self.aborts += 1
+        return False
+
+    def fields(self, code):
+        return code >> 7, code & 0x7F
+
+
+class RC5Decoder(IRProtocol):
+    """Décodeur Philips RC5 (Manchester, demi-bit de 889µs, 14 bits)"""
+
+    name = 'RC5'
+    header = ((0, 2500, 1 << 32),) # Début du premier burst après un long silence
+
+    def reset(self):
+        super().reset()
+        self.half = -1 # Nombre de demi-bits reçus, -1 : au repos
+        self.first = 0 # Première moitié du bit en cours
+        self.code = 0
+
+    def step(self, level, diff, tick):
+        half = self.half
+        if half >= 0:
+            if 640 < diff < 1140:
+                count = 1
+            elif 1400 < diff < 2100:
+                count = 2
+            else:
+                count = 0
+            if count:
+                # Le segment qui vient de se terminer : burst (bas) si front montant
+                on = level
+                first = self.first
+                code = self.code
+                for _ in range(count):
+                    if half & 1 == 0:
+                        first = on
+                    elif first == on:
+                        count = 0 # Pas de transition au milieu du bit : pas du RC5
+                        break
+                    else:
+                        code = (code << 1) | on
+                    half += 1
+                if count:
+                    self.first = first
+                    self.code = code
+                    self.half = half
+                    if half == 28 or (half == 27 and first == 1):
+                        # Dernier bit à 0 : sa seconde moitié (sans burst) se confond avec le silence
+                        if half == 27:
+                            code <<= 1
+                        self.half = -1
+                        self._emit(code, tick)
+                        return False
+                    return True
+            if half >= 6:
+                self.aborts += 1
+            self.half = -1
+
+        if level == 0 and diff > 2500:
+            # Premier bit de start (1) : première moitié sans burst implicite
+            self.half = 1
+            self.first = 0
+            self.code = 0
+            return True
+        return False
+
+    def fields(self, code):
+        field = (code >> 12) & 1
+        address = (code >> 6) & 0x1F
+        command = (code & 0x3F) | ((field ^ 1) << 6) # RC5 étendu : bit de champ inversé = commande 64-127
+        return address, command
+
+
+PROTOCOLS = {
+    'NEC': NECDecoder,
+    'SAMSUNG': SamsungDecoder,
+    'SIRC': SonyDecoder,
+    'RC5': RC5Decoder,
+}
+
+
+class IRDecoderSet:
+    """Exécute plusieurs protocoles en parallèle sur le même flux de fronts
+
+    Une table pré-calculée indique, pour chaque front, les protocoles au repos qui
+    peuvent démarrer une trame : seuls ceux-ci et ceux déjà engagés sont appelés.
+    Un protocole dont le timing ne correspond plus sort du lot au front suivant.
+    """
+
+    def __init__(self, on_event, protocols=tuple(PROTOCOLS), repeat_timeout=REPEAT_TIMEOUT_US,
+                 profile=False, watchdog=None):
+        if len(protocols) > 8:
+            raise ValueError("8 protocoles maximum")
+        self.on_event = on_event # Appelé avec un IREvent
+        # watchdog(ms) : arme (WATCHDOG_MS) au début d'une trame / désarme (0) au premier rapport,
+        # ex: lambda ms: pi.set_watchdog(gpio, ms). None : watchdog laissé à l'appelant
+        self.watchdog = watchdog
+        self.watchdog_armed = watchdog is None
+        self.decoders = []
+        start = bytearray(2 * _NBUCKETS)
+        for i, name in enumerate(protocols):
+            cls = PROTOCOLS[name]
+            decoder = cls(self._frame_cb(i, False), self._frame_cb(i, True), repeat_timeout)
+            self.decoders.append(decoder)
+            for level, lo, hi in cls.header:
+                for idx in _bucket_index(level, lo, hi):
+                    start[idx] |= 1 << i
+        self._start = bytes(start)
+        # Pour chaque combinaison de protocoles : la liste (bit, step) à appeler
+        self._dispatch = tuple(
+            tuple((1 << i, d.step) for i, d in enumerate(self.decoders) if mask & (1 << i))
+            for mask in range(1 << len(self.decoders))
+        )
+        self.active = 0
+        self.last_tick = 0
+        self.frame_start = 0 # Tick du front qui précède l'en-tête de la trame en cours (ou dernière)
+        self.edges = 0
+        self.cost_ns = [0] * len(self.decoders)  # Temps CPU cumulé par protocole (mode profilage)
+        self.calls = [0] * len(self.decoders)
+        self.over_budget = 0                     # Fronts ayant dépassé EDGE_BUDGET_NS
+        if profile:
+            self.feed = self._feed_profiled
+
+    def _frame_cb(self, index, repeat):
+        def emit(code, tick):
+            decoder = self.decoders[index]
+            address, command = decoder.fields(code)
+            self.on_event(IREvent(decoder.name, address, command, code, repeat, tick))
+        return emit
+
+    def _expire(self, tick):
+        """Watchdog pigpio : silence depuis le dernier front, transmis aux protocoles engagés"""
+        last = self.last_tick
+        silence = (tick - last) & 0xFFFFFFFF
+        active = 0
+        for i, decoder in enumerate(self.decoders):
+            bit = 1 << i
+            if self.active & bit and decoder.expire(silence, last):
+                active |= bit
+        self.active = active
+
+    def _timeout(self, tick):
+        """Rapport du watchdog pigpio : fin des trames engagées, puis watchdog désarmé (pas de rapport au repos)"""
+        if self.active:
+            self._expire(tick)
+        if self.watchdog is None or not self.watchdog_armed:
+            return # Watchdog géré par l'appelant, ou déjà désarmé (rapport en route)
+        self.watchdog_armed = False
+        self.watchdog(0)
+
+    def _arm(self):
+        self.watchdog_armed = True
+        self.watchdog(WATCHDOG_MS)
+
+    def feed(self, gpio, level, tick):
+        """Traite un front (gpio, level, tick) : signature compatible avec pi.callback()"""
+        if level > 1: # pigpio.TIMEOUT (watchdog) : pas un front
+            self._timeout(tick)
+            return
+        last = self.last_tick
+        self.last_tick = tick
+        if last == 0:
+            return
+        diff = (tick - last) & 0xFFFFFFFF
+        bucket = diff >> _SHIFT
+        if bucket >= _NBUCKETS:
+            bucket = _NBUCKETS - 1
+        mask = self.active | self._start[level * _NBUCKETS + bucket]
+        if not mask:
+            return
+        active = 0
+        for bit, step in self._dispatch[mask]:
+            if step(level, diff, tick):
+                active |= bit
+        if active and not self.active:
+            self.frame_start = last
+        if active and not self.watchdog_armed:
+            self._arm() # Début de trame (ou protocole resté engagé après un rapport)
+        self.active = active
+
+    __call__ = feed
+
+    def _feed_profiled(self, gpio, level, tick):
+        """Variante de feed() qui mesure le coût de chaque protocole"""
+        if level > 1:
+            self._timeout(tick)
+            return
+        last = self.last_tick
+        self.last_tick = tick
+        if last == 0:
+            return
+        self.edges += 1
+        diff = (tick - last) & 0xFFFFFFFF
+        bucket = diff >> _SHIFT
+        if bucket >= _NBUCKETS:
+            bucket = _NBUCKETS - 1
+        mask = self.active | self._start[level * _NBUCKETS + bucket]
+        active = 0
+        total = 0
+        for i, (bit, step) in enumerate(self._dispatch[(1 << len(self.decoders)) - 1]):
+            if not mask & bit:
+                continue
+            t0 = time.perf_counter_ns()
+            engaged = step(level, diff, tick)
+            cost = time.perf_counter_ns() - t0
+            self.cost_ns[i] += cost
+            self.calls[i] += 1
+            total += cost
+            if engaged:
+                active |= bit
+        if total > EDGE_BUDGET_NS:
+            self.over_budget += 1
+        if active and not self.active:
+            self.frame_start = last
+        if active and not self.watchdog_armed:
+            self._arm() # Début de trame (ou protocole resté engagé après un rapport)
+        self.active = active
+
+    def stats(self):
+        """Statistiques par protocole : trames, répétitions, abandons, coût moyen par front"""
+        result = {}
+        for i, d in enumerate(self.decoders):
+            result[d.name] = {
+                'frames': d.frames,
+                'repeats': d.repeats,
+                'aborts': d.aborts,
+                'calls': self.calls[i],
+                # Coût ramené à l'ensemble des fronts : ce que le protocole coûte au chemin de réception
+                'ns_per_edge': self.cost_ns[i] / self.edges if self.edges else 0.0,
+            }
+        return result
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Métriques au format texte Prometheus : histogrammes à seaux fixes et compteurs
+
+Côté mesure, observe() / inc() ne font qu'une recherche dichotomique et une incrémentation
+(aucune allocation, aucun verrou). Les compteurs déjà tenus ailleurs (abandons du décodeur IR,
+échecs du DHT) sont lus uniquement au moment de l'export (counter_func).
+Export sur HTTP local (127.0.0.1) ou socket Unix : curl http://127.0.0.1:9108/metrics
+"""
+
+import os
+import socketserver
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seaux (s) adaptés aux latences d'interface : de 0.1ms à 2.5s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def _value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Histogramme cumulatif à seaux fixes (bornes supérieures, '+Inf' implicite)"""
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Borne supérieure du seau contenant le quantile q (estimation, None si vide)"""
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        counts = list(self.counts) # Copie : observe() peut être appelé pendant l'export
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        total = sum(counts)
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f"{self.name}_sum {_value(self.sum)}")
+        lines.append(f"{self.name}_count {total}")
+        return lines
+
+
+class Counter:
+    """Compteur incrémenté par le programme"""
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter",
+                f"{self.name} {_value(self.value)}"]
+
+
+class CounterFunc:
+    """Compteur lu à l'export : func() retourne un nombre, ou {valeur de label: nombre} si label est donné"""
+
+    def __init__(self, name, help, func, label=None):
+        self.name = name
+        self.help = help
+        self.func = func
+        self.label = label
+        self.last_error = None
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        try:
+            value = self.func()
+        except Exception as e:
+            # Source indisponible (ex: capteur absent) : métrique sans échantillon, erreur affichée une fois
+            error = f"{type(e).__name__}: {e}"
+            if error != self.last_error:
+                self.last_error = error
+                print(f"Métrique {self.name} indisponible ({error})")
+            return lines
+        self.last_error = None
+        if self.label is None:
+            lines.append(f"{self.name} {_value(value)}")
+        else:
+            for key, count in sorted(value.items()):
+                lines.append(f"{self.name}{_labels([(self.label, key)])} {_value(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exportées"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def _add(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Métrique déjà déclarée: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, buckets))
+
+    def counter(self, name, help):
+        return self._add(Counter(name, help))
+
+    def counter_func(self, name, help, func, label=None):
+        return self._add(CounterFunc(name, help, func, label))
+
+    def render(self):
+        """Exposition texte Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Pas de ligne par requête dans la console
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """Serveur d'export dans un thread démon. address : (hôte, port) ou chemin de socket Unix"""
+
+    def __init__(self, registry, address=('127.0.0.1', 9108)):
+        self.registry = registry
+        self.address = address
+        handler = type('MetricsHandler', (_Handler,), {'registry': registry})
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address) # Socket laissée par une exécution précédente
+            self.server = _UnixHTTPServer(address, handler)
+        else:
+            self.server = ThreadingHTTPServer(address, handler)
+            self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=2)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
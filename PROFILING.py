@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Diagnostic sur site sans débogueur (mode --profile / --hud)
+
+- CommandProfiler : chaque commande est exécutée sous cProfile et enregistrée dans
+  <répertoire>/command-<touche>-<date>.pstats ; les images du Snake sont cumulées dans snake-frames-<date>.pstats.
+  Lecture : python3 -m pstats profiles/command-4-20250101-120000-000000.pstats (puis "sort cumtime", "stats 20")
+- FrameStats / rss_bytes : images par seconde, durée de rendu et mémoire résidente affichées par le HUD
+"""
+
+import cProfile
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError: # Hors Unix
+    resource = None
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_bytes():
+    """Mémoire résidente actuelle du processus (octets, pic si /proc indisponible, 0 si inconnue)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 # ru_maxrss en Ko sous Linux
+
+
+class FrameStats:
+    """Images affichées : cadence sur la dernière période et durée de rendu lissée (moyenne exponentielle)
+
+    La durée de rendu va du premier dessin de l'image à la fin de sa mise à jour à l'écran :
+    un écran inactif affiche 0 img/s, sans durée gonflée par l'attente entre deux images.
+    """
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.frames = 0
+        self.render_time = 0.0 # s
+        self._rate_frames = 0
+        self._rate_since = None
+
+    def tick(self, duration):
+        """Une image affichée, duration : durée de son rendu (s)"""
+        if self.frames:
+            self.render_time += self.smoothing * (duration - self.render_time)
+        else:
+            self.render_time = duration
+        self.frames += 1
+
+    def rate(self, now):
+        """Images par seconde depuis l'appel précédent"""
+        fps = 0.0
+        if self._rate_since is not None and now > self._rate_since:
+            fps = (self.frames - self._rate_frames) / (now - self._rate_since)
+        self._rate_frames = self.frames
+        self._rate_since = now
+        return fps
+
+
+def _stamp():
+    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+
+class CommandProfiler:
+    """Profils cProfile par commande et par image de jeu, enregistrés dans directory"""
+
+    def __init__(self, directory="profiles"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.current = None   # Profil de la commande en cours
+        self.frames = None    # Profil cumulé des images du jeu en cours
+        self.frame_count = 0
+        self.saved = []       # Chemins des fichiers écrits
+
+    def _save(self, profile, label):
+        path = os.path.join(self.directory, f"{label}-{_stamp()}.pstats")
+        profile.dump_stats(path)
+        self.saved.append(path)
+        return path
+
+    def run(self, label, func, *args):
+        """func(*args) profilé, enregistré sous <label>-<date>.pstats (aussi en cas d'exception)"""
+        profile = cProfile.Profile()
+        previous, self.current = self.current, profile
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            self.current = previous
+            path = self._save(profile, label)
+            print(f"Profil {label}: {(time.perf_counter() - start) * 1000:.1f}ms -> {path}")
+
+    @contextmanager
+    def frame(self):
+        """Une image de jeu : cumulée dans le profil des images (le profil de la commande est suspendu,
+        un seul profileur pouvant être actif à la fois)"""
+        if self.frames is None:
+            self.frames = cProfile.Profile()
+        outer = self.current
+        if outer is not None:
+            outer.disable()
+        self.frames.enable()
+        try:
+            yield
+        finally:
+            self.frames.disable()
+            self.frame_count += 1
+            if outer is not None:
+                outer.enable()
+
+    def save_frames(self, label):
+        """Enregistre le profil cumulé des images (fin de partie). Retourne son chemin ou None"""
+        if self.frames is None:
+            return None
+        frames, self.frames = self.frames, None
+        path = self._save(frames, f"{label}-frames")
+        print(f"Profil {label}: {self.frame_count} images -> {path}")
+        self.frame_count = 0
+        return path
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Journal SQLite des mesures (DHT, BLE) et des événements (commandes, erreurs)
+
+Les threads appelants ne font qu'ajouter un tuple à une file en mémoire (quelques centaines de ns) :
+un thread d'écriture insère les lignes par lots (executemany, une transaction par lot, mode WAL),
+ce qui limite les écritures sur la carte SD et ne bloque jamais l'affichage.
+Des moyennes horaires (table readings_hourly) sont calculées périodiquement et les mesures brutes
+plus anciennes que la durée de rétention sont supprimées.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+
+FLUSH_INTERVAL = 5.0       # Écriture d'un lot toutes les ... secondes (s)
+MAX_PENDING = 100000       # Lignes en attente d'écriture (au-delà, les plus anciennes sont perdues)
+ROLLUP_INTERVAL = 300.0    # Mise à jour des moyennes horaires et de la rétention (s)
+RETENTION_DAYS = 30        # Mesures brutes et événements
+ROLLUP_RETENTION_DAYS = 730
+
+_READING = 0
+_EVENT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    ts REAL NOT NULL, source TEXT NOT NULL, sensor TEXT NOT NULL, temperature REAL, humidity REAL);
+CREATE INDEX IF NOT EXISTS readings_ts ON readings (ts);
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL, source TEXT NOT NULL, name TEXT NOT NULL, detail TEXT);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE TABLE IF NOT EXISTS readings_hourly (
+    hour INTEGER NOT NULL, source TEXT NOT NULL, sensor TEXT NOT NULL, count INTEGER NOT NULL,
+    temperature_min REAL, temperature_max REAL, temperature_avg REAL,
+    humidity_min REAL, humidity_max REAL, humidity_avg REAL,
+    PRIMARY KEY (hour, source, sensor));
+"""
+
+# Heures à partir de :start recalculées (l'heure en cours est complétée à chaque passage)
+_ROLLUP = """
+INSERT OR REPLACE INTO readings_hourly
+SELECT CAST(ts / 3600 AS INTEGER) AS hour, source, sensor, COUNT(*),
+       MIN(temperature), MAX(temperature), AVG(temperature),
+       MIN(humidity), MAX(humidity), AVG(humidity)
+FROM readings WHERE ts >= :start GROUP BY hour, source, sensor
+"""
+
+
+class SensorLog:
+    """Journal asynchrone : reading() / event() depuis n'importe quel thread, écriture par lots"""
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, retention_days=RETENTION_DAYS,
+                 rollup_retention_days=ROLLUP_RETENTION_DAYS, rollup_interval=ROLLUP_INTERVAL,
+                 max_pending=MAX_PENDING):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention = retention_days * 86400
+        self.rollup_retention = rollup_retention_days * 86400
+        self.rollup_interval = rollup_interval
+        self.max_pending = max_pending
+        self.pending = deque(maxlen=max_pending) # append / popleft sans verrou (thread-safe)
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_error = None
+        self._last_rollup = 0.0
+        self._flush_done = threading.Condition()
+        self._flush_requests = 0 # Numéro de la dernière demande de flush()
+        self._flush_acked = 0    # Dernière demande satisfaite (par un lot commencé après elle)
+        self._wake = threading.Event()
+        self.running = False
+        self.thread = None
+
+    # --- Côté appelants (affichage, capteurs) ---
+    def reading(self, source, sensor, temperature, humidity):
+        """Enregistre une mesure (source : 'dht' ou 'ble', sensor : GPIO ou adresse)"""
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+        self.pending.append((_READING, time.time(), source, sensor, temperature, humidity))
+
+    def event(self, source, name, detail=None):
+        """Enregistre un événement (ex: 'command', '4' ; 'dht', 'error', 'Checksum invalide')"""
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+        self.pending.append((_EVENT, time.time(), source, name, detail))
+
+    def flush(self, timeout=10):
+        """Demande l'écriture immédiate des lignes en attente et attend qu'elle soit faite
+
+        Seul un lot commencé après la demande l'acquitte : les lignes ajoutées pendant un lot en cours
+        sont écrites par le suivant. Retourne False si le délai est dépassé.
+        """
+        if not self.running:
+            return False
+        with self._flush_done:
+            self._flush_requests += 1
+            request = self._flush_requests
+            self._wake.set()
+            return self._flush_done.wait_for(lambda: self._flush_acked >= request, timeout)
+
+    # --- Thread d'écriture ---
+    def _connect(self):
+        # Ouverte par start() (erreurs remontées à l'appelant), utilisée ensuite par le seul thread d'écriture
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL") # Pas de fsync à chaque transaction en mode WAL
+        db.executescript(_SCHEMA)
+        return db
+
+    def _write_batch(self, db):
+        readings = []
+        events = []
+        pending = self.pending
+        while pending:
+            row = pending.popleft()
+            if row[0] == _READING:
+                readings.append(row[1:])
+            else:
+                events.append(row[1:])
+        if not readings and not events:
+            return
+        with db: # Une transaction par lot
+            if readings:
+                db.executemany("INSERT INTO readings VALUES (?, ?, ?, ?, ?)", readings)
+            if events:
+                db.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", events)
+        self.written += len(readings) + len(events)
+        self.batches += 1
+
+    def _maintain(self, db, now):
+        """Moyennes horaires des heures récentes, puis suppression des lignes trop anciennes"""
+        start = (int(self._last_rollup or now) // 3600 - 1) * 3600
+        with db:
+            db.execute(_ROLLUP, {'start': start})
+            db.execute("DELETE FROM readings WHERE ts < ?", (now - self.retention,))
+            db.execute("DELETE FROM events WHERE ts < ?", (now - self.retention,))
+            db.execute("DELETE FROM readings_hourly WHERE hour < ?", ((now - self.rollup_retention) // 3600,))
+        self._last_rollup = now
+
+    def _run(self, db):
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                stopping = not self.running # Lu avant le lot : les lignes ajoutées avant close() en font partie
+                with self._flush_done:
+                    started = self._flush_requests # Demandes faites avant le début de ce lot
+                try:
+                    self._write_batch(db)
+                    while stopping and self.pending: # Lignes ajoutées pendant le dernier lot
+                        self._write_batch(db)
+                    now = time.time()
+                    if now - self._last_rollup >= self.rollup_interval:
+                        self._maintain(db, now)
+                except sqlite3.Error as e:
+                    self.last_error = str(e)
+                    print(f"Erreur journal SQLite: {e}")
+                with self._flush_done:
+                    self._flush_acked = started
+                    self._flush_done.notify_all()
+                if stopping:
+                    break
+        finally:
+            db.close()
+
+    def start(self):
+        if self.running:
+            return
+        db = self._connect() # Erreur d'ouverture remontée à l'appelant
+        self.running = True
+        self.thread = threading.Thread(target=self._run, args=(db,), name="sensor-log", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Écrit les dernières lignes (jusqu'à ce que la file soit vide), met à jour les moyennes horaires
+        et arrête le thread"""
+        if not self.running:
+            return
+        self.running = False
+        self._last_rollup = 0.0 # Moyennes à jour à la fermeture
+        self._wake.set()
+        self.thread.join(timeout=10)
+        self.thread = None
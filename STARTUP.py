@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Initialisation parallèle au lancement
+
+Les étapes indépendantes (connexion à pigpiod, adaptateur Bluetooth, vérification des images) tournent
+chacune dans un thread pendant que l'affichage démarre et que le menu attend un choix : un démon lent
+ou absent ne retarde plus le menu. Chaque étape a un délai maximal ; son résultat n'est attendu qu'au
+moment où il sert (après le choix du mode). Les threads sont des démons : une connexion bloquée
+n'empêche pas le programme de se terminer.
+Durée et état de chaque étape sont rapportés (console, journal SQLite, trace) pour repérer les régressions.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+OK = "ok"
+FAILED = "échec"
+TIMEOUT = "délai dépassé"
+PENDING = "en cours"
+
+
+class InitStep:
+    """Une étape : résultat (Future), heures de début / fin (time.perf_counter()), erreur éventuelle"""
+
+    def __init__(self, name, timeout=None, on_late=None):
+        self.name = name
+        self.timeout = timeout # s, None : pas de limite
+        self.on_late = on_late # on_late(résultat) : libère un résultat arrivé après l'abandon de l'étape
+        self.future = Future()
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+        self.timed_out = False # Résultat attendu au-delà du délai (l'étape a pu se terminer depuis)
+
+    @property
+    def duration(self):
+        """Durée (s) : jusqu'à la fin de l'étape, ou jusqu'à maintenant si elle est en cours"""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def status(self):
+        if self.timed_out:
+            return TIMEOUT
+        if self.end is None:
+            return PENDING
+        return FAILED if self.error is not None else OK
+
+    def describe(self):
+        """Ligne de rapport, ex: "pigpio       échec    3.1ms  ConnectionError: pigpiod injoignable" """
+        line = f"{self.name:12} {self.status:14} {self.duration * 1000:8.1f}ms"
+        if self.error is not None:
+            line += f"  {type(self.error).__name__}: {self.error}"
+        elif self.timed_out and self.end is None:
+            line += "  (toujours en cours)"
+        return line
+
+
+class InitStage:
+    """Étapes de démarrage lancées en parallèle, résultats attendus à la demande
+
+    on_step(step) : appelé à la fin de chaque étape (dans le thread de l'étape)
+    """
+
+    def __init__(self, on_step=None):
+        self.on_step = on_step
+        self.steps = OrderedDict() # Nom -> InitStep, dans l'ordre de lancement
+        self.started = time.perf_counter()
+        self._lock = threading.Lock() # Fin d'une étape / abandon de son résultat (délai dépassé)
+
+    def _finish(self, step, result=None, error=None):
+        with self._lock:
+            step.end = time.perf_counter()
+            step.error = error
+            if error is None:
+                step.future.set_result(result)
+            else:
+                step.future.set_exception(error)
+            late = step.timed_out
+        if late and error is None and step.on_late is not None:
+            try:
+                step.on_late(result) # Personne n'utilisera ce résultat (ex: connexion à fermer)
+            except Exception as e:
+                print(f"Nettoyage de l'étape {step.name} : {e}")
+        if self.on_step is not None:
+            self.on_step(step)
+
+    def _run(self, step, func, args):
+        try:
+            result = func(*args)
+        except Exception as e:
+            self._finish(step, error=e)
+        else:
+            self._finish(step, result)
+
+    def start(self, name, func, *args, timeout=None, on_late=None):
+        """Lance func(*args) dans un thread démon "init-<name>"
+
+        on_late(résultat) : appelé si l'étape réussit après que son résultat a été abandonné (délai dépassé)
+        """
+        step = self.steps[name] = InitStep(name, timeout, on_late)
+        threading.Thread(target=self._run, args=(step, func, args), name=f"init-{name}", daemon=True).start()
+        return step
+
+    def run(self, name, func, *args):
+        """Exécute func(*args) dans le thread appelant (ex: SDL, lié au thread principal), chronométrée
+        comme les autres étapes. Les exceptions sont enregistrées puis propagées"""
+        step = self.steps[name] = InitStep(name)
+        try:
+            result = func(*args)
+        except Exception as e:
+            self._finish(step, error=e)
+            raise
+        self._finish(step, result)
+        return result
+
+    def result(self, name, default=None):
+        """Résultat d'une étape, attendu au plus jusqu'à son échéance (default si échec ou délai dépassé)"""
+        step = self.steps[name]
+        if step.timed_out:
+            return default # Résultat arrivé trop tard : ignoré (le programme a continué sans)
+        remaining = None
+        if step.timeout is not None:
+            remaining = max(0.0, step.start + step.timeout - time.perf_counter())
+        try:
+            return step.future.result(remaining)
+        except FutureTimeout:
+            with self._lock:
+                if not step.future.done(): # Sinon terminée entre-temps : résultat utilisé
+                    step.timed_out = True
+                    return default
+            return self.result(name, default)
+        except Exception:
+            return default
+
+    def ok(self, name):
+        """L'étape a réussi (attend son résultat au plus jusqu'à son échéance)"""
+        self.result(name)
+        return self.steps[name].status == OK
+
+    def wait(self):
+        """Attend toutes les étapes (chacune au plus jusqu'à son échéance)"""
+        for name in list(self.steps):
+            self.result(name)
+
+    def failures(self):
+        return [step for step in self.steps.values() if step.status in (FAILED, TIMEOUT)]
+
+    def report(self):
+        """Lignes de rapport : une par étape, puis la durée totale depuis le lancement (étapes en cours incluses)"""
+        now = time.perf_counter()
+        lines = [step.describe() for step in self.steps.values()]
+        ends = [now if step.end is None else step.end for step in self.steps.values()]
+        if ends:
+            lines.append(f"{'total':12} {'':14} {(max(ends) - self.started) * 1000:8.1f}ms")
+        return lines
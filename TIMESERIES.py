@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Historique des mesures : tampons circulaires de taille fixe (array de flottants), mémoire constante
+quelle que soit la durée de fonctionnement.
+
+Chaque voie (ex: température du DHT) est gardée à trois résolutions : mesures brutes, moyennes
+par minute et moyennes par heure. Min / max / moyenne glissants sont tenus à jour en O(1) par mesure.
+Optionnellement, chaque tampon est un fichier projeté en mémoire (mmap) : l'historique survit au redémarrage.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict, deque
+
+# (nom, durée d'un point en secondes (0 : mesure brute), nombre de points)
+RESOLUTIONS = (
+    ('raw', 0, 512),          # ~17 min à une mesure toutes les 2s
+    ('minute', 60, 1440),     # 24 heures
+    ('hour', 3600, 24 * 90),  # 90 jours
+)
+MAX_CHANNELS = 256 # Au-delà, la voie alimentée le moins récemment est fermée
+
+# En-tête des fichiers : signature, capacité, position d'écriture, nombre total de points écrits.
+# 24 octets : les flottants qui suivent restent alignés sur 8 octets (accès non alignés interdits sur ARM)
+_HEADER = struct.Struct('<4sIQQ')
+_MAGIC = b'TSR1'
+_POINT = 16 # (timestamp, valeur) en flottants 64 bits
+
+
+class RingBuffer:
+    """Tampon circulaire de points (timestamp, valeur), capacité fixe
+
+    Les statistiques portent sur les points présents dans le tampon : somme courante pour
+    la moyenne, files monotones pour le min et le max (O(1) amorti par point).
+    path : fichier projeté en mémoire, relu au lancement suivant.
+    """
+
+    def __init__(self, capacity, path=None):
+        self.capacity = capacity
+        self.path = path
+        self._mmap = None
+        if path is None:
+            self._data = array('d', bytes(_POINT * capacity)) # [t0, v0, t1, v1, ...]
+            self.head = 0
+            self.total = 0
+        else:
+            self._open(path)
+        self._rebuild()
+
+    def _open(self, path):
+        size = _HEADER.size + _POINT * self.capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            valid = os.fstat(fd).st_size == size
+            if not valid:
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        magic, capacity, head, total = _HEADER.unpack_from(self._mmap)
+        if not valid or magic != _MAGIC or capacity != self.capacity or head >= capacity:
+            # Fichier neuf, corrompu ou d'une autre capacité : historique repris à zéro
+            head = total = 0
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, self.capacity, 0, 0)
+        self.head = head
+        self.total = total
+        self._data = memoryview(self._mmap)[_HEADER.size:].cast('d')
+
+    def _rebuild(self):
+        """Statistiques recalculées à partir des points présents (ouverture, correction de dérive)"""
+        self._sum = 0.0
+        self._min = deque() # (numéro du point, valeur) croissantes
+        self._max = deque() # (numéro du point, valeur) décroissantes
+        first = self.total - len(self)
+        for n, value in enumerate(self.values(), first):
+            self._sum += value
+            self._push(n, value)
+
+    def _push(self, n, value):
+        low = self._min
+        while low and low[-1][1] >= value:
+            low.pop()
+        low.append((n, value))
+        high = self._max
+        while high and high[-1][1] <= value:
+            high.pop()
+        high.append((n, value))
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp, value):
+        """Ajoute un point en O(1) (le plus ancien est écrasé quand le tampon est plein)"""
+        i = self.head
+        data = self._data
+        if self.total >= self.capacity:
+            self._sum -= data[2 * i + 1]
+        data[2 * i] = timestamp
+        data[2 * i + 1] = value
+        self._sum += value
+        n = self.total
+        self._push(n, value)
+        oldest = n - self.capacity
+        if self._min[0][0] <= oldest:
+            self._min.popleft()
+        if self._max[0][0] <= oldest:
+            self._max.popleft()
+        self.total = n + 1
+        self.head = (i + 1) % self.capacity
+        if self._mmap is not None:
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, self.capacity, self.head, self.total)
+        if self.head == 0:
+            # Une fois par tour : somme exacte recalculée (pas de dérive d'arrondi après des mois)
+            self._sum = sum(self.values())
+
+    def _indices(self, last):
+        count = len(self) if last is None else min(len(self), last)
+        start = self.head - count
+        return ((start + k) % self.capacity for k in range(count))
+
+    def values(self, last=None):
+        """Valeurs dans l'ordre chronologique (les last plus récentes)"""
+        data = self._data
+        return [data[2 * j + 1] for j in self._indices(last)]
+
+    def points(self, last=None):
+        """[(timestamp, valeur), ...] dans l'ordre chronologique"""
+        data = self._data
+        return [(data[2 * j], data[2 * j + 1]) for j in self._indices(last)]
+
+    def last(self):
+        """Point le plus récent (None si vide)"""
+        if not self.total:
+            return None
+        j = (self.head - 1) % self.capacity
+        return self._data[2 * j], self._data[2 * j + 1]
+
+    def stats(self):
+        """(min, max, moyenne) des points du tampon, None si vide"""
+        count = len(self)
+        if not count:
+            return None
+        return self._min[0][1], self._max[0][1], self._sum / count
+
+    def flush(self):
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        if self._mmap is not None:
+            self._data.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+class _Level:
+    """Une résolution d'une voie : tampon + point en cours d'agrégation"""
+
+    def __init__(self, name, step, ring):
+        self.name = name
+        self.step = step
+        self.ring = ring
+        self.bucket = None # Numéro de l'intervalle en cours (timestamp // step)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Channel:
+    """Une grandeur mesurée à plusieurs résolutions (moyenne de chaque minute / heure écoulée)
+
+    Le point en cours d'agrégation n'est pas conservé au redémarrage : la minute (ou l'heure)
+    interrompue reprend avec les mesures suivantes.
+    """
+
+    def __init__(self, resolutions=RESOLUTIONS, prefix=None):
+        self.levels = []
+        for name, step, capacity in resolutions:
+            path = None if prefix is None else f"{prefix}.{name}.ts"
+            self.levels.append(_Level(name, step, RingBuffer(capacity, path)))
+        self.rings = {level.name: level.ring for level in self.levels}
+
+    def add(self, timestamp, value):
+        for level in self.levels:
+            if not level.step:
+                level.ring.append(timestamp, value)
+                continue
+            bucket = int(timestamp // level.step)
+            if bucket != level.bucket:
+                if level.count:
+                    start = level.bucket * level.step
+                    last = level.ring.last()
+                    if last is None or last[0] != start: # Intervalle déjà écrit avant un redémarrage
+                        level.ring.append(start, level.sum / level.count)
+                level.bucket, level.sum, level.count = bucket, 0.0, 0
+            level.sum += value
+            level.count += 1
+
+    def values(self, level='raw', last=None):
+        return self.rings[level].values(last)
+
+    def stats(self, level='raw'):
+        return self.rings[level].stats()
+
+    def flush(self):
+        for ring in self.rings.values():
+            ring.flush()
+
+    def close(self):
+        for ring in self.rings.values():
+            ring.close()
+
+    def remove_files(self):
+        for ring in self.rings.values():
+            if ring.path is not None and os.path.exists(ring.path):
+                os.remove(ring.path)
+
+
+class SeriesStore:
+    """Voies indexées par nom (ex: "température", "AA:BB:..:FF/humidité"), nombre de voies borné
+
+    directory : répertoire des fichiers projetés en mémoire (None : historique en mémoire seulement).
+    Alimenté par les threads des capteurs, lu par l'affichage.
+    """
+
+    def __init__(self, directory=None, max_channels=MAX_CHANNELS, resolutions=RESOLUTIONS):
+        self.directory = directory
+        self.max_channels = max_channels
+        self.resolutions = resolutions
+        self.channels = OrderedDict() # {nom: Channel}, de la moins à la plus récemment alimentée
+        self.evicted = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.channels)
+
+    def _prefix(self, key):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, key.replace(':', '').replace('/', '_'))
+
+    def add(self, key, timestamp, value):
+        """Enregistre une mesure (timestamp : time.time())"""
+        with self._lock:
+            channel = self.channels.get(key)
+            if channel is None:
+                channel = self.channels[key] = Channel(self.resolutions, self._prefix(key))
+                if len(self.channels) > self.max_channels:
+                    # Capteur disparu (ex: adresse BLE aléatoire) : ses fichiers sont supprimés, disque borné lui aussi
+                    _, oldest = self.channels.popitem(last=False)
+                    oldest.close()
+                    oldest.remove_files()
+                    self.evicted += 1
+            else:
+                self.channels.move_to_end(key)
+            channel.add(timestamp, value)
+
+    def get(self, key):
+        return self.channels.get(key)
+
+    def values(self, key, level='raw', last=None):
+        """Copie des dernières valeurs d'une voie ([] si inconnue)"""
+        with self._lock:
+            channel = self.channels.get(key)
+            return channel.values(level, last) if channel is not None else []
+
+    def stats(self, key, level='raw'):
+        with self._lock:
+            channel = self.channels.get(key)
+            return channel.stats(level) if channel is not None else None
+
+    def flush(self):
+        with self._lock:
+            for channel in self.channels.values():
+                channel.flush()
+
+    def close(self):
+        with self._lock:
+            for channel in self.channels.values():
+                channel.close()
+            self.channels.clear()
+
+
+def sparkline_points(values, rect, points=None):
+    """Coordonnées (x, y) d'une courbe tenant dans rect = (gauche, haut, largeur, hauteur)
+
+    Au plus points valeurs tracées (par défaut une par pixel), échelle verticale ajustée au min / max.
+    """
+    left, top, width, height = rect
+    points = min(points or width, width)
+    if len(values) > points:
+        step = len(values) / points
+        values = [values[int(k * step)] for k in range(points - 1)] + [values[-1]]
+    if len(values) < 2:
+        return []
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    dx = (width - 1) / (len(values) - 1)
+    bottom = top + height - 1
+    return [(left + round(k * dx), bottom - round((value - low) * (height - 1) / span))
+            for k, value in enumerate(values)]
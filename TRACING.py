@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Traceur d'intervalles (décodage IR, attente en file, commandes, chargement d'images, rendu, affichage,
+capture DHT, annonces BLE) exporté au format "trace event" de Chrome / Perfetto.
+
+Les intervalles sont écrits dans un tampon circulaire préalloué (aucune allocation de liste, les plus
+anciens sont écrasés) ; une piste par thread : callback pigpio, boucle BLE, thread principal...
+Ouvrir le fichier produit dans https://ui.perfetto.dev ou chrome://tracing
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+from datetime import datetime
+
+TRACE_CAPACITY = 65536 # Intervalles gardés (~50 octets chacun hors arguments)
+
+_NULL_SPAN = nullcontext() # Traceur désactivé : with sans effet, aucun objet créé
+_TRACK_ALIASES = {'MainThread': 'main'}
+
+
+class _Span:
+    """Intervalle mesuré par un bloc with"""
+
+    def __init__(self, tracer, name, cat, track, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.track = track
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, cat=self.cat, track=self.track, args=self.args)
+
+
+class Tracer:
+    """Enregistreur d'intervalles. Désactivé, il ne réserve aucune mémoire et span() ne coûte qu'un test"""
+
+    def __init__(self, capacity=TRACE_CAPACITY, enabled=True):
+        self.capacity = capacity
+        self.enabled = False
+        self.names = None
+        if enabled:
+            self.start()
+
+    def start(self):
+        """Préalloue le tampon (au premier appel) et active l'enregistrement"""
+        if self.names is None:
+            capacity = self.capacity
+            self.names = [None] * capacity
+            self.cats = [None] * capacity
+            self.tracks = [None] * capacity
+            self.args = [None] * capacity
+            self.starts = array('d', bytes(8 * capacity))
+            self.ends = array('d', bytes(8 * capacity))
+            self._next = itertools.count() # next() est atomique : écritures concurrentes sans verrou
+            self.origin = time.perf_counter()
+            self.wall_origin = time.time()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def complete(self, name, start, end=None, cat='app', track=None, args=None):
+        """Enregistre un intervalle [start, end] (time.perf_counter(), end : maintenant par défaut)
+
+        track : nom de la piste (par défaut le nom du thread appelant)
+        """
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        i = next(self._next) % self.capacity
+        self.names[i] = name
+        self.cats[i] = cat
+        self.tracks[i] = track or threading.current_thread().name
+        self.args[i] = args
+        self.starts[i] = start
+        self.ends[i] = end
+
+    def span(self, name, cat='app', track=None, **args):
+        """with tracer.span("nom"): ... mesure le bloc"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, track, args or None)
+
+    def clear(self):
+        if self.names is None:
+            return
+        for i in range(self.capacity):
+            self.names[i] = None
+        self._next = itertools.count()
+        self.origin = time.perf_counter()
+        self.wall_origin = time.time()
+
+    def export(self):
+        """Document JSON "trace event" (dict) des intervalles présents dans le tampon"""
+        pid = os.getpid()
+        if self.names is None:
+            return {'traceEvents': [], 'displayTimeUnit': 'ms'}
+        recorded = [(self.starts[i], self.ends[i], self.names[i], self.cats[i], self.tracks[i], self.args[i])
+                    for i in range(self.capacity) if self.names[i] is not None]
+        recorded.sort(key=lambda span: span[0])
+        tracks = sorted({span[4] for span in recorded}, key=lambda track: (track != 'MainThread', track))
+        tids = {track: tid for tid, track in enumerate(tracks, 1)}
+        events = []
+        for track, tid in tids.items():
+            events.append({'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tid,
+                           'args': {'name': _TRACK_ALIASES.get(track, track)}})
+            events.append({'ph': 'M', 'name': 'thread_sort_index', 'pid': pid, 'tid': tid,
+                           'args': {'sort_index': tid}})
+        for start, end, name, cat, track, args in recorded:
+            event = {'ph': 'X', 'name': name, 'cat': cat, 'pid': pid, 'tid': tids[track],
+                     'ts': round((start - self.origin) * 1e6, 1), 'dur': round(max(end - start, 0.0) * 1e6, 1)}
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'origin': datetime.fromtimestamp(self.wall_origin).isoformat()}}
+
+    def dump(self, directory="."):
+        """Écrit la trace dans directory/trace-AAAAMMJJ-HHMMSS.json et retourne son chemin"""
+        path = os.path.join(directory, datetime.now().strftime("trace-%Y%m%d-%H%M%S.json"))
+        with open(path, 'w') as f:
+            json.dump(self.export(), f, separators=(',', ':'))
+        return path